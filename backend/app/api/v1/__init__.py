@@ -9,5 +9,6 @@ from app.api.v1.shop import shop_bp
 from app.api.v1.employee import employee_bp
 from app.api.v1.product import product_bp
 from app.api.v1.market import market_bp
+from app.api.v1.jobs import jobs_bp
 
-__all__ = ['auth_bp', 'game_bp', 'player_bp', 'production_bp', 'round_bp', 'finance_bp', 'shop_bp', 'employee_bp', 'product_bp', 'market_bp']
+__all__ = ['auth_bp', 'game_bp', 'player_bp', 'production_bp', 'round_bp', 'finance_bp', 'shop_bp', 'employee_bp', 'product_bp', 'market_bp', 'jobs_bp']
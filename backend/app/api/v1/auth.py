@@ -3,6 +3,7 @@
 """
 from flask import Blueprint, request, jsonify
 from app.core.database import db
+from app.core.replica import no_read_stickiness
 from app.models.player import Player
 from datetime import datetime, timedelta
 import uuid
@@ -53,6 +54,7 @@ def login():
 
 
 @auth_bp.route('/heartbeat', methods=['POST'])
+@no_read_stickiness
 def heartbeat():
     """
     心跳接口 - 刷新 last_active_at
@@ -3,7 +3,9 @@ Finance API Blueprint
 Handles finance record queries and financial reports
 """
 from flask import Blueprint, request, jsonify
+from app.core.replica import use_replica
 from app.services.finance_service import FinanceService
+from app.utils.fields import sparse_fields
 from app.models.player import Player
 from app.models.game import Game
 
@@ -11,6 +13,7 @@ finance_bp = Blueprint('finance', __name__)
 
 
 @finance_bp.route('/<int:player_id>/<int:round_number>', methods=['GET'])
+@use_replica
 def get_finance_record(player_id: int, round_number: int):
     """
     Get finance record for a player in a specific round
@@ -46,7 +49,7 @@ def get_finance_record(player_id: int, round_number: int):
 
         return jsonify({
             "success": True,
-            "data": result
+            "data": sparse_fields(result)
         }), 200
 
     except ValueError as e:
@@ -63,6 +66,7 @@ def get_finance_record(player_id: int, round_number: int):
 
 
 @finance_bp.route('/<int:player_id>/all', methods=['GET'])
+@use_replica
 def get_all_finance_records(player_id: int):
     """
     Get all finance records for a player
@@ -93,7 +97,7 @@ def get_all_finance_records(player_id: int):
 
         return jsonify({
             "success": True,
-            "data": result
+            "data": sparse_fields(result)
         }), 200
 
     except Exception as e:
@@ -104,6 +108,7 @@ def get_all_finance_records(player_id: int):
 
 
 @finance_bp.route('/game/<int:game_id>/profit-summary', methods=['GET'])
+@use_replica
 def get_profit_summary(game_id: int):
     """
     Get profit summary for all players in a game (leaderboard)
@@ -160,7 +165,146 @@ def get_profit_summary(game_id: int):
         }), 500
 
 
+@finance_bp.route('/<int:player_id>/series', methods=['GET'])
+@use_replica
+def get_player_series(player_id: int):
+    """
+    Get a player's finance history as parallel arrays (charting)
+
+    Args:
+        player_id: Player ID
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "player_id": 1,
+            "nickname": "Player 1",
+            "rounds": [1, 2],
+            "revenue": [450.0, 600.0],
+            "expense": [300.0, 350.0],
+            "profit": [150.0, 250.0],
+            "cumulative": [150.0, 400.0]
+        }
+    }
+    """
+    try:
+        result = FinanceService.get_player_series(player_id)
+
+        return jsonify({
+            "success": True,
+            "data": result
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
+@finance_bp.route('/game/<int:game_id>/series', methods=['GET'])
+@use_replica
+def get_game_series(game_id: int):
+    """
+    Get finance history of all players in a game as parallel arrays (charting)
+
+    Args:
+        game_id: Game ID
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "game_id": 1,
+            "current_round": 3,
+            "players": [
+                {"player_id": 1, "nickname": "Player 1", "rounds": [1, 2], "revenue": [...], ...},
+                ...
+            ]
+        }
+    }
+    """
+    try:
+        result = FinanceService.get_game_series(game_id)
+
+        return jsonify({
+            "success": True,
+            "data": sparse_fields(result)
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
+@finance_bp.route('/leaderboard/global', methods=['GET'])
+@use_replica
+def get_global_leaderboard():
+    """
+    Get the best players across all finished games
+
+    Query:
+        limit: Number of entries (default 50)
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "players": [
+                {
+                    "game_id": 1,
+                    "game_name": "Room 1",
+                    "player_id": 1,
+                    "nickname": "Player 1",
+                    "total_profit": 5000.0,
+                    "cash": 12000.0,
+                    "finished_at": "2024-01-01T12:00:00",
+                    "rank": 1
+                },
+                ...
+            ]
+        }
+    }
+    """
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        result = FinanceService.get_global_leaderboard(limit)
+
+        return jsonify({
+            "success": True,
+            "data": result
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
 @finance_bp.route('/<int:player_id>/detailed-report', methods=['GET'])
+@use_replica
 def get_detailed_report(player_id: int):
     """
     Get detailed financial report for a player
@@ -168,6 +312,9 @@ def get_detailed_report(player_id: int):
     Args:
         player_id: Player ID
 
+    Query:
+        fields: Optional sparse fieldset, e.g. fields=current_cash,rounds.round,rounds.profit
+
     Response:
     {
         "success": true,
@@ -194,7 +341,7 @@ def get_detailed_report(player_id: int):
 
         return jsonify({
             "success": True,
-            "data": result
+            "data": sparse_fields(result)
         }), 200
 
     except ValueError as e:
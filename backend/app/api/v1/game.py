@@ -1,21 +1,54 @@
 """
 游戏房间 API (Flask Blueprint)
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy.exc import IntegrityError
 from app.core.database import db
-from app.models.game import Game, CustomerFlow
+from app.core.replica import use_replica
+from app.models.game import Game
 from app.models.player import Player
+from app.services.event_service import EventService
+from app.services.flow_provider import FlowProvider
+from app.utils.cache import LocalCache
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.room_code import allocate_room_code
 from datetime import datetime
-import random
-import string
 
 # 蓝图
 game_bp = Blueprint('games', __name__)
 
 
-def generate_room_code(length=6):
-    """生成房间代码"""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+# 房间码与历史随机房间码冲突时的重试次数
+ROOM_CODE_MAX_ATTEMPTS = 5
+
+# 大厅列表分页
+LOBBY_DEFAULT_LIMIT = 50
+LOBBY_MAX_LIMIT = 100
+
+# 大厅第一页的短时缓存（所有轮询的客户端共用）
+_lobby_first_page = LocalCache('lobby_first_page', ttl_seconds=2, maxsize=32)
+
+
+def _insert_game(**fields):
+    """
+    分配房间码并插入游戏，通常只需一次 INSERT
+
+    分配器保证新房间码互不相同；唯一约束冲突（如与旧的随机房间码重复）时换下一个码重试
+    """
+    for _ in range(ROOM_CODE_MAX_ATTEMPTS):
+        game = Game(room_code=allocate_room_code(), **fields)
+        db.session.add(game)
+        try:
+            db.session.flush()  # 获取game.id
+            return game
+        except IntegrityError:
+            db.session.rollback()
+    return None
+
+
+def _game_payload(game: Game) -> dict:
+    """游戏信息，附带按客流场景计算的总回合数"""
+    return {**game.to_dict(), "total_rounds": FlowProvider.total_rounds(game)}
 
 
 def _extract_session_token(data: dict):
@@ -35,6 +68,7 @@ def create_game():
     data = request.get_json() or {}
     game_name = data.get('name', '奶茶房间')
     max_players = data.get('max_players', 4)
+    flow_options = data.get('customer_flow')  # 可选：客流场景 {"script", "seed", "variance", "overrides", "persist"}
     session_token = _extract_session_token(data)
     player_name = data.get('player_name')  # 玩家昵称，来自登录
 
@@ -44,6 +78,11 @@ def create_game():
     if not player_name:
         return jsonify({"success": False, "error": "请输入玩家昵称"}), 400
 
+    try:
+        scenario = FlowProvider.build_scenario(flow_options)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
     # 若当前 session 已绑定旧房间，视为重新开房：删除旧玩家，房间无玩家则清理
     existing_player = Player.query.filter_by(session_token=session_token).first()
     if existing_player:
@@ -59,28 +98,18 @@ def create_game():
                     db.session.delete(old_game)
                     db.session.commit()
 
-    # 生成唯一房间码
-    while True:
-        room_code = generate_room_code()
-        existing = Game.query.filter_by(room_code=room_code).first()
-        if not existing:
-            break
-
     # 创建游戏
-    game = Game(
+    game = _insert_game(
         name=game_name,
-        room_code=room_code,
         status='waiting',
         max_players=max_players,
-        current_round=1
+        current_round=1,
+        settings={"customer_flow": scenario}
     )
+    if game is None:
+        return jsonify({"success": False, "error": "房间码分配失败，请重试"}), 503
 
-    db.session.add(game)
-    db.session.flush()  # 获取game.id
-
-    # 自动创建玩家并加入房间
-    from app.models.product import ProductRecipe, PlayerProduct
-
+    # 自动创建玩家并加入房间（未解锁的产品由配方目录推导，不插入 PlayerProduct）
     player = Player(
         game_id=game.id,
         nickname=player_name,
@@ -96,28 +125,21 @@ def create_game():
     db.session.add(player)
     db.session.flush()  # 获取player.id
 
-    # 初始化玩家配方（全部锁定）
-    recipes = ProductRecipe.query.all()
-    for recipe in recipes:
-        player_product = PlayerProduct(
-            player_id=player.id,
-            recipe_id=recipe.id,
-            is_unlocked=False
-        )
-        db.session.add(player_product)
-
+    EventService.record(player, 'player_joined', {"cash": float(player.cash)},
+                        round_number=game.current_round)
     db.session.commit()
 
     return jsonify({
         "success": True,
         "data": {
-            "game": game.to_dict(),
+            "game": _game_payload(game),
             "player": player.to_dict()
         }
     }), 201
 
 
 @game_bp.route('/<int:game_id>', methods=['GET'])
+@use_replica
 def get_game(game_id):
     """获取游戏信息"""
     game = Game.query.get(game_id)
@@ -127,11 +149,12 @@ def get_game(game_id):
 
     return jsonify({
         "success": True,
-        "data": game.to_dict()
+        "data": _game_payload(game)
     })
 
 
 @game_bp.route('/<int:game_id>/players', methods=['GET'])
+@use_replica
 def get_game_players(game_id):
     """获取游戏玩家列表"""
     game = Game.query.get(game_id)
@@ -167,18 +190,11 @@ def start_game(game_id):
     game.status = 'in_progress'
     game.started_at = datetime.utcnow()
 
-    # 生成所有回合的客流（固定脚本）
-    from app.utils.game_constants import GameConstants
-    for round_num in range(1, 11):  # 10回合
-        flow_data = GameConstants.CUSTOMER_FLOW_SCRIPT.get(round_num, {"high": 40, "low": 300})
-
-        customer_flow = CustomerFlow(
-            game_id=game.id,
-            round_number=round_num,
-            high_tier_customers=flow_data["high"],
-            low_tier_customers=flow_data["low"]
-        )
-        db.session.add(customer_flow)
+    # 客流由场景定义按回合计算，不再逐回合插入 customer_flows
+    settings = dict(game.settings or {})
+    if FlowProvider.get_scenario(game) is None:
+        settings['customer_flow'] = FlowProvider.build_scenario()
+        game.settings = settings
 
     db.session.commit()
 
@@ -187,24 +203,77 @@ def start_game(game_id):
         "message": "游戏已开始",
         "data": {
             "status": "in_progress",
-            "started_at": game.started_at.isoformat()
+            "started_at": game.started_at.isoformat(),
+            "total_rounds": FlowProvider.total_rounds(game)
         }
     })
 
 
 @game_bp.route('', methods=['GET'])
+@use_replica
 def list_games():
-    """列出游戏房间"""
-    status = request.args.get('status')
+    """
+    列出游戏房间（按创建时间倒序，keyset 分页）
 
-    query = Game.query
+    Query:
+        status: 可选，按状态过滤；waiting 时附带当前人数 player_count
+        limit: 每页数量，默认50，最多100
+        cursor: 上一页返回的 next_cursor
 
-    if status:
-        query = query.filter_by(status=status)
+    Response:
+        {"success": true, "data": [...], "next_cursor": "..." | null}
+    """
+    status = request.args.get('status')
+    limit = min(max(request.args.get('limit', LOBBY_DEFAULT_LIMIT, type=int), 1), LOBBY_MAX_LIMIT)
 
-    games = query.all()
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    if cursor is None:
+        ttl = current_app.config.get('LOBBY_CACHE_TTL', 2)
+        page = _lobby_first_page.get_or_load(
+            (status, limit), lambda: _load_lobby_page(status, limit, None), ttl_seconds=ttl
+        )
+    else:
+        page = _load_lobby_page(status, limit, cursor)
 
     return jsonify({
         "success": True,
-        "data": [g.to_dict() for g in games]
+        **page
     })
+
+
+def _load_lobby_page(status, limit: int, cursor):
+    """按 (status, created_at, id) 索引取一页，多取一行判断是否还有下一页"""
+    query = Game.query
+    if status:
+        query = query.filter(Game.status == status)
+
+    if cursor is not None:
+        created_at, game_id = cursor
+        query = query.filter(db.or_(
+            Game.created_at < created_at,
+            db.and_(Game.created_at == created_at, Game.id < game_id)
+        ))
+
+    games = query.order_by(Game.created_at.desc(), Game.id.desc()).limit(limit + 1).all()
+    has_more = len(games) > limit
+    games = games[:limit]
+
+    data = [_game_payload(g) for g in games]
+
+    # 等待中的房间：一次分组查询带上当前人数
+    if status == 'waiting' and games:
+        counts = dict(db.session.query(Player.game_id, db.func.count(Player.id)).filter(
+            Player.game_id.in_([g.id for g in games])
+        ).group_by(Player.game_id).all())
+        for item in data:
+            item["player_count"] = counts.get(item["id"], 0)
+
+    last = games[-1] if games else None
+    return {
+        "data": data,
+        "next_cursor": encode_cursor(last.created_at, last.id) if has_more else None
+    }
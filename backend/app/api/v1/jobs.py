@@ -0,0 +1,114 @@
+"""
+Jobs API Blueprint
+Handles background job submission and status polling
+"""
+from flask import Blueprint, request, jsonify
+from app.services.job_service import JobService
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route('', methods=['POST'])
+def enqueue_job():
+    """
+    Queue a background job
+
+    Request Body:
+    {
+        "job_type": "game_report",     // settle_round, generate_finance_records, game_report
+        "payload": {"game_id": 1},
+        "idempotency_key": "report-1"  // Optional; also accepted as the Idempotency-Key header
+    }
+
+    Response (202):
+    {
+        "success": true,
+        "data": {
+            "id": 1,
+            "job_type": "game_report",
+            "status": "queued",
+            ...
+        }
+    }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+
+        job_type = data.get('job_type')
+        if not job_type:
+            return jsonify({
+                "success": False,
+                "error": "job_type is required"
+            }), 400
+
+        payload = data.get('payload') or {}
+        if not isinstance(payload, dict):
+            return jsonify({
+                "success": False,
+                "error": "payload must be an object"
+            }), 400
+
+        idempotency_key = data.get('idempotency_key') or request.headers.get('Idempotency-Key')
+
+        job = JobService.enqueue(job_type, payload, idempotency_key=idempotency_key)
+
+        return jsonify({
+            "success": True,
+            "data": job.to_dict()
+        }), 202
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+def get_job(job_id: int):
+    """
+    Get job status and result
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "id": 1,
+            "job_type": "settle_round",
+            "status": "succeeded",   // queued, running, succeeded, failed
+            "attempts": 1,
+            "result": {...},
+            "error": null,
+            ...
+        }
+    }
+    """
+    try:
+        job = JobService.get_job(job_id)
+
+        return jsonify({
+            "success": True,
+            "data": job
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
+# Export blueprint
+__all__ = ['jobs_bp']
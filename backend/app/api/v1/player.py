@@ -3,9 +3,13 @@
 """
 from flask import Blueprint, request, jsonify
 from app.core.database import db
+from app.core.replica import use_replica
 from app.models.game import Game
 from app.models.player import Player
-from app.models.product import ProductRecipe, PlayerProduct
+from app.services.event_service import EventService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.settlement_scheduler import get_scheduler
+from app.services.turn_service import TurnService
 from datetime import datetime
 
 # 蓝图
@@ -90,16 +94,8 @@ def join_game():
     db.session.add(player)
     db.session.flush()  # 获取player.id
 
-    # 初始化配方（全部锁定）
-    recipes = ProductRecipe.query.all()
-    for recipe in recipes:
-        player_product = PlayerProduct(
-            player_id=player.id,
-            recipe_id=recipe.id,
-            is_unlocked=False
-        )
-        db.session.add(player_product)
-
+    EventService.record(player, 'player_joined', {"cash": float(player.cash)},
+                        round_number=game.current_round)
     db.session.commit()
 
     return jsonify({
@@ -120,6 +116,7 @@ def leave_game(player_id):
 
     db.session.delete(player)
     db.session.commit()
+    LeaderboardService.remove_player(game_id, player_id)
 
     # 如果房间空了，删除房间
     remaining_players = Player.query.filter_by(game_id=game_id).count()
@@ -162,6 +159,7 @@ def player_ready(player_id):
 
 
 @player_bp.route('/<int:player_id>', methods=['GET'])
+@use_replica
 def get_player(player_id):
     """获取玩家信息"""
     player = Player.query.get(player_id)
@@ -173,3 +171,108 @@ def get_player(player_id):
         "success": True,
         "data": player.to_dict()
     })
+
+
+@player_bp.route('/<int:player_id>/state', methods=['GET'])
+@use_replica
+def get_player_state(player_id):
+    """
+    按事件日志重放玩家状态
+
+    Query:
+        round: 回合数（可选，默认重放全部事件）
+    """
+    round_number = request.args.get('round', type=int)
+
+    try:
+        state = EventService.replay(player_id, round_number)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+
+    return jsonify({
+        "success": True,
+        "data": state
+    })
+
+
+@player_bp.route('/<int:player_id>/events', methods=['GET'])
+@use_replica
+def get_player_events(player_id):
+    """
+    获取玩家事件日志
+
+    Query:
+        round: 只返回该回合及之前的事件（可选）
+    """
+    round_number = request.args.get('round', type=int)
+
+    player = Player.query.get(player_id)
+    if not player:
+        return jsonify({"success": False, "error": "玩家不存在"}), 404
+
+    return jsonify({
+        "success": True,
+        "data": EventService.get_events(player_id, round_number)
+    })
+
+
+@player_bp.route('/<int:player_id>/turn', methods=['POST'])
+def submit_turn(player_id):
+    """
+    一次提交玩家本回合的全部操作
+
+    Request Body:
+    {
+        "actions": [
+            {"type": "upgrade_decoration", "target_level": 1},
+            {"type": "hire_employee", "name": "小王", "salary": 1000, "productivity": 60},
+            {"type": "research_product", "recipe_id": 2, "dice_result": 5},
+            {"type": "submit_production", "productions": [{"recipe_id": 2, "productivity": 60, "price": 20}]}
+        ]
+    }
+
+    所有操作先按同一份玩家快照校验，任何一步不合法则都不执行（400，errors 指明序号）；
+    校验通过后在同一个事务中按顺序执行，返回每一步的结果
+    """
+    data = request.get_json() or {}
+
+    try:
+        result = TurnService.execute_turn(player_id, data.get('actions'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Internal server error: {str(e)}"}), 500
+
+    if not result["success"]:
+        return jsonify({
+            "success": False,
+            "error": "回合操作校验失败",
+            "data": result
+        }), 400
+
+    # 提交了生产计划时，与单独提交接口一样通知结算调度器
+    if result["plan_submitted"]:
+        player = Player.query.get(player_id)
+        scheduler = get_scheduler()
+        result["settlement_queued"] = bool(
+            scheduler and scheduler.notify_submission(player.game_id, result["round_number"])
+        )
+
+    return jsonify({
+        "success": True,
+        "data": result
+    })
+
+
+@player_bp.route('/<int:player_id>/state/verify', methods=['GET'])
+def verify_player_state(player_id):
+    """对比事件重放结果与当前数据行"""
+    try:
+        result = EventService.verify_player(player_id)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+
+    return jsonify({
+        "success": True,
+        "data": result
+    })
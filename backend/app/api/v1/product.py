@@ -5,7 +5,6 @@ Handles product research and management endpoints
 from flask import Blueprint, request, jsonify
 from app.services.product_service import ProductService
 from app.models.player import Player
-from app.models.product import ProductRecipe
 
 product_bp = Blueprint('product', __name__)
 
@@ -202,15 +201,14 @@ def get_all_recipes():
             result = ProductService.get_available_recipes(player_id)
         else:
             # Get all recipes without unlock status
-            recipes = ProductRecipe.query.all()
             result = [
                 {
-                    "recipe_id": r.id,
-                    "name": r.name,
-                    "recipe_json": r.recipe_json,
-                    "base_fan_rate": r.base_fan_rate
+                    "recipe_id": r["recipe_id"],
+                    "name": r["name"],
+                    "recipe_json": r["recipe_json"],
+                    "base_fan_rate": r["base_fan_rate"]
                 }
-                for r in recipes
+                for r in ProductService.get_recipe_catalog()
             ]
 
         return jsonify({
@@ -4,6 +4,7 @@ Handles production plan submission and queries
 """
 from flask import Blueprint, request, jsonify
 from app.services.production_service import ProductionService
+from app.services.settlement_scheduler import get_scheduler
 from app.models.player import Player
 from app.models.game import Game
 
@@ -35,9 +36,14 @@ def submit_production_plan():
                 ...
                 "total_cost": 123.45
             },
-            "remaining_cash": 8876.55
+            "remaining_cash": 8876.55,
+            "settlement_queued": false
         }
     }
+
+    With SETTLEMENT_AUTO_ADVANCE enabled, the last submission of a round
+    queues its settlement in the background (settlement_queued: true);
+    poll /api/v1/rounds/<game_id>/settlement-status for completion.
     """
     try:
         data = request.get_json()
@@ -113,6 +119,11 @@ def submit_production_plan():
             productions=productions
         )
 
+        scheduler = get_scheduler()
+        result["settlement_queued"] = bool(
+            scheduler and scheduler.notify_submission(game.id, round_number)
+        )
+
         return jsonify({
             "success": True,
             "data": result
@@ -2,11 +2,15 @@
 Round API Blueprint
 Handles round progression and round queries
 """
+from datetime import timedelta, timezone
 from flask import Blueprint, request, jsonify
+from app.core.replica import use_replica, mark_client_write
+from app.services.job_service import JobService
 from app.services.round_service import RoundService
-from app.services.finance_service import FinanceService
+from app.services.settlement_scheduler import get_scheduler, settlement_job_key
+from app.services.settlement_service import SettlementService
+from app.utils.fields import sparse_fields
 from app.models.game import Game
-from app.models.player import Player
 
 round_bp = Blueprint('round', __name__)
 
@@ -16,9 +20,23 @@ def advance_round(game_id: int):
     """
     Advance to next round
 
+    Settlement is serialized per game and idempotent: a request for a round
+    that has already been settled (e.g. a concurrent click or a retry)
+    receives the stored result of that round instead of settling again.
+
     Args:
         game_id: Game ID
 
+    Request Body (optional):
+    {
+        "round": 1,     // Round the client is settling; send it so a retried request gets the stored
+                        // result instead of settling the next round (defaults to the current round)
+        "async": false  // Queue the settlement as a background job and return 202 with the job
+    }
+
+    Query:
+        fields: Optional sparse fieldset, e.g. fields=current_round,game_finished
+
     Response:
     {
         "success": true,
@@ -30,6 +48,9 @@ def advance_round(game_id: int):
             "game_finished": false
         }
     }
+
+    Async response (202): {"success": true, "data": {"job": {...}}};
+    poll /api/v1/jobs/<id> until its status is succeeded or failed.
     """
     try:
         # Verify game exists
@@ -40,23 +61,31 @@ def advance_round(game_id: int):
                 "error": f"Game {game_id} not found"
             }), 404
 
-        # Advance round
-        result = RoundService.advance_round(game_id)
+        data = request.get_json(silent=True) or {}
+        expected_round = data.get('round', game.current_round)
+        if isinstance(expected_round, bool) or not isinstance(expected_round, int) or expected_round < 1:
+            return jsonify({
+                "success": False,
+                "error": "round must be a positive integer"
+            }), 400
 
-        # Generate finance records for all players for the previous round
-        previous_round = result["previous_round"]
-        players = Player.query.filter_by(game_id=game_id, is_active=True).all()
+        if data.get('async'):
+            job = JobService.enqueue(
+                'settle_round',
+                {"game_id": game_id, "round_number": expected_round},
+                idempotency_key=settlement_job_key(game_id, expected_round)
+            )
+            return jsonify({
+                "success": True,
+                "data": {"job": job.to_dict()}
+            }), 202
 
-        for player in players:
-            try:
-                FinanceService.generate_finance_record(player.id, previous_round)
-            except Exception as e:
-                # Log error but continue
-                print(f"Error generating finance record for player {player.id}: {str(e)}")
+        # Settle the round (finance records, snapshots and leaderboards included)
+        result = SettlementService.settle_round(game_id, expected_round)
 
         return jsonify({
             "success": True,
-            "data": result
+            "data": sparse_fields(result)
         }), 200
 
     except ValueError as e:
@@ -72,7 +101,87 @@ def advance_round(game_id: int):
         }), 500
 
 
+@round_bp.route('/<int:game_id>/settlement-status', methods=['GET'])
+def get_settlement_status(game_id: int):
+    """
+    Get settlement progress of a game's current round
+
+    Query:
+        round: With wait, block until this round is settled
+        wait: Long-poll seconds (max 30)
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "game_id": 1,
+            "game_status": "in_progress",
+            "current_round": 2,
+            "submitted_players": 1,
+            "active_players": 2,
+            "round_settled": true,
+            "settlement": {"job_id": 7, "round": 1, "state": "settled", "error": null, "updated_at": "..."},
+            "deadline_at": "2024-01-01T12:05:00"
+        }
+    }
+    """
+    try:
+        game = Game.query.get(game_id)
+        if not game:
+            return jsonify({
+                "success": False,
+                "error": f"Game {game_id} not found"
+            }), 404
+
+        scheduler = get_scheduler()
+        round_number = request.args.get('round', type=int)
+        wait = min(request.args.get('wait', 0, type=float), 30)
+
+        round_settled = None
+        if round_number is not None:
+            if wait > 0 and scheduler:
+                round_settled = scheduler.wait_for_settlement(game_id, round_number, wait)
+                game = Game.query.get(game_id)
+            else:
+                round_settled = game.current_round > round_number
+
+        progress = RoundService.get_submission_progress(game_id, game.current_round)
+
+        # 刚结算完的回合：让每个玩家的客户端短时间内读主库，副本追上前也能看到新的财务数据
+        if game.current_round > 1:
+            settled_at = SettlementService.get_settled_at(game_id, game.current_round - 1)
+            if settled_at:
+                mark_client_write(settled_at.replace(tzinfo=timezone.utc).timestamp())
+
+        deadline_at = None
+        if scheduler and scheduler.deadline_seconds > 0 and game.status == 'in_progress':
+            started_at = scheduler.round_started_at(game)
+            if started_at:
+                deadline_at = (started_at + timedelta(seconds=scheduler.deadline_seconds)).isoformat()
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "game_id": game_id,
+                "game_status": game.status,
+                "current_round": game.current_round,
+                "submitted_players": progress["submitted"],
+                "active_players": progress["total"],
+                "round_settled": round_settled,
+                "settlement": scheduler.get_status(game) if scheduler else None,
+                "deadline_at": deadline_at
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
 @round_bp.route('/<int:game_id>/<int:round_number>/summary', methods=['GET'])
+@use_replica
 def get_round_summary(game_id: int, round_number: int):
     """
     Get summary of a specific round
@@ -81,6 +190,9 @@ def get_round_summary(game_id: int, round_number: int):
         game_id: Game ID
         round_number: Round number
 
+    Query:
+        fields: Optional sparse fieldset, e.g. fields=round_number,players.nickname,players.total_revenue
+
     Response:
     {
         "success": true,
@@ -105,7 +217,7 @@ def get_round_summary(game_id: int, round_number: int):
 
         return jsonify({
             "success": True,
-            "data": result
+            "data": sparse_fields(result)
         }), 200
 
     except ValueError as e:
@@ -121,6 +233,49 @@ def get_round_summary(game_id: int, round_number: int):
         }), 500
 
 
+@round_bp.route('/<int:game_id>/history', methods=['GET'])
+@use_replica
+def get_round_history(game_id: int):
+    """
+    Get summaries of all settled rounds (finished-game results screen)
+
+    Args:
+        game_id: Game ID
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "game_id": 1,
+            "status": "finished",
+            "rounds": [{"round_number": 1, "customer_flow": {...}, "players": [...]}, ...]
+        }
+    }
+    """
+    try:
+        game = Game.query.get(game_id)
+        if not game:
+            return jsonify({
+                "success": False,
+                "error": f"Game {game_id} not found"
+            }), 404
+
+        return jsonify({
+            "success": True,
+            "data": sparse_fields({
+                "game_id": game_id,
+                "status": game.status,
+                "rounds": RoundService.get_round_history(game_id)
+            })
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}"
+        }), 500
+
+
 @round_bp.route('/<int:game_id>/<int:round_number>/generate-flow', methods=['POST'])
 def generate_customer_flow(game_id: int, round_number: int):
     """
@@ -0,0 +1,143 @@
+"""
+ASGI 应用
+普通 API 通过 asgiref 的 WsgiToAsgi 转交 Flask 处理（在线程池中执行）；
+实时推送接口 /api/v1/stream/games/<game_id> 直接在事件循环里以 SSE 实现，
+空闲连接不占用线程。
+
+启动: uvicorn app.asgi:application --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import logging
+import re
+from asgiref.wsgi import WsgiToAsgi
+from app.core.async_db import AsyncDatabase
+from app.core.metrics import STREAM_CONNECTIONS, registry
+from app.main import app as flask_app
+from app.services.game_stream import GameStateHub
+
+logger = logging.getLogger(__name__)
+
+_STREAM_PATH = re.compile(r'^/api/v1/stream/games/(\d+)/?$')
+
+_SSE_HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+    (b'vary', b'origin')
+]
+
+
+def _cors_headers(scope, allowed_origins) -> list:
+    """只对 CORS_ORIGINS 中的来源回显 Access-Control-Allow-Origin（SSE 接口不经过 flask-cors）"""
+    origin = dict(scope.get('headers') or []).get(b'origin')
+    if origin is None:
+        return []
+    if '*' in allowed_origins or origin.decode('latin-1') in allowed_origins:
+        return [(b'access-control-allow-origin', origin)]
+    return []
+
+
+def _sse(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {flask_app.json.dumps(data)}\n\n".encode()
+
+
+def create_asgi_app(app):
+    """把 Flask 应用包装成 ASGI 应用，并挂载 SSE 推送接口"""
+    wsgi = WsgiToAsgi(app)
+    database = AsyncDatabase(app.config)
+    hub = GameStateHub(database, app.config.get('STREAM_POLL_INTERVAL', 1.0))
+    heartbeat = app.config.get('STREAM_HEARTBEAT_SECONDS', 15)
+    allowed_origins = [origin.strip() for origin in app.config.get('CORS_ORIGINS', []) if origin.strip()]
+    registry.gauge('naicha_stream_subscribers', 'Open SSE game stream connections',
+                   callback=lambda: {(): hub.subscriber_count})
+
+    async def stream_game(scope, receive, send, game_id: int):
+        """
+        推送游戏状态
+
+        事件:
+            state: {"game_id", "status", "current_round", "submitted_players", "active_players"}
+            error: 游戏不存在
+        游戏结束后发送最后一个 state 事件并关闭连接；空闲时每 heartbeat 秒发送注释行保活。
+        """
+        if scope['method'] != 'GET':
+            STREAM_CONNECTIONS.inc(status=405)
+            await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'GET')]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        STREAM_CONNECTIONS.inc(status=200)
+        headers = _SSE_HEADERS + _cors_headers(scope, allowed_origins)
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+
+        async def wait_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        disconnected = asyncio.create_task(wait_disconnect())
+        try:
+            async with hub.subscribe(game_id) as queue:
+                while True:
+                    update = asyncio.create_task(queue.get())
+                    done, _ = await asyncio.wait(
+                        {update, disconnected},
+                        timeout=heartbeat,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                    if disconnected in done:
+                        update.cancel()
+                        return
+
+                    if update not in done:
+                        update.cancel()
+                        await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+                        continue
+
+                    state = update.result()
+                    if state is None:
+                        await send({'type': 'http.response.body', 'body': _sse('error', {"error": f"Game {game_id} not found"})})
+                        return
+
+                    finished = state['status'] == 'finished'
+                    await send({'type': 'http.response.body', 'body': _sse('state', state), 'more_body': not finished})
+                    if finished:
+                        return
+        except OSError:
+            # 客户端已断开
+            pass
+        finally:
+            disconnected.cancel()
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await database.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def application(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await lifespan(receive, send)
+            return
+
+        if scope['type'] == 'http':
+            match = _STREAM_PATH.match(scope['path'])
+            if match:
+                await stream_game(scope, receive, send, int(match.group(1)))
+                return
+
+        await wsgi(scope, receive, send)
+
+    application.hub = hub
+    return application
+
+
+# ASGI 应用实例
+application = create_asgi_app(flask_app)
+
+
+__all__ = ['create_asgi_app', 'application']
@@ -0,0 +1,29 @@
+"""
+运维接口鉴权
+/metrics/sql、/admin/profiles 等接口会暴露原始 SQL、耗时和分析文件，
+只有配置了 ADMIN_TOKEN 才开放，请求需携带 X-Admin-Token 请求头
+"""
+import functools
+import hmac
+from flask import abort, current_app, request
+
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+
+def admin_required(view):
+    """未配置 ADMIN_TOKEN 时接口不存在（404），令牌不匹配时返回 403"""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = current_app.config.get('ADMIN_TOKEN') or ''
+        if not expected:
+            abort(404)
+        provided = request.headers.get(ADMIN_TOKEN_HEADER, '')
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            abort(403)
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+__all__ = ['admin_required', 'ADMIN_TOKEN_HEADER']
@@ -0,0 +1,80 @@
+"""
+异步数据库访问
+ASGI 模式下实时推送的热点只读查询使用异步驱动（aiomysql / aiosqlite），
+等待数据库时不占用线程；未安装异步驱动时回退到线程池执行同步查询。
+"""
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy import create_engine
+from app.core.database import build_engine_options
+
+logger = logging.getLogger(__name__)
+
+# 同步驱动 -> 对应的异步驱动
+ASYNC_DRIVERS = {
+    'mysql+pymysql': 'mysql+aiomysql',
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite'
+}
+
+
+def to_async_url(uri: str) -> Optional[str]:
+    """把同步连接串换成异步驱动，无对应驱动时返回 None"""
+    scheme, sep, rest = uri.partition('://')
+    driver = ASYNC_DRIVERS.get(scheme)
+    return f"{driver}{sep}{rest}" if driver else None
+
+
+class AsyncDatabase:
+    """只读查询的异步执行器"""
+
+    def __init__(self, config):
+        uri = config['SQLALCHEMY_DATABASE_URI']
+        async_uri = config.get('ASYNC_DATABASE_URL') or to_async_url(uri)
+
+        self._async_engine = None
+        self._sync_engine = None
+
+        if async_uri:
+            try:
+                from sqlalchemy.ext.asyncio import create_async_engine
+
+                options = {} if async_uri.startswith('sqlite') else {
+                    'pool_size': config.get('ASYNC_DB_POOL_SIZE', 5),
+                    'pool_recycle': config.get('DB_POOL_RECYCLE', 280),
+                    'pool_pre_ping': True
+                }
+                self._async_engine = create_async_engine(async_uri, **options)
+            except ImportError as e:
+                logger.warning("Async database driver unavailable (%s), falling back to threads", e)
+
+        if self._async_engine is None:
+            self._sync_engine = create_engine(uri, **build_engine_options(config, uri))
+
+    @property
+    def is_async(self) -> bool:
+        return self._async_engine is not None
+
+    async def fetch_one(self, statement):
+        """执行查询并返回第一行（mapping），无结果时返回 None"""
+        if self._async_engine is not None:
+            async with self._async_engine.connect() as conn:
+                result = await conn.execute(statement)
+                return result.mappings().first()
+
+        return await asyncio.to_thread(self._fetch_one_sync, statement)
+
+    def _fetch_one_sync(self, statement):
+        with self._sync_engine.connect() as conn:
+            return conn.execute(statement).mappings().first()
+
+    async def dispose(self):
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        if self._sync_engine is not None:
+            self._sync_engine.dispose()
+
+
+__all__ = ['AsyncDatabase', 'to_async_url']
@@ -0,0 +1,92 @@
+"""
+响应压缩
+对 /api/* 下超过阈值的响应按 Accept-Encoding 协商 br / gzip 压缩，
+未安装 brotli 时只提供 gzip
+"""
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖
+    brotli = None
+
+_COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/plain',
+    'text/html',
+    'text/csv'
+}
+
+
+def _accepted_encodings(header: str) -> dict:
+    """解析 Accept-Encoding，返回 {编码: q值}"""
+    encodings = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+def choose_encoding(header: str):
+    """按客户端偏好选择压缩算法，同等偏好下 br 优先"""
+    accepted = _accepted_encodings(header or '')
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level)
+
+
+def init_compression(app):
+    """注册响应压缩钩子"""
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+    gzip_level = app.config.get('COMPRESSION_GZIP_LEVEL', 6)
+    brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 5)
+
+    @app.after_request
+    def _compress_response(response):
+        if not request.path.startswith('/api/'):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in _COMPRESSIBLE_MIMETYPES):
+            return response
+
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        response.set_data(compress_body(body, encoding, gzip_level, brotli_quality))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -1,19 +1,206 @@
 """
 Flask-SQLAlchemy数据库连接管理
 """
+import contextlib
+import functools
+import random
+import time
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, DB_TRANSACTION_RETRIES
+from app.core.replica import REPLICA_BIND_KEY, init_replica_routing, should_use_replica
+
+
+class RoutingSession(Session):
+    """只读接口的查询路由到副本，其余情况沿用默认绑定"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and should_use_replica(self):
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def commit(self):
+        # atomic() 块内的提交推迟到块结束：flush 后像提交一样让已加载对象过期，
+        # 后续语句读到本次修改（包括关系属性）
+        if self.info.get('atomic_depth'):
+            self.flush()
+            self.expire_all()
+            return
+        super().commit()
+
 
 # 创建SQLAlchemy实例
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# 允许通过配置设置的事务隔离级别
+ISOLATION_LEVELS = ('READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ', 'SERIALIZABLE')
+
+# 可重试的 MySQL 错误：锁等待超时、死锁
+RETRYABLE_MYSQL_ERRORS = (1205, 1213)
+
+
+def is_transaction_conflict(error: OperationalError) -> bool:
+    """是否为重试即可成功的锁冲突（MySQL 死锁/锁等待超时，SQLite 库被锁）"""
+    orig = getattr(error, 'orig', None)
+    if orig is None:
+        return False
+    if orig.args and orig.args[0] in RETRYABLE_MYSQL_ERRORS:
+        return True
+    return 'database is locked' in str(orig)
+
+
+@contextlib.contextmanager
+def atomic():
+    """
+    把块内多个服务调用合并为一个事务
+
+    块内服务方法的 db.session.commit() 只做 flush；块正常结束时统一提交，
+    抛出异常时整体回滚。可以嵌套，只有最外层提交或回滚。
+    """
+    info = db.session.info
+    depth = info.get('atomic_depth', 0)
+    info['atomic_depth'] = depth + 1
+    try:
+        yield db.session
+    except Exception:
+        info['atomic_depth'] = depth
+        if depth == 0:
+            db.session.rollback()
+        raise
+    info['atomic_depth'] = depth
+    if depth == 0:
+        db.session.commit()
+
+
+def in_atomic() -> bool:
+    """当前是否处于 atomic() 块内"""
+    return db.session.info.get('atomic_depth', 0) > 0
+
+
+def retry_on_conflict(func):
+    """
+    服务方法遇到锁冲突时回滚并整体重试
+
+    最多执行 TX_RETRY_ATTEMPTS 次，重试前按 TX_RETRY_BACKOFF_MS 线性退避并加随机抖动；
+    业务错误（ValueError）和其他数据库错误直接抛出。
+    在 atomic() 块内不单独重试（回滚会丢掉块内之前的修改），由块外层的调用重试。
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if in_atomic():
+            return func(*args, **kwargs)
+
+        attempts = current_app.config.get('TX_RETRY_ATTEMPTS', 3)
+        backoff = current_app.config.get('TX_RETRY_BACKOFF_MS', 20) / 1000.0
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as e:
+                db.session.rollback()
+                if attempt >= attempts or not is_transaction_conflict(e):
+                    raise
+                DB_TRANSACTION_RETRIES.inc(operation=func.__qualname__)
+                time.sleep(backoff * attempt * random.uniform(0.5, 1.5))
+
+    return wrapper
+
+
+class TimedQueuePool(QueuePool):
+    """记录连接获取等待时间的连接池"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def build_engine_options(config, uri: str) -> dict:
+    """
+    根据配置生成引擎参数
+
+    SQLite 使用自己的连接池实现，不做调优；
+    其余数据库使用带计时的 QueuePool，MySQL 额外设置 PyMySQL 驱动参数
+    """
+    if uri.startswith('sqlite'):
+        return {}
+
+    options = {
+        'poolclass': TimedQueuePool,
+        'pool_size': config.get('DB_POOL_SIZE', 10),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 20),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 280),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 10)
+    }
+
+    if uri.startswith('mysql+pymysql'):
+        connect_args = {
+            'connect_timeout': config.get('DB_CONNECT_TIMEOUT', 10),
+            'autocommit': config.get('DB_AUTOCOMMIT', False)
+        }
+
+        # 未配置时保持服务器默认隔离级别
+        isolation_level = (config.get('DB_ISOLATION_LEVEL') or '').strip().upper()
+        if isolation_level:
+            if isolation_level not in ISOLATION_LEVELS:
+                raise ValueError(f"Invalid DB_ISOLATION_LEVEL: {isolation_level}")
+            connect_args['init_command'] = f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}"
+
+        options['connect_args'] = connect_args
+
+    return options
+
+
+def pool_status() -> dict:
+    """
+    获取各数据库引擎的连接池状态
+
+    Returns:
+        {
+            "default": {"size": 10, "checked_in": 3, "checked_out": 2, "overflow": 0},
+            ...
+        }
+    """
+    status = {}
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        status[bind_key or 'default'] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        }
+    return status
 
 
 def init_db(app):
     """初始化数据库"""
+    engine_options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for key, value in build_engine_options(app.config, app.config['SQLALCHEMY_DATABASE_URI']).items():
+        engine_options.setdefault(key, value)
+
+    # 只读副本
+    replica_uri = app.config.get('REPLICA_DATABASE_URI')
+    if replica_uri:
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(REPLICA_BIND_KEY, {'url': replica_uri, **build_engine_options(app.config, replica_uri)})
+
     db.init_app(app)
+    init_replica_routing(app, RoutingSession)
 
     with app.app_context():
         # 导入所有模型
-        from app.models import game, player, product, finance
+        from app.models import game, player, product, finance, event
 
         # 创建所有表（开发阶段使用，生产环境应使用Flask-Migrate）
         # db.create_all()
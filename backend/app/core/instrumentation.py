@@ -0,0 +1,204 @@
+"""
+SQL查询埋点
+基于SQLAlchemy游标事件，按Flask端点统计查询次数、数据库耗时和慢查询，
+通过 Server-Timing 响应头、/metrics 计数器和 /metrics/sql 明细（需 ADMIN_TOKEN）对外暴露
+"""
+import logging
+import threading
+import time
+from flask import g, has_request_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.admin import admin_required
+from app.core.metrics import DB_QUERIES, DB_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 慢查询记录的语句最大长度
+_STATEMENT_MAX_LENGTH = 500
+
+_listeners_installed = False
+
+
+class RequestQueryStats:
+    """单个请求内的查询统计"""
+
+    def __init__(self, slow_query_ms: float, slow_query_top: int):
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_top = slow_query_top
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.slowest = []  # [(duration_ms, statement)]，按耗时降序
+
+    def add(self, statement: str, duration_ms: float):
+        """记录一条已执行的语句"""
+        self.query_count += 1
+        self.db_time_ms += duration_ms
+
+        if duration_ms < self.slow_query_ms:
+            return
+
+        self.slowest.append((duration_ms, statement[:_STATEMENT_MAX_LENGTH]))
+        self.slowest.sort(key=lambda item: item[0], reverse=True)
+        del self.slowest[self.slow_query_top:]
+
+
+class QueryStatsRegistry:
+    """按端点聚合的查询统计，跨线程共享"""
+
+    def __init__(self, slow_query_top: int = 5):
+        self.slow_query_top = slow_query_top
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint: str, stats: RequestQueryStats):
+        """合并一个请求的统计结果"""
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_time_ms": 0.0,
+                    "max_db_time_ms": 0.0,
+                    "slowest": []
+                }
+                self._endpoints[endpoint] = entry
+
+            entry["requests"] += 1
+            entry["queries"] += stats.query_count
+            entry["max_queries"] = max(entry["max_queries"], stats.query_count)
+            entry["db_time_ms"] += stats.db_time_ms
+            entry["max_db_time_ms"] = max(entry["max_db_time_ms"], stats.db_time_ms)
+
+            if stats.slowest:
+                entry["slowest"].extend(stats.slowest)
+                entry["slowest"].sort(key=lambda item: item[0], reverse=True)
+                del entry["slowest"][self.slow_query_top:]
+
+    def snapshot(self) -> dict:
+        """导出当前聚合结果"""
+        with self._lock:
+            result = {}
+            for endpoint, entry in self._endpoints.items():
+                requests_count = entry["requests"]
+                result[endpoint] = {
+                    "requests": requests_count,
+                    "queries": entry["queries"],
+                    "avg_queries": round(entry["queries"] / requests_count, 2),
+                    "max_queries": entry["max_queries"],
+                    "db_time_ms": round(entry["db_time_ms"], 2),
+                    "avg_db_time_ms": round(entry["db_time_ms"] / requests_count, 2),
+                    "max_db_time_ms": round(entry["max_db_time_ms"], 2),
+                    "slowest": [
+                        {"statement": statement, "duration_ms": round(duration, 2)}
+                        for duration, statement in entry["slowest"]
+                    ]
+                }
+            return result
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self._endpoints.clear()
+
+
+# 全局统计实例
+query_stats = QueryStatsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_time')
+    if not start_times:
+        return
+
+    duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+
+    # 后台线程（如清理任务）没有请求上下文，不计入端点统计
+    if not has_request_context():
+        return
+
+    stats = g.get('sql_stats')
+    if stats is None:
+        return
+
+    stats.add(statement, duration_ms)
+
+    if duration_ms >= stats.slow_query_ms:
+        logger.warning("Slow query (%.1f ms) on %s: %s", duration_ms, request.endpoint,
+                       statement[:_STATEMENT_MAX_LENGTH])
+
+
+def _handle_error(exception_context):
+    # 执行失败时 after_cursor_execute 不会触发，需要弹出对应的开始时间
+    conn = exception_context.connection
+    if conn is None:
+        return
+    start_times = conn.info.get('query_start_time')
+    if start_times:
+        start_times.pop()
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+
+    # 监听 Engine 类，对所有引擎生效
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(Engine, 'handle_error', _handle_error)
+    _listeners_installed = True
+
+
+def init_instrumentation(app):
+    """注册查询埋点钩子和 /metrics/sql 接口"""
+    if not app.config.get('SQL_INSTRUMENTATION', True):
+        return
+
+    slow_query_ms = app.config.get('SQL_SLOW_QUERY_MS', 100)
+    slow_query_top = app.config.get('SQL_SLOW_QUERY_TOP', 5)
+    query_stats.slow_query_top = slow_query_top
+
+    _install_listeners()
+
+    @app.before_request
+    def _start_query_stats():
+        g.sql_stats = RequestQueryStats(slow_query_ms, slow_query_top)
+        g.request_start_time = time.perf_counter()
+
+    @app.after_request
+    def _finish_query_stats(response):
+        stats = g.get('sql_stats')
+        if stats is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        query_stats.record(endpoint, stats)
+        DB_QUERIES.inc(stats.query_count, endpoint=endpoint)
+        DB_QUERY_SECONDS.inc(stats.db_time_ms / 1000, endpoint=endpoint)
+
+        total_ms = (time.perf_counter() - g.request_start_time) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={stats.db_time_ms:.2f};desc="{stats.query_count} queries", app;dur={total_ms:.2f}'
+        )
+        return response
+
+    @app.route('/metrics/sql')
+    @admin_required
+    def sql_metrics():
+        return jsonify({
+            "success": True,
+            "data": {
+                "slow_query_ms": slow_query_ms,
+                "endpoints": query_stats.snapshot()
+            }
+        })
+
+    return query_stats
@@ -0,0 +1,370 @@
+"""
+进程内指标注册表
+提供 Counter / Histogram / Gauge，以 Prometheus 文本格式通过 /metrics 暴露
+
+热路径上的累加只写当前线程自己的计数单元，不需要加锁；
+抓取时再把所有线程的计数单元合并，已退出线程的数据会被折叠保留。
+"""
+import threading
+import time
+from flask import Response, g, request
+
+# 默认耗时分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, values, extra=None) -> str:
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.extend(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _ThreadCellMetric:
+    """按线程分片的指标基类"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cells = []      # [(thread, cell)]
+        self._retired = {}    # 已退出线程的合并数据
+
+    def _labels_key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _cell(self) -> dict:
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = {}
+            with self._lock:
+                self._fold_dead_cells()
+                self._cells.append((threading.current_thread(), cell))
+            self._local.cell = cell
+        return cell
+
+    def _fold_dead_cells(self):
+        alive = []
+        for thread, cell in self._cells:
+            if thread.is_alive():
+                alive.append((thread, cell))
+            else:
+                for key, value in dict(cell).items():
+                    self._merge_into(self._retired, key, value)
+        self._cells = alive
+
+    def _merge_into(self, target: dict, key, value):
+        raise NotImplementedError
+
+    def collect(self) -> dict:
+        """合并所有线程的数据"""
+        with self._lock:
+            merged = {}
+            for key, value in self._retired.items():
+                self._merge_into(merged, key, value)
+            for _, cell in self._cells:
+                for key, value in dict(cell).items():
+                    self._merge_into(merged, key, value)
+            return merged
+
+    def render(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_ThreadCellMetric):
+    """单调递增计数器"""
+
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        cell = self._cell()
+        key = self._labels_key(labels)
+        cell[key] = cell.get(key, 0) + amount
+
+    def _merge_into(self, target, key, value):
+        target[key] = target.get(key, 0) + value
+
+    def render(self) -> list:
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram(_ThreadCellMetric):
+    """分桶直方图"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        cell = self._cell()
+        key = self._labels_key(labels)
+        entry = cell.get(key)
+        if entry is None:
+            # [各分桶计数..., sum, count]
+            entry = [0] * (len(self.buckets) + 2)
+            cell[key] = entry
+
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[idx] += 1
+                break
+        entry[-2] += value
+        entry[-1] += 1
+
+    def time(self, **labels):
+        """上下文管理器，记录代码块耗时"""
+        return _Timer(self, labels)
+
+    def _merge_into(self, target, key, value):
+        entry = target.get(key)
+        if entry is None:
+            target[key] = list(value)
+        else:
+            for idx, item in enumerate(value):
+                entry[idx] += item
+
+    def render(self) -> list:
+        lines = []
+        for key, entry in sorted(self.collect().items()):
+            cumulative = 0
+            for idx, bound in enumerate(self.buckets):
+                cumulative += entry[idx]
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key, [('le', '+Inf')])
+            lines.append(f'{self.name}_bucket{labels} {entry[-1]}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(entry[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {entry[-1]}')
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class GaugeCollector:
+    """抓取时通过回调计算的瞬时值指标"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labelnames=(), callback=None):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def render(self) -> list:
+        """callback 返回 {标签值元组: 数值}"""
+        samples = self.callback() if self.callback else {}
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(samples.items())
+        ]
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name: str, help_text: str, labelnames=(), callback=None) -> GaugeCollector:
+        return self.register(GaugeCollector(name, help_text, labelnames, callback))
+
+    def render(self) -> str:
+        """输出 Prometheus 文本格式"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            try:
+                samples = metric.render()
+            except Exception:
+                # 单个指标采集失败（如数据库不可用）不影响其他指标
+                continue
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.metric_type}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+# 全局注册表
+registry = MetricsRegistry()
+
+# 请求
+HTTP_REQUEST_DURATION = registry.histogram(
+    'naicha_http_request_duration_seconds', 'HTTP request latency by route',
+    ('endpoint', 'method', 'status')
+)
+
+# 数据库
+DB_QUERIES = registry.counter(
+    'naicha_db_queries_total', 'SQL statements executed by endpoint', ('endpoint',)
+)
+DB_QUERY_SECONDS = registry.counter(
+    'naicha_db_query_seconds_total', 'Time spent in SQL statements by endpoint', ('endpoint',)
+)
+DB_TRANSACTION_RETRIES = registry.counter(
+    'naicha_db_transaction_retries_total', 'Service transactions retried after a lock conflict', ('operation',)
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    'naicha_db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+)
+
+# 游戏
+ROUNDS_SETTLED = registry.counter(
+    'naicha_rounds_settled_total', 'Rounds settled'
+)
+SETTLEMENT_DURATION = registry.histogram(
+    'naicha_settlement_duration_seconds', 'Round settlement duration'
+)
+
+# 清理任务
+CLEANUP_DURATION = registry.histogram(
+    'naicha_cleanup_run_duration_seconds', 'Inactive player cleanup run duration'
+)
+CLEANUP_ROWS_REMOVED = registry.counter(
+    'naicha_cleanup_rows_removed_total', 'Rows removed by the inactive player cleanup', ('table',)
+)
+
+# 实时推送（ASGI 模式的 SSE 接口不经过 Flask，单独计数）
+STREAM_CONNECTIONS = registry.counter(
+    'naicha_stream_connections_total', 'SSE game stream connections by response status', ('status',)
+)
+
+# 缓存
+CACHE_REQUESTS = registry.counter(
+    'naicha_cache_requests_total', 'Cache lookups by result', ('cache', 'result')
+)
+
+
+def record_cache_access(cache_name: str, hit: bool):
+    """记录一次缓存访问"""
+    CACHE_REQUESTS.inc(cache=cache_name, result='hit' if hit else 'miss')
+
+
+def _cache_hit_ratios() -> dict:
+    totals = {}
+    for (cache_name, result), value in CACHE_REQUESTS.collect().items():
+        hits, lookups = totals.get(cache_name, (0, 0))
+        if result == 'hit':
+            hits += value
+        totals[cache_name] = (hits, lookups + value)
+    return {
+        (cache_name,): round(hits / lookups, 4)
+        for cache_name, (hits, lookups) in totals.items() if lookups
+    }
+
+
+registry.gauge('naicha_cache_hit_ratio', 'Cache hit ratio since process start', ('cache',),
+               callback=_cache_hit_ratios)
+
+
+def _games_by_status() -> dict:
+    from app.core.database import db
+    from app.models.game import Game
+
+    rows = db.session.query(Game.status, db.func.count(Game.id)).group_by(Game.status).all()
+    return {(status,): count for status, count in rows}
+
+
+def _players_online() -> dict:
+    from datetime import datetime, timedelta
+    from app.models.player import Player
+
+    # 与会话过期判断保持一致：5分钟内有心跳视为在线
+    threshold = datetime.utcnow() - timedelta(seconds=300)
+    count = Player.query.filter(Player.last_active_at >= threshold).count()
+    return {(): count}
+
+
+def _pool_connections() -> dict:
+    from app.core.database import pool_status
+
+    samples = {}
+    for bind_key, status in pool_status().items():
+        for state, value in status.items():
+            samples[(bind_key, state)] = value
+    return samples
+
+
+registry.gauge('naicha_games', 'Games by status', ('status',), callback=_games_by_status)
+registry.gauge('naicha_db_pool_connections', 'Connection pool statistics', ('bind', 'state'),
+               callback=_pool_connections)
+registry.gauge('naicha_players_online', 'Players active within the last 5 minutes', callback=_players_online)
+
+
+def init_metrics(app):
+    """注册请求耗时采集和 /metrics 接口"""
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_start_time = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = g.get('metrics_start_time')
+        if start is not None:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                endpoint=request.endpoint or 'unknown',
+                method=request.method,
+                status=response.status_code
+            )
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return registry
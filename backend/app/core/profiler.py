@@ -0,0 +1,203 @@
+"""
+线上接口采样分析
+按请求头 X-Profile: 1 或配置的采样比例对视图函数做性能分析，
+结果按端点写入本地目录，供生成火焰图使用（/admin/profiles 下载，需 ADMIN_TOKEN）：
+- sampling 模式：定时采集请求线程调用栈，输出 collapsed stack (.folded)
+- cprofile 模式：输出 cProfile 统计文件 (.prof)
+"""
+import collections
+import cProfile
+import functools
+import os
+import random
+import sys
+import threading
+from datetime import datetime
+from flask import abort, jsonify, request, send_from_directory
+from app.core.admin import admin_required
+
+PROFILE_HEADER = 'X-Profile'
+
+_FILE_SUFFIXES = {
+    'sampling': '.folded',
+    'cprofile': '.prof'
+}
+
+
+class StackSampler:
+    """后台线程定时采集目标线程的调用栈"""
+
+    def __init__(self, thread_id: int, interval_seconds: float):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks = collections.Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stack-sampler")
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+
+            stack.reverse()
+            self.stacks[';'.join(stack)] += 1
+
+    def write_collapsed(self, path: str):
+        """写出 collapsed stack 格式，可直接交给 flamegraph.pl / speedscope"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class EndpointProfiler:
+    """视图函数分析器"""
+
+    def __init__(self, profile_dir: str, mode: str = 'sampling', sample_rate: float = 0.0,
+                 interval_ms: float = 5, keep_per_endpoint: int = 20):
+        if mode not in _FILE_SUFFIXES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        self.profile_dir = os.path.abspath(profile_dir)
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_ms / 1000.0
+        self.keep_per_endpoint = keep_per_endpoint
+
+    def should_profile(self) -> bool:
+        """请求头显式要求，或命中采样比例"""
+        if request.headers.get(PROFILE_HEADER) == '1':
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def wrap(self, endpoint: str, view):
+        """包装视图函数"""
+
+        @functools.wraps(view)
+        def profiled_view(*args, **kwargs):
+            if not self.should_profile():
+                return view(*args, **kwargs)
+            return self._run_profiled(endpoint, view, args, kwargs)
+
+        return profiled_view
+
+    def _run_profiled(self, endpoint: str, view, args, kwargs):
+        if self.mode == 'cprofile':
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                profile.disable()
+                profile.dump_stats(self._next_path(endpoint))
+                self._prune(endpoint)
+
+        sampler = StackSampler(threading.get_ident(), self.interval_seconds)
+        sampler.start()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            sampler.stop()
+            sampler.write_collapsed(self._next_path(endpoint))
+            self._prune(endpoint)
+
+    def _endpoint_dir(self, endpoint: str) -> str:
+        return os.path.join(self.profile_dir, endpoint)
+
+    def _next_path(self, endpoint: str) -> str:
+        directory = self._endpoint_dir(endpoint)
+        os.makedirs(directory, exist_ok=True)
+        filename = datetime.utcnow().strftime('%Y%m%d-%H%M%S-%f') + _FILE_SUFFIXES[self.mode]
+        return os.path.join(directory, filename)
+
+    def _prune(self, endpoint: str):
+        """每个端点只保留最近 keep_per_endpoint 份结果"""
+        directory = self._endpoint_dir(endpoint)
+        files = sorted(os.listdir(directory), reverse=True)
+        for filename in files[self.keep_per_endpoint:]:
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                pass
+
+    def list_profiles(self, limit: int = 50) -> list:
+        """列出最近的分析结果"""
+        if not os.path.isdir(self.profile_dir):
+            return []
+
+        profiles = []
+        for endpoint in os.listdir(self.profile_dir):
+            directory = self._endpoint_dir(endpoint)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                stat = os.stat(os.path.join(directory, filename))
+                profiles.append({
+                    "endpoint": endpoint,
+                    "file": filename,
+                    "size": stat.st_size,
+                    "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+                    "url": f"/admin/profiles/{endpoint}/{filename}"
+                })
+
+        profiles.sort(key=lambda p: p["created_at"], reverse=True)
+        return profiles[:limit]
+
+
+def init_profiler(app):
+    """
+    包装所有已注册的视图函数并注册分析结果管理接口
+    必须在所有蓝图和路由注册之后调用
+    """
+    if not app.config.get('PROFILING_ENABLED', False):
+        return None
+
+    profiler = EndpointProfiler(
+        profile_dir=app.config.get('PROFILE_DIR', 'profiles'),
+        mode=app.config.get('PROFILE_MODE', 'sampling'),
+        sample_rate=app.config.get('PROFILE_SAMPLE_RATE', 0.0),
+        interval_ms=app.config.get('PROFILE_INTERVAL_MS', 5),
+        keep_per_endpoint=app.config.get('PROFILE_KEEP', 20)
+    )
+
+    for endpoint, view in list(app.view_functions.items()):
+        if endpoint == 'static':
+            continue
+        app.view_functions[endpoint] = profiler.wrap(endpoint, view)
+
+    @app.route('/admin/profiles')
+    @admin_required
+    def list_profiles():
+        limit = request.args.get('limit', 50, type=int)
+        return jsonify({
+            "success": True,
+            "data": {
+                "mode": profiler.mode,
+                "sample_rate": profiler.sample_rate,
+                "profiles": profiler.list_profiles(limit)
+            }
+        })
+
+    @app.route('/admin/profiles/<endpoint>/<filename>')
+    @admin_required
+    def download_profile(endpoint, filename):
+        # 端点目录名只能取自已有的分析结果，避免路径穿越
+        if endpoint.startswith('.') or not os.path.isdir(profiler._endpoint_dir(endpoint)):
+            abort(404)
+        directory = profiler._endpoint_dir(endpoint)
+        return send_from_directory(directory, filename, as_attachment=True)
+
+    return profiler
@@ -0,0 +1,89 @@
+"""
+读写分离路由
+被 @use_replica 标记的只读接口把查询发往只读副本（REPLICA_DATABASE_URL），
+写入、flush 以及其余接口始终走主库。
+
+为保证"读到自己的写入"，粘滞状态由客户端携带：成功提交过写入的响应带上
+X-Last-Write（服务器时间戳），客户端在之后的请求中原样带回；
+距该时间不足 REPLICA_STICKY_SECONDS 秒的请求固定读主库，与请求落在哪个进程无关。
+回合结算后，结算状态接口把结算时间下发给同局每个玩家。
+"""
+import functools
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+REPLICA_BIND_KEY = 'replica'
+
+# 客户端携带的最近一次写入时间（Unix 时间戳，秒）
+LAST_WRITE_HEADER = 'X-Last-Write'
+
+
+def _client_last_write() -> float:
+    try:
+        return float(request.headers.get(LAST_WRITE_HEADER) or 0)
+    except ValueError:
+        return 0.0
+
+
+def mark_client_write(timestamp: float = None):
+    """
+    让本次响应携带写入时间，客户端在 REPLICA_STICKY_SECONDS 秒内读主库
+
+    Args:
+        timestamp: 写入时间（默认当前时间），例如其他进程完成的回合结算时间
+    """
+    timestamp = timestamp or time.time()
+    g.last_write_at = max(g.get('last_write_at', 0), timestamp)
+
+
+def use_replica(view):
+    """标记只读接口：除非命中写后粘滞，否则查询走只读副本"""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        window = current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+        if time.time() - _client_last_write() >= window:
+            g.db_route = REPLICA_BIND_KEY
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def no_read_stickiness(view):
+    """标记不触发写后粘滞的写接口（如心跳只刷新活跃时间）"""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        g.skip_read_stickiness = True
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def should_use_replica(session) -> bool:
+    """供 RoutingSession.get_bind 判断当前查询能否发往副本"""
+    if not has_request_context() or g.get('db_route') != REPLICA_BIND_KEY:
+        return False
+    # 有待写入的数据时不能离开主库
+    return not (session._flushing or session.new or session.dirty or session.deleted)
+
+
+def init_replica_routing(app, session_class):
+    """注册写入跟踪和写后粘滞"""
+    if REPLICA_BIND_KEY not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    @event.listens_for(session_class, 'after_commit')
+    def _track_commit(session):
+        if has_request_context():
+            g.db_committed = True
+
+    @app.after_request
+    def _mark_sticky(response):
+        if (g.get('db_committed') and not g.get('skip_read_stickiness')
+                and response.status_code < 400):
+            mark_client_write()
+        if g.get('last_write_at'):
+            response.headers[LAST_WRITE_HEADER] = f"{g.last_write_at:.3f}"
+        return response
@@ -3,9 +3,16 @@ Flask 应用
 """
 from flask import Flask, jsonify
 from flask_cors import CORS
+from app.core.compression import init_compression
 from app.core.config import config
-from app.core.database import db, init_db
+from app.core.database import db, init_db, pool_status
+from app.core.instrumentation import init_instrumentation
+from app.core.json_provider import FastJSONProvider
+from app.core.metrics import init_metrics
+from app.core.profiler import init_profiler
+from app.services.job_worker import init_job_workers
 from app.services.session_cleanup import start_inactive_player_cleanup
+from app.services.settlement_scheduler import init_settlement_scheduler
 
 
 def create_app(config_name='default'):
@@ -15,12 +22,16 @@ def create_app(config_name='default'):
     # 载入配置
     app.config.from_object(config[config_name])
 
+    # JSON 序列化（优先 orjson）
+    app.json = FastJSONProvider(app)
+
     # 初始化CORS - 默认放开前端调试
     CORS(app, resources={
         r"/api/*": {
             "origins": "*",
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Session-Token"],
+            "allow_headers": ["Content-Type", "Authorization", "X-Session-Token", "X-Profile", "X-Last-Write"],
+            "expose_headers": ["X-Last-Write"],
             "supports_credentials": False
         }
     })
@@ -28,8 +39,15 @@ def create_app(config_name='default'):
     # 初始化数据库
     init_db(app)
 
+    # 初始化指标采集和SQL查询埋点
+    init_metrics(app)
+    init_instrumentation(app)
+
+    # 响应压缩（/api/* 下超过阈值的响应）
+    init_compression(app)
+
     # 注册蓝图
-    from app.api.v1 import game_bp, player_bp, production_bp, round_bp, finance_bp, shop_bp, employee_bp, product_bp, market_bp, auth_bp
+    from app.api.v1 import game_bp, player_bp, production_bp, round_bp, finance_bp, shop_bp, employee_bp, product_bp, market_bp, auth_bp, jobs_bp
     app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
     app.register_blueprint(game_bp, url_prefix='/api/v1/games')
     app.register_blueprint(player_bp, url_prefix='/api/v1/players')
@@ -40,9 +58,17 @@ def create_app(config_name='default'):
     app.register_blueprint(employee_bp, url_prefix='/api/v1/employees')
     app.register_blueprint(product_bp, url_prefix='/api/v1/products')
     app.register_blueprint(market_bp, url_prefix='/api/v1/market')
+    app.register_blueprint(jobs_bp, url_prefix='/api/v1/jobs')
 
-    # 启动自动清理任务
-    start_inactive_player_cleanup(app)
+    # 启动自动清理任务（worker 等辅助进程不启动，避免每个进程重复清理）
+    if app.config.get('BACKGROUND_THREADS', True):
+        start_inactive_player_cleanup(app)
+
+    # 回合结算调度（全员提交后自动结算 / 截止时间强制结算）
+    init_settlement_scheduler(app, start_watcher=app.config.get('BACKGROUND_THREADS', True))
+
+    # 后台任务 worker（结算、财务记录批量生成、终局报告）
+    init_job_workers(app)
 
     # 根路由
     @app.route('/')
@@ -60,14 +86,18 @@ def create_app(config_name='default'):
                 "shops": "/api/v1/shops",
                 "employees": "/api/v1/employees",
                 "products": "/api/v1/products",
-                "market": "/api/v1/market"
+                "market": "/api/v1/market",
+                "jobs": "/api/v1/jobs"
             }
         })
 
     # 健康检查
     @app.route('/health')
     def health():
-        return jsonify({"status": "ok", "message": "Service is running"})
+        return jsonify({"status": "ok", "message": "Service is running", "database_pool": pool_status()})
+
+    # 接口采样分析（需在所有路由注册之后包装视图函数）
+    init_profiler(app)
 
     return app
 
@@ -1,12 +1,16 @@
 # Models package
-from app.models.game import Game, CustomerFlow
+from app.models.game import Game, CustomerFlow, RoundSummary, SequenceCounter
 from app.models.player import Player, Shop, Employee
 from app.models.product import ProductRecipe, PlayerProduct, RoundProduction
-from app.models.finance import FinanceRecord, MaterialInventory, ResearchLog, MarketAction
+from app.models.finance import FinanceRecord, MaterialInventory, ResearchLog, MarketAction, CashLedgerEntry
+from app.models.event import GameEvent, PlayerSnapshot
+from app.models.job import Job
 
 __all__ = [
-    'Game', 'CustomerFlow',
+    'Game', 'CustomerFlow', 'RoundSummary', 'SequenceCounter',
     'Player', 'Shop', 'Employee',
     'ProductRecipe', 'PlayerProduct', 'RoundProduction',
-    'FinanceRecord', 'MaterialInventory', 'ResearchLog', 'MarketAction'
+    'FinanceRecord', 'MaterialInventory', 'ResearchLog', 'MarketAction', 'CashLedgerEntry',
+    'GameEvent', 'PlayerSnapshot',
+    'Job'
 ]
@@ -0,0 +1,58 @@
+"""
+Game event log models
+Append-only event log and periodic per-player state snapshots
+"""
+from app.core.database import db
+from datetime import datetime
+
+
+class GameEvent(db.Model):
+    """Append-only game event"""
+    __tablename__ = "game_events"
+
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='CASCADE'), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=True)
+    round_number = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(30), nullable=False, comment='shop_opened, employee_hired, round_settled, ...')
+    payload = db.Column(db.JSON, nullable=True, comment='Event data JSON')
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Index
+    __table_args__ = (
+        db.Index('idx_event_player', 'player_id', 'id'),
+        db.Index('idx_event_game_round', 'game_id', 'round_number'),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "id": self.id,
+            "game_id": self.game_id,
+            "player_id": self.player_id,
+            "round_number": self.round_number,
+            "event_type": self.event_type,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+
+
+class PlayerSnapshot(db.Model):
+    """Folded player state after all events up to the end of round_number"""
+    __tablename__ = "player_snapshots"
+
+    id = db.Column(db.Integer, primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+    round_number = db.Column(db.Integer, nullable=False)
+    last_event_id = db.Column(db.Integer, nullable=False, comment='Last event folded into this snapshot')
+    state = db.Column(db.JSON, nullable=False, comment='Player state JSON')
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Unique constraint
+    __table_args__ = (
+        db.UniqueConstraint('player_id', 'round_number', name='uk_snapshot_player_round'),
+    )
+
+
+# Export models
+__all__ = ['GameEvent', 'PlayerSnapshot']
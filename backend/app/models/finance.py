@@ -1,6 +1,6 @@
 """
 Finance-related data models
-Includes FinanceRecord, MaterialInventory, ResearchLog, MarketAction
+Includes FinanceRecord, MaterialInventory, ResearchLog, MarketAction, CashLedgerEntry
 """
 from app.core.database import db
 from datetime import datetime
@@ -168,5 +168,35 @@ class MarketAction(db.Model):
         }
 
 
+class CashLedgerEntry(db.Model):
+    """Append-only cash movement; initial cash plus a player's entries equals its cash"""
+    __tablename__ = "cash_ledger"
+
+    id = db.Column(db.Integer, primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+    round_number = db.Column(db.Integer, nullable=False)
+    category = db.Column(db.String(30), nullable=False, comment='revenue, material, decoration, hiring, ...')
+    amount = db.Column(db.DECIMAL(10, 2), nullable=False, comment='Signed amount: positive credits, negative debits')
+    reference = db.Column(db.String(50), nullable=True, comment='Source record, e.g. employee:12')
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # Index
+    __table_args__ = (
+        db.Index('idx_ledger_player_round', 'player_id', 'round_number'),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "id": self.id,
+            "player_id": self.player_id,
+            "round_number": self.round_number,
+            "category": self.category,
+            "amount": float(self.amount),
+            "reference": self.reference,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+
+
 # Export models
-__all__ = ['FinanceRecord', 'MaterialInventory', 'ResearchLog', 'MarketAction']
+__all__ = ['FinanceRecord', 'MaterialInventory', 'ResearchLog', 'MarketAction', 'CashLedgerEntry']
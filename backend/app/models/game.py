@@ -24,6 +24,11 @@ class Game(db.Model):
     players = db.relationship("Player", back_populates="game", cascade="all, delete-orphan")
     customer_flows = db.relationship("CustomerFlow", back_populates="game", cascade="all, delete-orphan")
 
+    # 索引：大厅按状态分页（keyset: status, created_at, id）
+    __table_args__ = (
+        db.Index('idx_game_status_created', 'status', 'created_at', 'id'),
+    )
+
     def to_dict(self):
         """转换为字典"""
         return {
@@ -62,3 +67,39 @@ class CustomerFlow(db.Model):
             "high_tier_customers": self.high_tier_customers,
             "low_tier_customers": self.low_tier_customers
         }
+
+
+class RoundSummary(db.Model):
+    """回合结算投影：每位玩家每个产品一行（未生产的玩家一行 product_id=0），结算时一次写入"""
+    __tablename__ = "round_summaries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='CASCADE'), nullable=False)
+    round_number = db.Column(db.Integer, nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+    nickname = db.Column(db.String(50), nullable=False)
+    product_id = db.Column(db.Integer, nullable=False, comment='PlayerProduct.id (0: player produced nothing)')
+    product_name = db.Column(db.String(50), nullable=False)
+    price = db.Column(db.DECIMAL(6, 2), nullable=True)
+    produced = db.Column(db.Integer, default=0)
+    sold = db.Column(db.Integer, default=0)
+    sold_to_high = db.Column(db.Integer, default=0)
+    sold_to_low = db.Column(db.Integer, default=0)
+    revenue = db.Column(db.DECIMAL(10, 2), default=0.00)
+    high_tier_customers = db.Column(db.Integer, nullable=False)
+    low_tier_customers = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+
+    # 索引
+    __table_args__ = (
+        db.UniqueConstraint('game_id', 'round_number', 'player_id', 'product_id', name='uk_summary_round_product'),
+        db.Index('idx_summary_game_round', 'game_id', 'round_number'),
+    )
+
+
+class SequenceCounter(db.Model):
+    """命名计数器：各进程按块预留连续区间（如房间码序号）"""
+    __tablename__ = "sequence_counters"
+
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=0, comment='下一个未分配的值')
@@ -0,0 +1,53 @@
+"""
+Background job model
+Durable job queue rows claimed and executed by job workers
+"""
+from app.core.database import db
+from datetime import datetime
+
+
+class Job(db.Model):
+    """Queued background job"""
+    __tablename__ = "jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False, comment='settle_round, generate_finance_records, game_report, ...')
+    idempotency_key = db.Column(db.String(100), nullable=True, comment='Enqueueing the same key returns the existing job')
+    payload = db.Column(db.JSON, nullable=True, comment='Handler arguments JSON')
+    status = db.Column(db.String(20), default='queued', comment='queued, running, succeeded, failed')
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    result = db.Column(db.JSON, nullable=True, comment='Handler return value JSON')
+    error = db.Column(db.Text, nullable=True)
+    run_after = db.Column(db.TIMESTAMP, default=datetime.utcnow, comment='Not claimed before this time (retry backoff)')
+    locked_by = db.Column(db.String(100), nullable=True, comment='Worker that claimed the job')
+    locked_at = db.Column(db.TIMESTAMP, nullable=True)
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    finished_at = db.Column(db.TIMESTAMP, nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint('idempotency_key', name='uk_job_idempotency_key'),
+        db.Index('idx_job_status_run_after', 'status', 'run_after'),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "idempotency_key": self.idempotency_key,
+            "payload": self.payload,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "result": self.result,
+            "error": self.error,
+            "run_after": self.run_after.isoformat() if self.run_after else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+# Export models
+__all__ = ['Job']
@@ -58,6 +58,10 @@ class Shop(db.Model):
     decoration_level = db.Column(db.Integer, default=0)
     max_employees = db.Column(db.Integer, default=0)
     created_round = db.Column(db.Integer, nullable=False)
+    # 在职员工汇总，由雇佣/解雇/调薪在同一事务中维护
+    total_productivity = db.Column(db.Integer, default=0, nullable=False)
+    total_salary = db.Column(db.DECIMAL(10, 2), default=0, nullable=False)
+    active_employee_count = db.Column(db.Integer, default=0, nullable=False)
 
     # 关系
     player = db.relationship("Player", back_populates="shop")
@@ -72,7 +76,10 @@ class Shop(db.Model):
             "rent": float(self.rent) if self.rent else 0,
             "decoration_level": self.decoration_level,
             "max_employees": self.max_employees,
-            "created_round": self.created_round
+            "created_round": self.created_round,
+            "total_productivity": self.total_productivity or 0,
+            "total_salary": float(self.total_salary or 0),
+            "active_employee_count": self.active_employee_count or 0
         }
 
 
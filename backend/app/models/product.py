@@ -50,6 +50,11 @@ class PlayerProduct(db.Model):
     player = db.relationship("Player", back_populates="products")
     recipe = db.relationship("ProductRecipe", back_populates="player_products")
 
+    # 唯一约束：未解锁的产品不落库，研发成功时才插入
+    __table_args__ = (
+        db.UniqueConstraint('player_id', 'recipe_id', name='uk_player_recipe'),
+    )
+
     def to_dict(self):
         """转换为字典"""
         return {
@@ -1,13 +1,24 @@
 """
 核心计算引擎
 包含：口碑分计算、客流分配算法、批量折扣计算
+金额在计算过程中统一用整数分（见 app.utils.money），只在写库和返回结果时转换
 """
 from typing import List, Dict, Tuple
 from app.core.database import db
-from app.models.game import CustomerFlow
+from app.models.game import Game
 from app.models.player import Player
 from app.models.product import PlayerProduct, RoundProduction
+from app.services.flow_provider import FlowProvider
 from app.utils.game_constants import GameConstants
+from app.utils.money import Cents, to_cents, from_cents, cents_to_float, scale_cents
+
+# 每档折扣的百分比（0.1 -> 10）
+DISCOUNT_PERCENT_PER_TIER = round(GameConstants.DISCOUNT_PER_TIER * 100)
+
+# 原材料基础单价（分）
+MATERIAL_BASE_CENTS = {
+    material: to_cents(price) for material, price in GameConstants.MATERIAL_BASE_PRICES.items()
+}
 
 
 class ReputationCalculator:
@@ -57,7 +68,7 @@ class CustomerFlowAllocator:
     """
 
     @staticmethod
-    def allocate(game_id: int, round_number: int) -> Dict:
+    def allocate(game_id: int, round_number: int, customer_flow=None) -> Dict:
         """
         执行客流分配 - 主函数
 
@@ -72,6 +83,7 @@ class CustomerFlowAllocator:
         Args:
             game_id: 游戏ID
             round_number: 回合数
+            customer_flow: 本回合客流量（RoundFlow / CustomerFlow），未传入时由 FlowProvider 计算
 
         Returns:
             {
@@ -82,13 +94,11 @@ class CustomerFlowAllocator:
             }
         """
         # 1. 获取客流量
-        customer_flow = CustomerFlow.query.filter_by(
-            game_id=game_id,
-            round_number=round_number
-        ).first()
-
-        if not customer_flow:
-            raise ValueError(f"未找到游戏 {game_id} 第 {round_number} 回合的客流量数据")
+        if customer_flow is None:
+            game = Game.query.get(game_id)
+            if not game:
+                raise ValueError(f"未找到游戏 {game_id}")
+            customer_flow = FlowProvider.get_flow(game, round_number)
 
         high_tier_total = customer_flow.high_tier_customers
         low_tier_total = customer_flow.low_tier_customers
@@ -131,12 +141,16 @@ class CustomerFlowAllocator:
             low_tier_remaining -= sold
 
         # 5. 保存销售结果
-        total_revenue = CustomerFlowAllocator._save_sales(products)
+        total_revenue_cents = CustomerFlowAllocator._save_sales(products)
+
+        # 输出边界：分 -> 元
+        for product in products:
+            product['price'] = cents_to_float(product.pop('price_cents'))
 
         return {
             "high_tier_served": high_tier_total - high_tier_remaining,
             "low_tier_served": low_tier_total - low_tier_remaining,
-            "total_revenue": total_revenue,
+            "total_revenue": cents_to_float(total_revenue_cents),
             "sales_details": products
         }
 
@@ -152,7 +166,7 @@ class CustomerFlowAllocator:
                     "player_id": int,
                     "product_name": str,
                     "reputation": float,
-                    "price": float,
+                    "price_cents": int,  # 售价（分）
                     "available": int,  # 可售数量
                     "sold_high": int,  # 卖给高购买力客户数量
                     "sold_low": int    # 卖给低购买力客户数量
@@ -191,7 +205,7 @@ class CustomerFlowAllocator:
                     "player_name": player.nickname,
                     "product_name": player_product.recipe.name,
                     "reputation": reputation,
-                    "price": float(prod.price),
+                    "price_cents": to_cents(prod.price),
                     "available": prod.produced_quantity,
                     "sold_high": 0,
                     "sold_low": 0
@@ -214,7 +228,7 @@ class CustomerFlowAllocator:
         """
         return sorted(
             products,
-            key=lambda p: (-p['reputation'], p['price'], p['production_id'])
+            key=lambda p: (-p['reputation'], p['price_cents'], p['production_id'])
         )
 
     @staticmethod
@@ -232,11 +246,11 @@ class CustomerFlowAllocator:
         """
         return sorted(
             products,
-            key=lambda p: (p['price'], -p['reputation'], p['production_id'])
+            key=lambda p: (p['price_cents'], -p['reputation'], p['production_id'])
         )
 
     @staticmethod
-    def _save_sales(products: List[Dict]) -> float:
+    def _save_sales(products: List[Dict]) -> Cents:
         """
         保存销售结果到数据库
 
@@ -244,9 +258,9 @@ class CustomerFlowAllocator:
             products: 产品销售数据列表
 
         Returns:
-            总营业额
+            总营业额（分）
         """
-        total_revenue = 0.0
+        total_revenue = 0
 
         for product in products:
             prod = RoundProduction.query.get(product['production_id'])
@@ -254,13 +268,13 @@ class CustomerFlowAllocator:
                 continue
 
             total_sold = product['sold_high'] + product['sold_low']
-            revenue = total_sold * product['price']
+            revenue = total_sold * product['price_cents']
 
             # 更新生产记录
             prod.sold_quantity = total_sold
             prod.sold_to_high_tier = product['sold_high']
             prod.sold_to_low_tier = product['sold_low']
-            prod.revenue = revenue
+            prod.revenue = from_cents(revenue)
 
             total_revenue += revenue
 
@@ -269,19 +283,19 @@ class CustomerFlowAllocator:
             if player_product:
                 player_product.total_sold += total_sold
 
-        # 提交数据库更改
-        db.session.commit()
+        # 只 flush：由结算流程在回合推进后统一提交
+        db.session.flush()
 
-        return total_revenue
+        return Cents(total_revenue)
 
 
 class DiscountCalculator:
     """批量折扣计算器"""
 
     @staticmethod
-    def calculate_discount_price(quantity: int, base_unit_price: float) -> float:
+    def discount_unit_cents(quantity: int, base_unit_cents: int) -> Cents:
         """
-        计算批量折扣后的单价
+        计算批量折扣后的单价（分）
 
         规则：
         - 每购买50份，价格-10%
@@ -295,22 +309,35 @@ class DiscountCalculator:
 
         Args:
             quantity: 购买数量
-            base_unit_price: 基础单价
+            base_unit_cents: 基础单价（分）
 
         Returns:
-            折后单价
+            折后单价（分，四舍五入）
         """
         if quantity <= 0:
-            return base_unit_price
+            return Cents(base_unit_cents)
 
         # 计算折扣档次
         discount_tier = min(quantity // GameConstants.DISCOUNT_TIER_SIZE,
                            GameConstants.MAX_DISCOUNT_TIERS)
 
-        # 计算折扣率
-        discount_rate = 1.0 - (discount_tier * GameConstants.DISCOUNT_PER_TIER)
+        return scale_cents(base_unit_cents, 100 - discount_tier * DISCOUNT_PERCENT_PER_TIER)
 
-        return base_unit_price * discount_rate
+    @staticmethod
+    def calculate_discount_price(quantity: int, base_unit_price: float) -> float:
+        """
+        计算批量折扣后的单价（元），规则见 discount_unit_cents
+
+        Args:
+            quantity: 购买数量
+            base_unit_price: 基础单价
+
+        Returns:
+            折后单价
+        """
+        return cents_to_float(
+            DiscountCalculator.discount_unit_cents(quantity, to_cents(base_unit_price))
+        )
 
     @staticmethod
     def calculate_total_cost(quantity: int, base_unit_price: float) -> float:
@@ -324,10 +351,8 @@ class DiscountCalculator:
         Returns:
             总成本
         """
-        discounted_price = DiscountCalculator.calculate_discount_price(
-            quantity, base_unit_price
-        )
-        return quantity * discounted_price
+        unit_cents = DiscountCalculator.discount_unit_cents(quantity, to_cents(base_unit_price))
+        return cents_to_float(quantity * unit_cents)
 
     @staticmethod
     def calculate_material_costs(material_needs: Dict[str, int]) -> Dict[str, float]:
@@ -346,36 +371,31 @@ class DiscountCalculator:
             }
         """
         costs = {}
-        total_cost = 0.0
+        total_cents = 0
 
         for material, quantity in material_needs.items():
             if quantity <= 0:
                 continue
 
-            base_price = GameConstants.MATERIAL_BASE_PRICES.get(material, 0)
-            if base_price <= 0:
+            base_cents = MATERIAL_BASE_CENTS.get(material, 0)
+            if base_cents <= 0:
                 continue
 
-            # 计算折后单价
-            unit_price = DiscountCalculator.calculate_discount_price(
-                quantity, base_price
-            )
-
-            # 计算总价
-            material_total = quantity * unit_price
+            # 计算折后单价和总价（分）
+            unit_cents = DiscountCalculator.discount_unit_cents(quantity, base_cents)
+            material_cents = quantity * unit_cents
 
             costs[material] = {
                 "quantity": quantity,
-                "unit_price": round(unit_price, 2),
-                "total": round(material_total, 2)
+                "unit_price": cents_to_float(unit_cents),
+                "total": cents_to_float(material_cents)
             }
 
-            total_cost += material_total
+            total_cents += material_cents
 
-        costs["total_cost"] = round(total_cost, 2)
+        costs["total_cost"] = cents_to_float(total_cents)
 
         return costs
 
-
 # 导出类
 __all__ = ['ReputationCalculator', 'CustomerFlowAllocator', 'DiscountCalculator']
@@ -2,15 +2,19 @@
 Employee service
 Handles employee hiring, firing, and management
 """
-from typing import Dict, List
-from app.core.database import db
-from app.models.player import Player, Employee
+from typing import Dict, List, Optional
+from sqlalchemy import func, update
+from app.core.database import db, retry_on_conflict
+from app.models.player import Player, Shop, Employee
+from app.services.event_service import EventService
+from app.services.ledger_service import LedgerService, HIRING
 
 
 class EmployeeService:
     """Employee management service"""
 
     @staticmethod
+    @retry_on_conflict
     def hire_employee(player_id: int, name: str, salary: float, productivity: int, round_number: int) -> Employee:
         """
         Hire a new employee
@@ -36,12 +40,7 @@ class EmployeeService:
             raise ValueError("Player must have a shop before hiring employees")
 
         # Check if shop has reached max employees
-        current_employees = Employee.query.filter_by(
-            shop_id=player.shop.id,
-            is_active=True
-        ).count()
-
-        if current_employees >= player.shop.max_employees:
+        if (player.shop.active_employee_count or 0) >= player.shop.max_employees:
             raise ValueError(
                 f"Shop has reached maximum employees ({player.shop.max_employees}). "
                 f"Upgrade decoration to hire more."
@@ -54,7 +53,7 @@ class EmployeeService:
         # Check cash and deduct upfront
         if player.cash < salary:
             raise ValueError(f"Insufficient cash to hire employee, need {salary}, have {float(player.cash)}")
-        player.cash -= salary
+        LedgerService.debit(player, salary, HIRING, round_number)
 
         # Validate productivity
         if productivity <= 0:
@@ -71,11 +70,22 @@ class EmployeeService:
         )
 
         db.session.add(employee)
+        EmployeeService._adjust_shop_totals(player.shop, productivity, salary, 1)
+        db.session.flush()  # Get employee.id
+
+        EventService.record(player, 'employee_hired', {
+            "employee_id": employee.id,
+            "name": name,
+            "salary": float(salary),
+            "productivity": productivity,
+            "cost": float(salary)
+        }, round_number=round_number)
         db.session.commit()
 
         return employee
 
     @staticmethod
+    @retry_on_conflict
     def fire_employee(employee_id: int) -> Dict:
         """
         Fire an employee
@@ -96,8 +106,21 @@ class EmployeeService:
         if not employee.is_active:
             raise ValueError(f"Employee {employee.name} is already inactive")
 
-        # Mark as inactive instead of deleting
-        employee.is_active = False
+        # Mark as inactive instead of deleting. The UPDATE is conditional so that of two
+        # concurrent fires only one deactivates the employee and adjusts the shop totals
+        employees = Employee.__table__
+        deactivated = db.session.execute(
+            update(employees)
+            .where(employees.c.id == employee_id, employees.c.is_active.is_(True))
+            .values(is_active=False)
+        ).rowcount
+        if deactivated != 1:
+            raise ValueError(f"Employee {employee.name} is already inactive")
+
+        # The row is locked by the UPDATE now; reload the salary it holds
+        db.session.refresh(employee, ['is_active', 'salary', 'productivity'])
+        EmployeeService._adjust_shop_totals(employee.shop, -employee.productivity, -employee.salary, -1)
+        EventService.record(employee.shop.player, 'employee_fired', {"employee_id": employee_id})
         db.session.commit()
 
         return {
@@ -179,12 +202,7 @@ class EmployeeService:
         if not player.shop:
             return 0
 
-        employees = Employee.query.filter_by(
-            shop_id=player.shop.id,
-            is_active=True
-        ).all()
-
-        return sum(emp.productivity for emp in employees)
+        return player.shop.total_productivity or 0
 
     @staticmethod
     def calculate_total_salary(player_id: int) -> float:
@@ -207,14 +225,10 @@ class EmployeeService:
         if not player.shop:
             return 0.0
 
-        employees = Employee.query.filter_by(
-            shop_id=player.shop.id,
-            is_active=True
-        ).all()
-
-        return sum(float(emp.salary) for emp in employees)
+        return float(player.shop.total_salary or 0)
 
     @staticmethod
+    @retry_on_conflict
     def update_employee_salary(employee_id: int, new_salary: float) -> Dict:
         """
         Update employee salary
@@ -234,7 +248,8 @@ class EmployeeService:
         Raises:
             ValueError: Various validation errors
         """
-        employee = Employee.query.get(employee_id)
+        # Lock the row so the salary delta is taken from the salary this update replaces
+        employee = Employee.query.filter_by(id=employee_id).with_for_update().populate_existing().first()
         if not employee:
             raise ValueError(f"Employee {employee_id} not found")
 
@@ -245,7 +260,13 @@ class EmployeeService:
             raise ValueError("Salary must be positive")
 
         previous_salary = float(employee.salary)
+        EmployeeService._adjust_shop_totals(employee.shop, 0, round(new_salary - previous_salary, 2), 0)
         employee.salary = new_salary
+        EventService.record(employee.shop.player, 'employee_salary_changed', {
+            "employee_id": employee_id,
+            "previous_salary": previous_salary,
+            "salary": float(new_salary)
+        })
         db.session.commit()
 
         return {
@@ -256,6 +277,94 @@ class EmployeeService:
             "new_salary": float(new_salary)
         }
 
+    @staticmethod
+    def _adjust_shop_totals(shop: Shop, productivity, salary, count: int):
+        """
+        Apply a delta to the shop's active-employee aggregates
+
+        Written as column expressions so the increment happens in the UPDATE
+        itself and commits together with the employee change.
+        """
+        shop.total_productivity = Shop.total_productivity + productivity
+        shop.total_salary = Shop.total_salary + salary
+        shop.active_employee_count = Shop.active_employee_count + count
+
+    @staticmethod
+    def _aggregate_query(shop_id: Optional[int] = None):
+        """Shops joined with aggregates recomputed from their active employees"""
+        totals = db.session.query(
+            Employee.shop_id.label('shop_id'),
+            func.coalesce(func.sum(Employee.productivity), 0).label('productivity'),
+            func.coalesce(func.sum(Employee.salary), 0).label('salary'),
+            func.count(Employee.id).label('count')
+        ).filter(Employee.is_active.is_(True)).group_by(Employee.shop_id).subquery()
+
+        query = db.session.query(
+            Shop,
+            func.coalesce(totals.c.productivity, 0),
+            func.coalesce(totals.c.salary, 0),
+            func.coalesce(totals.c.count, 0)
+        ).outerjoin(totals, totals.c.shop_id == Shop.id)
+
+        if shop_id is not None:
+            query = query.filter(Shop.id == shop_id)
+        return query
+
+    @staticmethod
+    def check_shop_aggregates(shop_id: Optional[int] = None) -> List[Dict]:
+        """
+        Compare the stored shop aggregates with the employees table
+
+        Args:
+            shop_id: Check a single shop (default: all shops)
+
+        Returns:
+            [{"shop_id": 1, "differences": {"total_salary": {"stored": 0.0, "actual": 1200.0}}}]
+            (empty when every shop is consistent)
+        """
+        mismatches = []
+
+        for shop, productivity, salary, count in EmployeeService._aggregate_query(shop_id).all():
+            actual = {
+                "total_productivity": int(productivity),
+                "total_salary": round(float(salary), 2),
+                "active_employee_count": int(count)
+            }
+            stored = {
+                "total_productivity": shop.total_productivity or 0,
+                "total_salary": round(float(shop.total_salary or 0), 2),
+                "active_employee_count": shop.active_employee_count or 0
+            }
+            differences = {
+                field: {"stored": stored[field], "actual": actual[field]}
+                for field in actual if stored[field] != actual[field]
+            }
+            if differences:
+                mismatches.append({"shop_id": shop.id, "differences": differences})
+
+        return mismatches
+
+    @staticmethod
+    def repair_shop_aggregates(shop_id: Optional[int] = None) -> List[Dict]:
+        """
+        Recompute drifted shop aggregates from the employees table
+
+        Args:
+            shop_id: Repair a single shop (default: all shops)
+
+        Returns:
+            The mismatches that were repaired, as returned by check_shop_aggregates
+        """
+        mismatches = EmployeeService.check_shop_aggregates(shop_id)
+
+        for mismatch in mismatches:
+            shop = Shop.query.get(mismatch["shop_id"])
+            for field, values in mismatch["differences"].items():
+                setattr(shop, field, values["actual"])
+
+        db.session.commit()
+        return mismatches
+
 
 # Export
 __all__ = ['EmployeeService']
@@ -0,0 +1,321 @@
+"""
+Event service
+Appends game events and rebuilds player state by folding them
+"""
+import copy
+from typing import Dict, List, Optional
+from flask import current_app
+from app.core.database import db
+from app.models.event import GameEvent, PlayerSnapshot
+from app.models.player import Player
+from app.utils.game_constants import GameConstants
+
+# Game-level event holding the advance_round result of a settled round
+SETTLEMENT_EVENT = 'round_settlement'
+
+
+class EventService:
+    """Append-only event log and replay engine"""
+
+    @staticmethod
+    def record(player: Player, event_type: str, payload: Dict = None, round_number: int = None) -> GameEvent:
+        """
+        Append an event for a player
+
+        The event is added to the current session and committed together
+        with the state change it describes.
+
+        Args:
+            player: Player the event belongs to
+            event_type: One of the types handled by _apply
+            payload: Event data (JSON-serializable)
+            round_number: Round in which the event happened (defaults to the game's current round)
+
+        Returns:
+            GameEvent object
+        """
+        if round_number is None:
+            round_number = player.game.current_round if player.game else 0
+
+        event = GameEvent(
+            game_id=player.game_id,
+            player_id=player.id,
+            round_number=round_number,
+            event_type=event_type,
+            payload=payload or {}
+        )
+        db.session.add(event)
+        return event
+
+    @staticmethod
+    def settlement_version(game) -> int:
+        """
+        Id of the game's latest round_settlement event (0 before the first settlement)
+
+        The event commits in the same transaction as the round's finance
+        records, so data tagged with it is never from a half-settled round.
+
+        Args:
+            game: Game object
+        """
+        event_id = db.session.query(db.func.max(GameEvent.id)).filter(
+            GameEvent.game_id == game.id,
+            GameEvent.round_number == game.current_round - 1,
+            GameEvent.player_id.is_(None),
+            GameEvent.event_type == SETTLEMENT_EVENT
+        ).scalar()
+        return event_id or 0
+
+    @staticmethod
+    def get_events(player_id: int, round_number: int = None) -> List[Dict]:
+        """
+        Get a player's events in append order
+
+        Args:
+            player_id: Player ID
+            round_number: Only events up to and including this round
+
+        Returns:
+            List of event dictionaries
+        """
+        query = GameEvent.query.filter_by(player_id=player_id)
+        if round_number is not None:
+            query = query.filter(GameEvent.round_number <= round_number)
+
+        return [event.to_dict() for event in query.order_by(GameEvent.id.asc()).all()]
+
+    @staticmethod
+    def replay(player_id: int, round_number: int = None) -> Dict:
+        """
+        Rebuild a player's state at the end of a round
+
+        Starts from the latest snapshot at or before the round and folds the
+        events of later rounds on top of it, in (round_number, id) order.
+
+        Args:
+            player_id: Player ID
+            round_number: Target round (None means all events)
+
+        Returns:
+            {
+                "player_id": 1,
+                "round_number": 3,
+                "cash": 8200.0,
+                "total_profit": -1800.0,
+                "shop": {"location": "...", "rent": 500.0, "decoration_level": 1, "max_employees": 2},
+                "employees": {"5": {"name": "...", "salary": 1000.0, "productivity": 5, "is_active": true}},
+                "products": {"1": {"is_unlocked": true, "total_sold": 40, "current_price": 15.0}},
+                "last_event_id": 42
+            }
+
+        Raises:
+            ValueError: If player not found
+        """
+        player = Player.query.get(player_id)
+        if not player:
+            raise ValueError(f"Player {player_id} not found")
+
+        snapshot_query = PlayerSnapshot.query.filter_by(player_id=player_id)
+        if round_number is not None:
+            snapshot_query = snapshot_query.filter(PlayerSnapshot.round_number <= round_number)
+        snapshot = snapshot_query.order_by(PlayerSnapshot.round_number.desc()).first()
+
+        events = GameEvent.query.filter(GameEvent.player_id == player_id)
+        if snapshot:
+            state = copy.deepcopy(snapshot.state)
+            # Ids are assigned at insert, not commit: an action of the next round can get a
+            # smaller id than the settlement events folded into the snapshot, so later rounds
+            # are selected by round number rather than by id
+            events = events.filter(db.or_(
+                GameEvent.round_number > snapshot.round_number,
+                GameEvent.id > snapshot.last_event_id
+            ))
+        else:
+            state = EventService._initial_state(player_id)
+
+        if round_number is not None:
+            events = events.filter(GameEvent.round_number <= round_number)
+
+        for event in events.order_by(GameEvent.round_number.asc(), GameEvent.id.asc()).all():
+            EventService._apply(state, event.event_type, event.payload or {})
+            state["last_event_id"] = max(state["last_event_id"], event.id)
+
+        state["round_number"] = round_number
+        return state
+
+    @staticmethod
+    def take_snapshot(player_id: int, round_number: int) -> Optional[PlayerSnapshot]:
+        """
+        Persist the folded state at the end of a round
+
+        Args:
+            player_id: Player ID
+            round_number: Settled round
+
+        Returns:
+            PlayerSnapshot object, or None if the player has no events yet
+        """
+        existing = PlayerSnapshot.query.filter_by(
+            player_id=player_id,
+            round_number=round_number
+        ).first()
+        if existing:
+            return existing
+
+        state = EventService.replay(player_id, round_number)
+        if not state["last_event_id"]:
+            return None
+
+        snapshot = PlayerSnapshot(
+            player_id=player_id,
+            round_number=round_number,
+            last_event_id=state["last_event_id"],
+            state=state
+        )
+        db.session.add(snapshot)
+        return snapshot
+
+    @staticmethod
+    def snapshot_game_if_due(game_id: int, round_number: int):
+        """
+        Snapshot every active player of a game after periodic rounds
+
+        Args:
+            game_id: Game ID
+            round_number: Round just settled
+        """
+        # Snapshot every N settled rounds so replay never folds more than N rounds of events
+        interval = current_app.config.get('EVENT_SNAPSHOT_INTERVAL', 3)
+        if interval <= 0 or round_number % interval != 0:
+            return
+
+        players = Player.query.filter_by(game_id=game_id, is_active=True).all()
+        for player in players:
+            EventService.take_snapshot(player.id, round_number)
+
+        db.session.commit()
+
+    @staticmethod
+    def verify_player(player_id: int) -> Dict:
+        """
+        Compare the replayed state with the live rows
+
+        Returns:
+            {"player_id": 1, "consistent": True, "differences": {...}}
+        """
+        player = Player.query.get(player_id)
+        if not player:
+            raise ValueError(f"Player {player_id} not found")
+
+        state = EventService.replay(player_id)
+        differences = {}
+
+        if round(state["cash"], 2) != round(float(player.cash), 2):
+            differences["cash"] = {"replayed": state["cash"], "live": float(player.cash)}
+
+        for product in player.products:
+            replayed = state["products"].get(str(product.recipe_id), {})
+            if replayed.get("total_sold", 0) != (product.total_sold or 0):
+                differences[f"products.{product.recipe_id}.total_sold"] = {
+                    "replayed": replayed.get("total_sold", 0),
+                    "live": product.total_sold or 0
+                }
+
+        return {
+            "player_id": player_id,
+            "consistent": not differences,
+            "differences": differences
+        }
+
+    @staticmethod
+    def _initial_state(player_id: int) -> Dict:
+        return {
+            "player_id": player_id,
+            "round_number": None,
+            "cash": 0.0,
+            "total_profit": 0.0,
+            "shop": None,
+            "employees": {},
+            "products": {},
+            "last_event_id": 0
+        }
+
+    @staticmethod
+    def _apply(state: Dict, event_type: str, payload: Dict):
+        """Fold a single event into the state"""
+        if event_type == 'player_joined':
+            state["cash"] = payload.get("cash", GameConstants.INITIAL_CASH)
+
+        elif event_type == 'shop_opened':
+            state["shop"] = {
+                "location": payload["location"],
+                "rent": payload["rent"],
+                "decoration_level": 0,
+                "max_employees": 0
+            }
+
+        elif event_type == 'shop_closed':
+            state["shop"] = None
+            state["employees"] = {}
+
+        elif event_type == 'decoration_upgraded':
+            state["cash"] -= payload["cost"]
+            if state["shop"] is not None:
+                state["shop"]["decoration_level"] = payload["level"]
+                state["shop"]["max_employees"] = payload["max_employees"]
+
+        elif event_type == 'employee_hired':
+            state["cash"] -= payload["cost"]
+            state["employees"][str(payload["employee_id"])] = {
+                "name": payload["name"],
+                "salary": payload["salary"],
+                "productivity": payload["productivity"],
+                "is_active": True
+            }
+
+        elif event_type == 'employee_fired':
+            employee = state["employees"].get(str(payload["employee_id"]))
+            if employee:
+                employee["is_active"] = False
+
+        elif event_type == 'employee_salary_changed':
+            employee = state["employees"].get(str(payload["employee_id"]))
+            if employee:
+                employee["salary"] = payload["salary"]
+
+        elif event_type in ('research_rolled', 'product_unlocked'):
+            state["cash"] -= payload.get("cost", 0)
+            if payload.get("success", True):
+                product = state["products"].setdefault(
+                    str(payload["recipe_id"]),
+                    {"is_unlocked": False, "total_sold": 0, "current_price": None}
+                )
+                product["is_unlocked"] = True
+
+        elif event_type in ('ad_placed', 'market_researched'):
+            state["cash"] -= payload["cost"]
+
+        elif event_type == 'plan_submitted':
+            state["cash"] -= payload["material_cost"]
+            for production in payload.get("productions", []):
+                product = state["products"].setdefault(
+                    str(production["recipe_id"]),
+                    {"is_unlocked": True, "total_sold": 0, "current_price": None}
+                )
+                product["current_price"] = production["price"]
+
+        elif event_type == 'round_settled':
+            state["cash"] += payload["revenue"]
+            for sale in payload.get("sales", []):
+                product = state["products"].setdefault(
+                    str(sale["recipe_id"]),
+                    {"is_unlocked": True, "total_sold": 0, "current_price": None}
+                )
+                product["total_sold"] += sale["sold"]
+
+        elif event_type == 'finance_recorded':
+            state["total_profit"] = payload["cumulative_profit"]
+
+
+# Export
+__all__ = ['EventService', 'SETTLEMENT_EVENT']
@@ -3,11 +3,20 @@ Finance service
 Handles finance record generation, profit calculation, and financial reports
 """
 from typing import Dict, List
-from app.core.database import db
+from flask import current_app
+from app.core.database import db, in_atomic
 from app.models.player import Player
 from app.models.product import RoundProduction
 from app.models.finance import FinanceRecord
+from app.services.event_service import EventService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.ledger_service import LedgerService, REVENUE
 from app.services.round_service import RoundService
+from app.utils.cache import LocalCache
+
+# Finance series per game, keyed by (game_id, settlement version): the version is the id of the
+# round_settlement event committed with the finance records, so a settlement moves every process to a new key
+_series_cache = LocalCache('finance_series', maxsize=256)
 
 
 class FinanceService:
@@ -49,14 +58,18 @@ class FinanceService:
         if existing:
             return existing
 
-        # 1. Calculate revenue
+        # Round cash flows per category, shared by revenue and expenses
+        totals = LedgerService.round_totals(player_id, round_number)
+
+        # 1. Calculate revenue (total as credited to cash)
         revenue_data = FinanceService._calculate_revenue(player_id, round_number)
+        revenue_data["total"] = totals.get(REVENUE, 0.0)
 
         # 2. Calculate expenses
-        expenses = RoundService.calculate_round_expenses(player_id, round_number)
+        expenses = RoundService.calculate_round_expenses(player_id, round_number, totals)
 
         # 3. Calculate profit
-        round_profit = revenue_data["total"] - expenses["total"]
+        round_profit = round(revenue_data["total"] - expenses["total"], 2)
 
         # 4. Get previous cumulative profit
         previous_record = FinanceRecord.query.filter_by(
@@ -93,8 +106,21 @@ class FinanceService:
         # 6. Update player's total_profit
         player.total_profit = cumulative_profit
 
+        EventService.record(player, 'finance_recorded', {
+            "revenue": revenue_data["total"],
+            "expense": expenses["total"],
+            "round_profit": round_profit,
+            "cumulative_profit": cumulative_profit
+        }, round_number=round_number)
+
         db.session.commit()
 
+        # Inside a settlement the commit above is deferred; settle_round
+        # refreshes the leaderboard and series once the settlement has committed
+        if not in_atomic():
+            LeaderboardService.record_player(player, cumulative_profit)
+            FinanceService.invalidate_series(player.game_id)
+
         return finance_record
 
     @staticmethod
@@ -144,6 +170,8 @@ class FinanceService:
         """
         Get profit summary for all players in a game
 
+        Ranked from the leaderboard (profit as of the last settlement); cash is live.
+
         Args:
             game_id: Game ID
 
@@ -167,28 +195,42 @@ class FinanceService:
         if not game:
             raise ValueError(f"Game {game_id} not found")
 
-        players = Player.query.filter_by(game_id=game_id, is_active=True).all()
+        return {
+            "game_id": game_id,
+            "current_round": game.current_round,
+            "players": LeaderboardService.get_game_leaderboard(game)
+        }
 
-        player_data = []
-        for player in players:
-            player_data.append({
-                "player_id": player.id,
-                "nickname": player.nickname,
-                "total_profit": float(player.total_profit),
-                "cash": float(player.cash)
-            })
+    @staticmethod
+    def get_global_leaderboard(limit: int = 50) -> Dict:
+        """
+        Get the best players across all finished games
 
-        # Sort by total profit descending
-        player_data.sort(key=lambda x: x["total_profit"], reverse=True)
+        Args:
+            limit: Number of entries to return
 
-        # Add rank
-        for idx, data in enumerate(player_data):
-            data["rank"] = idx + 1
+        Returns:
+            {
+                "players": [
+                    {
+                        "game_id": 1,
+                        "game_name": "Room 1",
+                        "player_id": 1,
+                        "nickname": "Player 1",
+                        "total_profit": 5000.0,
+                        "cash": 12000.0,
+                        "finished_at": "2024-01-01T12:00:00",
+                        "rank": 1
+                    },
+                    ...
+                ]
+            }
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
 
         return {
-            "game_id": game_id,
-            "current_round": game.current_round,
-            "players": player_data
+            "players": LeaderboardService.get_global_leaderboard(limit)
         }
 
     @staticmethod
@@ -244,6 +286,165 @@ class FinanceService:
             "rounds": rounds_data
         }
 
+    @staticmethod
+    def get_game_report(game_id: int) -> Dict:
+        """
+        Build the end-of-game report: final standings plus every player's detailed report
+
+        Args:
+            game_id: Game ID
+
+        Returns:
+            {
+                "game_id": 1,
+                "status": "finished",
+                "rounds_played": 10,
+                "standings": [...],    # same shape as get_profit_summary players
+                "players": [...]       # get_detailed_report per player
+            }
+        """
+        from app.models.game import Game
+
+        game = Game.query.get(game_id)
+        if not game:
+            raise ValueError(f"Game {game_id} not found")
+
+        players = Player.query.filter_by(game_id=game_id).order_by(Player.id.asc()).all()
+
+        return {
+            "game_id": game_id,
+            "status": game.status,
+            "rounds_played": game.current_round - 1,
+            "standings": LeaderboardService.get_game_leaderboard(game),
+            "players": [FinanceService.get_detailed_report(player.id) for player in players]
+        }
+
+    @staticmethod
+    def get_player_series(player_id: int) -> Dict:
+        """
+        Get a player's finance history as parallel arrays for charting
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            {
+                "player_id": 1,
+                "nickname": "Player 1",
+                "rounds": [1, 2, 3],
+                "revenue": [450.0, 600.0, 300.0],
+                "expense": [300.0, 350.0, 320.0],
+                "profit": [150.0, 250.0, -20.0],
+                "cumulative": [150.0, 400.0, 380.0]
+            }
+
+        Raises:
+            ValueError: If player not found
+        """
+        player = Player.query.get(player_id)
+        if not player:
+            raise ValueError(f"Player {player_id} not found")
+
+        series = FinanceService._get_game_series(player.game)
+        for player_series in series:
+            if player_series["player_id"] == player_id:
+                return player_series
+
+        return FinanceService._empty_series(player.id, player.nickname)
+
+    @staticmethod
+    def get_game_series(game_id: int) -> Dict:
+        """
+        Get finance history of all players in a game as parallel arrays
+
+        Args:
+            game_id: Game ID
+
+        Returns:
+            {
+                "game_id": 1,
+                "current_round": 4,
+                "players": [{"player_id": 1, "nickname": "...", "rounds": [...], "revenue": [...], ...}, ...]
+            }
+
+        Raises:
+            ValueError: If game not found
+        """
+        from app.models.game import Game
+
+        game = Game.query.get(game_id)
+        if not game:
+            raise ValueError(f"Game {game_id} not found")
+
+        return {
+            "game_id": game_id,
+            "current_round": game.current_round,
+            "players": FinanceService._get_game_series(game)
+        }
+
+    @staticmethod
+    def invalidate_series(game_id: int):
+        """Drop cached finance series of a game"""
+        _series_cache.invalidate(lambda key: key[0] == game_id)
+
+    @staticmethod
+    def _get_game_series(game) -> List[Dict]:
+        return _series_cache.get_or_load(
+            (game.id, EventService.settlement_version(game)),
+            lambda: FinanceService._load_game_series(game.id),
+            ttl_seconds=current_app.config.get('FINANCE_SERIES_CACHE_TTL', 300)
+        )
+
+    @staticmethod
+    def _load_game_series(game_id: int) -> List[Dict]:
+        """Build the series of every player in a game from one query over scalar columns"""
+        rows = db.session.query(
+            Player.id,
+            Player.nickname,
+            FinanceRecord.round_number,
+            FinanceRecord.total_revenue,
+            FinanceRecord.total_expense,
+            FinanceRecord.round_profit,
+            FinanceRecord.cumulative_profit
+        ).outerjoin(
+            FinanceRecord, FinanceRecord.player_id == Player.id
+        ).filter(
+            Player.game_id == game_id
+        ).order_by(
+            Player.id.asc(),
+            FinanceRecord.round_number.asc()
+        ).all()
+
+        series = []
+        current = None
+        for player_id, nickname, round_number, revenue, expense, profit, cumulative in rows:
+            if current is None or current["player_id"] != player_id:
+                current = FinanceService._empty_series(player_id, nickname)
+                series.append(current)
+
+            if round_number is None:
+                continue
+
+            current["rounds"].append(round_number)
+            current["revenue"].append(float(revenue or 0))
+            current["expense"].append(float(expense or 0))
+            current["profit"].append(float(profit or 0))
+            current["cumulative"].append(float(cumulative or 0))
+
+        return series
+
+    @staticmethod
+    def _empty_series(player_id: int, nickname: str) -> Dict:
+        return {
+            "player_id": player_id,
+            "nickname": nickname,
+            "rounds": [],
+            "revenue": [],
+            "expense": [],
+            "profit": [],
+            "cumulative": []
+        }
+
     @staticmethod
     def _calculate_revenue(player_id: int, round_number: int) -> Dict:
         """
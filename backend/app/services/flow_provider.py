@@ -0,0 +1,197 @@
+"""
+Customer flow provider
+Computes a round's customer flow from the game's scenario definition
+(Game.settings["customer_flow"]) in memory. customer_flows rows are only
+read or written for scenarios that ask to be persisted and for games
+started before scenarios existed.
+"""
+import random
+from typing import Dict, Optional
+from flask import current_app
+from app.core.database import db
+from app.models.game import Game, CustomerFlow
+from app.services.flow_scenarios import FLOW_GENERATORS, FLOW_SCRIPTS, flow_table, script_rounds
+from app.utils.game_constants import GameConstants
+
+DEFAULT_SCENARIO = {"script": 'default'}
+
+
+class RoundFlow:
+    """Customer flow of one round; same read interface as a CustomerFlow row"""
+
+    __slots__ = ('game_id', 'round_number', 'high_tier_customers', 'low_tier_customers')
+
+    def __init__(self, game_id: int, round_number: int, high_tier_customers: int, low_tier_customers: int):
+        self.game_id = game_id
+        self.round_number = round_number
+        self.high_tier_customers = high_tier_customers
+        self.low_tier_customers = low_tier_customers
+
+    def to_dict(self):
+        """Convert to dictionary (id is None: computed flows have no customer_flows row)"""
+        return {
+            "id": None,
+            "game_id": self.game_id,
+            "round_number": self.round_number,
+            "high_tier_customers": self.high_tier_customers,
+            "low_tier_customers": self.low_tier_customers
+        }
+
+
+class FlowProvider:
+    """Customer flow provider"""
+
+    @staticmethod
+    def build_scenario(options: Optional[Dict] = None) -> Dict:
+        """
+        Validate and normalize a scenario definition
+
+        Args:
+            options: {
+                "script": "default",                          // Named flow script, or
+                "generator": "seasonal",                      // Seeded generator: seasonal, shock, trend
+                "rounds": 15,                                 // Generator length (default and max: MAX_ROUNDS)
+                "seed": 42,                                   // Generator / variance seed (random if omitted for generators)
+                "variance": 0.1,                              // Max relative deviation from the script (0-0.5)
+                "overrides": {"3": {"high": 100, "low": 300}}, // Per-round replacements
+                "persist": false                              // Store generated flows in customer_flows
+            }
+
+        Returns:
+            Scenario dict stored in Game.settings["customer_flow"]
+
+        Raises:
+            ValueError: If the definition is invalid
+        """
+        options = options or {}
+        scenario = dict(DEFAULT_SCENARIO)
+
+        generator = options.get('generator')
+        if generator:
+            if 'script' in options:
+                raise ValueError("Specify either script or generator, not both")
+            if generator not in FLOW_GENERATORS:
+                raise ValueError(f"Unknown customer flow generator: {generator}")
+
+            max_rounds = current_app.config.get('MAX_ROUNDS', GameConstants.TOTAL_ROUNDS)
+            rounds = options.get('rounds', max_rounds)
+            if not isinstance(rounds, int) or not 1 <= rounds <= max_rounds:
+                raise ValueError(f"rounds must be between 1 and {max_rounds}")
+
+            seed = options.get('seed')
+            if seed is None:
+                seed = random.randrange(2 ** 31)
+            elif not isinstance(seed, int):
+                raise ValueError("seed must be an integer")
+
+            scenario = {"generator": generator, "seed": seed, "rounds": rounds}
+        else:
+            script = options.get('script', scenario['script'])
+            if script not in FLOW_SCRIPTS:
+                raise ValueError(f"Unknown customer flow script: {script}")
+            scenario['script'] = script
+
+        variance = options.get('variance')
+        if variance:
+            if not isinstance(variance, (int, float)) or not 0 < variance <= 0.5:
+                raise ValueError("variance must be a number between 0 and 0.5")
+            seed = scenario.get('seed', options.get('seed'))
+            if not isinstance(seed, int):
+                raise ValueError("seed is required when variance is set")
+            scenario['variance'] = float(variance)
+            scenario['seed'] = seed
+
+        overrides = {}
+        for round_number, flow in (options.get('overrides') or {}).items():
+            high, low = (flow or {}).get('high'), (flow or {}).get('low')
+            if not isinstance(high, int) or not isinstance(low, int) or high < 0 or low < 0:
+                raise ValueError(f"Invalid customer flow override for round {round_number}")
+            overrides[str(int(round_number))] = {"high": high, "low": low}
+        if overrides:
+            scenario['overrides'] = overrides
+
+        if options.get('persist'):
+            scenario['persist'] = True
+
+        return scenario
+
+    @staticmethod
+    def get_scenario(game: Game) -> Optional[Dict]:
+        """Scenario of a game, or None for games started before scenarios existed"""
+        return (game.settings or {}).get('customer_flow')
+
+    @staticmethod
+    def total_rounds(game: Game) -> int:
+        """Number of rounds a game lasts under its scenario"""
+        scenario = FlowProvider.get_scenario(game)
+        if scenario is None:
+            return GameConstants.TOTAL_ROUNDS
+        if scenario.get('generator'):
+            return scenario['rounds']
+        return script_rounds(scenario.get('script', 'default'))
+
+    @staticmethod
+    def get_flow(game: Game, round_number: int):
+        """
+        Get the customer flow of a round
+
+        Args:
+            game: Game
+            round_number: Round number
+
+        Returns:
+            RoundFlow, or the CustomerFlow row for persisted scenarios
+
+        Raises:
+            ValueError: If the scenario has no flow for the round
+        """
+        scenario = FlowProvider.get_scenario(game)
+
+        if scenario is None or scenario.get('persist'):
+            existing = CustomerFlow.query.filter_by(
+                game_id=game.id,
+                round_number=round_number
+            ).first()
+            if existing:
+                return existing
+
+        flow = FlowProvider.compute_flow(game.id, scenario or DEFAULT_SCENARIO, round_number)
+
+        if scenario and scenario.get('persist'):
+            customer_flow = CustomerFlow(
+                game_id=flow.game_id,
+                round_number=flow.round_number,
+                high_tier_customers=flow.high_tier_customers,
+                low_tier_customers=flow.low_tier_customers
+            )
+            db.session.add(customer_flow)
+            db.session.flush()
+            return customer_flow
+
+        return flow
+
+    @staticmethod
+    def compute_flow(game_id: int, scenario: Dict, round_number: int) -> RoundFlow:
+        """Compute a round's flow from a scenario without touching the database"""
+        override = scenario.get('overrides', {}).get(str(round_number))
+        if override:
+            return RoundFlow(game_id, round_number, override['high'], override['low'])
+
+        # Precomputed once per (name, seed, rounds, variance) and shared by all games using it
+        table = flow_table(
+            scenario.get('generator') or scenario.get('script', 'default'),
+            scenario.get('seed', 0),
+            scenario.get('rounds', 0),
+            scenario.get('variance', 0.0)
+        )
+
+        total = len(table) // 2
+        if not 1 <= round_number <= total:
+            raise ValueError(f"Invalid round number: {round_number}. Must be 1-{total}.")
+
+        index = 2 * (round_number - 1)
+        return RoundFlow(game_id, round_number, table[index], table[index + 1])
+
+
+# Export
+__all__ = ['FlowProvider', 'RoundFlow']
@@ -0,0 +1,123 @@
+"""
+Customer flow scenarios
+Named flow scripts and seeded procedural generators. A scenario is
+precomputed once into a flat array (high, low, high, low, ...) cached per
+(name, seed, rounds, variance) and shared by every game that uses it, so
+reading a round's flow is an index lookup.
+"""
+import math
+import random
+from array import array
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+from app.utils.game_constants import GameConstants
+
+# Named flow scripts: round number -> {"high": ..., "low": ...}
+FLOW_SCRIPTS = {
+    'default': GameConstants.CUSTOMER_FLOW_SCRIPT
+}
+
+# Average flow of the default script, used as the generators' baseline
+BASE_HIGH = 96
+BASE_LOW = 329
+
+
+def _seasonal(rng: random.Random, rounds: int) -> List[Tuple[float, float]]:
+    """Sinusoidal demand cycle with a random period and phase"""
+    period = rng.choice([4, 5, 6])
+    phase = rng.uniform(0, 2 * math.pi)
+    amplitude = rng.uniform(0.3, 0.5)
+
+    flows = []
+    for index in range(rounds):
+        season = 1 + amplitude * math.sin(2 * math.pi * index / period + phase)
+        flows.append((
+            BASE_HIGH * season * rng.uniform(0.95, 1.05),
+            BASE_LOW * season * rng.uniform(0.95, 1.05)
+        ))
+    return flows
+
+
+def _shock(rng: random.Random, rounds: int) -> List[Tuple[float, float]]:
+    """Steady demand interrupted by short booms and slumps"""
+    flows = []
+    remaining, multiplier = 0, 1.0
+    for _ in range(rounds):
+        if remaining == 0 and rng.random() < 0.2:
+            remaining = rng.choice([1, 2])
+            multiplier = rng.uniform(1.6, 2.0) if rng.random() < 0.5 else rng.uniform(0.4, 0.6)
+
+        factor = multiplier if remaining else 1.0
+        remaining = max(0, remaining - 1)
+        flows.append((
+            BASE_HIGH * factor * rng.uniform(0.9, 1.1),
+            BASE_LOW * factor * rng.uniform(0.9, 1.1)
+        ))
+    return flows
+
+
+def _trend(rng: random.Random, rounds: int) -> List[Tuple[float, float]]:
+    """Compounding market growth (or decline) with a drifting high-tier share"""
+    growth = rng.uniform(-0.03, 0.08)
+    share_drift = rng.uniform(-0.02, 0.03)
+    start = rng.uniform(0.7, 1.0)
+    high_share = BASE_HIGH / (BASE_HIGH + BASE_LOW)
+
+    flows = []
+    for index in range(rounds):
+        total = (BASE_HIGH + BASE_LOW) * start * (1 + growth) ** index * rng.uniform(0.92, 1.08)
+        share = min(0.6, max(0.05, high_share + share_drift * index))
+        flows.append((total * share, total * (1 - share)))
+    return flows
+
+
+# Named generators: (rng, rounds) -> [(high, low), ...]
+FLOW_GENERATORS: Dict[str, Callable[[random.Random, int], List[Tuple[float, float]]]] = {
+    'seasonal': _seasonal,
+    'shock': _shock,
+    'trend': _trend
+}
+
+
+def script_rounds(name: str) -> int:
+    """Number of rounds defined by a flow script"""
+    return len(FLOW_SCRIPTS[name])
+
+
+@lru_cache(maxsize=256)
+def flow_table(name: str, seed: int = 0, rounds: int = 0, variance: float = 0.0) -> array:
+    """
+    Precompute a scenario's flows
+
+    Args:
+        name: Flow script or generator name
+        seed: Generator seed (also seeds the variance)
+        rounds: Rounds to generate (generators only; scripts define their own length)
+        variance: Max relative per-round deviation applied on top of the flows
+
+    Returns:
+        array('I') [high_1, low_1, high_2, low_2, ...]; shared, do not modify
+    """
+    if name in FLOW_SCRIPTS:
+        script = FLOW_SCRIPTS[name]
+        flows = [(script[number]["high"], script[number]["low"]) for number in sorted(script)]
+    else:
+        flows = FLOW_GENERATORS[name](random.Random(f"{name}:{seed}"), rounds)
+
+    if variance:
+        varied = []
+        for number, (high, low) in enumerate(flows, start=1):
+            rng = random.Random(f"{seed}:{number}")
+            high = high * (1 + rng.uniform(-variance, variance))
+            low = low * (1 + rng.uniform(-variance, variance))
+            varied.append((high, low))
+        flows = varied
+
+    table = array('I')
+    for high, low in flows:
+        table.append(max(0, round(high)))
+        table.append(max(0, round(low)))
+    return table
+
+
+__all__ = ['FLOW_SCRIPTS', 'FLOW_GENERATORS', 'flow_table', 'script_rounds']
@@ -0,0 +1,127 @@
+"""
+游戏状态推送（ASGI 模式）
+每个有订阅者的游戏只运行一个异步轮询任务，状态变化时广播给所有订阅者；
+订阅者只是一个 asyncio 队列，单个进程可以挂住大量空闲连接。
+"""
+import asyncio
+import contextlib
+import logging
+from typing import Dict, Optional
+from sqlalchemy import distinct, func, select, true
+from app.core.async_db import AsyncDatabase
+from app.models.game import Game
+from app.models.player import Player
+from app.models.product import RoundProduction
+
+logger = logging.getLogger(__name__)
+
+# 轮询任务尚未读到任何状态
+_UNSET = object()
+
+
+def game_state_query(game_id: int):
+    """一次往返取出游戏状态、当前回合和提交进度"""
+    games = Game.__table__
+    players = Player.__table__
+    productions = RoundProduction.__table__
+
+    total = select(func.count()).select_from(players).where(
+        players.c.game_id == games.c.id,
+        players.c.is_active == true()
+    ).scalar_subquery()
+
+    submitted = select(func.count(distinct(productions.c.player_id))).select_from(
+        productions.join(players, players.c.id == productions.c.player_id)
+    ).where(
+        players.c.game_id == games.c.id,
+        players.c.is_active == true(),
+        productions.c.round_number == games.c.current_round
+    ).scalar_subquery()
+
+    return select(
+        games.c.id.label('game_id'),
+        games.c.status,
+        games.c.current_round,
+        submitted.label('submitted_players'),
+        total.label('active_players')
+    ).where(games.c.id == game_id)
+
+
+async def read_game_state(database: AsyncDatabase, game_id: int) -> Optional[Dict]:
+    row = await database.fetch_one(game_state_query(game_id))
+    return dict(row) if row else None
+
+
+class _GamePoller:
+    """单个游戏的轮询任务与订阅者"""
+
+    def __init__(self, hub: 'GameStateHub', game_id: int):
+        self.hub = hub
+        self.game_id = game_id
+        self.subscribers = set()
+        self.state = _UNSET
+        self.task = None
+
+    def publish(self, queue: asyncio.Queue, state):
+        # 只保留最新状态：慢订阅者跳过中间状态
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(state)
+
+    async def run(self):
+        while self.subscribers:
+            try:
+                state = await read_game_state(self.hub.database, self.game_id)
+            except Exception as e:
+                logger.error("Polling state of game %s failed: %s", self.game_id, e)
+            else:
+                if state != self.state:
+                    self.state = state
+                    for queue in self.subscribers:
+                        self.publish(queue, state)
+                if state is None:
+                    return
+            await asyncio.sleep(self.hub.poll_interval)
+
+
+class GameStateHub:
+    """按游戏聚合订阅者，数据库查询次数与订阅者数量无关"""
+
+    def __init__(self, database: AsyncDatabase, poll_interval: float = 1.0):
+        self.database = database
+        self.poll_interval = poll_interval
+        self._pollers: Dict[int, _GamePoller] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(poller.subscribers) for poller in self._pollers.values())
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, game_id: int):
+        """
+        订阅游戏状态
+
+        产出一个队列，每次状态变化放入最新状态（dict）；游戏不存在时放入 None。
+        """
+        queue = asyncio.Queue(maxsize=1)
+        poller = self._pollers.get(game_id)
+        if poller is None:
+            poller = self._pollers[game_id] = _GamePoller(self, game_id)
+
+        poller.subscribers.add(queue)
+        if poller.state is not _UNSET:
+            poller.publish(queue, poller.state)
+        if poller.task is None or poller.task.done():
+            poller.task = asyncio.create_task(poller.run())
+
+        try:
+            yield queue
+        finally:
+            poller.subscribers.discard(queue)
+            if not poller.subscribers:
+                poller.task.cancel()
+                if self._pollers.get(game_id) is poller:
+                    del self._pollers[game_id]
+
+
+__all__ = ['GameStateHub', 'game_state_query', 'read_game_state']
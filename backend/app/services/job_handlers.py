@@ -0,0 +1,33 @@
+"""
+Job handlers
+Long-running operations that job workers execute outside request threads
+"""
+from typing import Dict
+from app.services.finance_service import FinanceService
+from app.services.job_service import job_handler
+from app.services.settlement_service import SettlementService
+
+
+@job_handler('settle_round')
+def settle_round(payload: Dict) -> Dict:
+    """Settle a round (payload: game_id, round_number, allow_missing)"""
+    return SettlementService.settle_round(
+        payload['game_id'],
+        payload.get('round_number'),
+        allow_missing=payload.get('allow_missing', False)
+    )
+
+
+@job_handler('generate_finance_records')
+def generate_finance_records(payload: Dict) -> Dict:
+    """Generate finance records of every active player for a settled round (payload: game_id, round_number)"""
+    return SettlementService.generate_finance_records(payload['game_id'], payload['round_number'])
+
+
+@job_handler('game_report')
+def game_report(payload: Dict) -> Dict:
+    """Build the end-of-game report (payload: game_id)"""
+    return FinanceService.get_game_report(payload['game_id'])
+
+
+__all__ = ['settle_round', 'generate_finance_records', 'game_report']
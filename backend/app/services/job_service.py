@@ -0,0 +1,214 @@
+"""
+Job service
+Durable background job queue stored in the jobs table: enqueue with
+idempotency keys, claim by workers, retries with backoff and status polling
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from flask import current_app
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from app.core.database import db
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# job_type -> handler(payload) -> JSON-serializable result
+_handlers: Dict[str, Callable[[Dict], Optional[Dict]]] = {}
+
+
+def job_handler(job_type: str):
+    """Register a function as the handler of a job type"""
+
+    def decorator(func):
+        _handlers[job_type] = func
+        return func
+
+    return decorator
+
+
+class JobService:
+    """Background job service"""
+
+    @staticmethod
+    def job_types():
+        """Registered job types"""
+        return sorted(_handlers)
+
+    @staticmethod
+    def enqueue(job_type: str, payload: Optional[Dict] = None, idempotency_key: Optional[str] = None,
+                max_attempts: Optional[int] = None, commit: bool = True) -> Job:
+        """
+        Queue a job
+
+        Args:
+            job_type: Registered job type
+            payload: Handler arguments
+            idempotency_key: Enqueueing the same key again returns the existing job;
+                a failed job is re-queued with fresh attempts instead
+            max_attempts: Attempts before the job is marked failed (defaults to JOB_MAX_ATTEMPTS)
+            commit: Commit immediately; pass False to enqueue inside the caller's transaction
+
+        Returns:
+            Queued (or existing) job
+
+        Raises:
+            ValueError: If the job type is unknown
+        """
+        if job_type not in _handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        if idempotency_key:
+            existing = Job.query.filter_by(idempotency_key=idempotency_key).first()
+            if existing:
+                if existing.status == 'failed':
+                    JobService._requeue(existing, payload, commit)
+                return existing
+
+        job = Job(
+            job_type=job_type,
+            idempotency_key=idempotency_key,
+            payload=payload or {},
+            status='queued',
+            attempts=0,
+            max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 3),
+            run_after=datetime.utcnow()
+        )
+        db.session.add(job)
+
+        if not commit:
+            return job
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request enqueued the same key first
+            db.session.rollback()
+            existing = Job.query.filter_by(idempotency_key=idempotency_key).first()
+            if not existing:
+                raise
+            if existing.status == 'failed':
+                JobService._requeue(existing, payload, commit)
+            return existing
+
+        return job
+
+    @staticmethod
+    def _requeue(job: Job, payload: Optional[Dict], commit: bool):
+        """Reset a failed job so its key does not block the work for good"""
+        # Conditional, so concurrent enqueues of the same key reset it only once
+        Job.query.filter(Job.id == job.id, Job.status == 'failed').update({
+            Job.status: 'queued',
+            Job.payload: payload or {},
+            Job.attempts: 0,
+            Job.error: None,
+            Job.result: None,
+            Job.run_after: datetime.utcnow(),
+            Job.finished_at: None
+        }, synchronize_session=False)
+        if commit:
+            db.session.commit()
+        else:
+            db.session.expire(job)
+        logger.info("Re-queued failed job %s (%s)", job.id, job.idempotency_key)
+
+    @staticmethod
+    def get_job(job_id: int) -> Dict:
+        """
+        Get job status
+
+        Raises:
+            ValueError: If the job does not exist
+        """
+        job = Job.query.get(job_id)
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        return job.to_dict()
+
+    @staticmethod
+    def claim_next(worker_id: str) -> Optional[Job]:
+        """
+        Claim the next runnable job for a worker
+
+        A job is runnable when it is queued and its run_after has passed, or
+        when it is running under an expired lease (its worker died). The claim
+        is a conditional UPDATE, so concurrent workers never run the same job.
+
+        Returns:
+            Claimed job, or None when nothing is runnable
+        """
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=current_app.config.get('JOB_LEASE_SECONDS', 300))
+
+        runnable = or_(
+            and_(Job.status == 'queued', Job.run_after <= now),
+            and_(Job.status == 'running', Job.locked_at < lease_expired)
+        )
+
+        candidates = db.session.query(Job.id).filter(runnable).order_by(Job.id.asc()).limit(5).all()
+        db.session.rollback()
+
+        for (job_id,) in candidates:
+            claimed = Job.query.filter(Job.id == job_id, runnable).update({
+                Job.status: 'running',
+                Job.attempts: Job.attempts + 1,
+                Job.locked_by: worker_id,
+                Job.locked_at: now
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if claimed == 1:
+                return Job.query.get(job_id)
+
+        return None
+
+    @staticmethod
+    def run_job(job: Job) -> Job:
+        """
+        Execute a claimed job and record the outcome
+
+        ValueError from a handler is a validation failure and is not retried;
+        other errors are retried with exponential backoff until max_attempts.
+        """
+        handler = _handlers.get(job.job_type)
+        job_id = job.id
+
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job type: {job.job_type}")
+            result = handler(job.payload or {})
+        except Exception as e:
+            db.session.rollback()
+            job = Job.query.get(job_id)
+            job.error = str(e)
+
+            if isinstance(e, ValueError) or job.attempts >= job.max_attempts:
+                job.status = 'failed'
+                job.finished_at = datetime.utcnow()
+                logger.error("Job %s (%s) failed: %s", job.id, job.job_type, e)
+            else:
+                backoff = current_app.config.get('JOB_RETRY_BACKOFF', 5) * 2 ** (job.attempts - 1)
+                job.status = 'queued'
+                job.run_after = datetime.utcnow() + timedelta(seconds=backoff)
+                logger.warning("Job %s (%s) attempt %s failed, retrying in %ss: %s",
+                               job.id, job.job_type, job.attempts, backoff, e)
+
+            job.locked_by = None
+            job.locked_at = None
+            db.session.commit()
+            return job
+
+        job = Job.query.get(job_id)
+        job.status = 'succeeded'
+        job.result = result
+        job.error = None
+        job.locked_by = None
+        job.locked_at = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return job
+
+
+# Export
+__all__ = ['JobService', 'job_handler']
@@ -0,0 +1,69 @@
+"""
+后台任务 worker
+从 jobs 表领取任务并执行。可在 Web 进程内启动（JOB_INPROCESS_WORKERS），
+也可以用 backend/worker.py 单独启动 worker 进程，与 Web 进程分开扩容。
+"""
+import logging
+import os
+import socket
+import threading
+from app.services import job_handlers  # noqa: F401  注册任务处理函数
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_id(index: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def run_once(app, worker_id: str) -> bool:
+    """
+    领取并执行一个任务
+
+    Returns:
+        是否执行了任务
+    """
+    with app.app_context():
+        job = JobService.claim_next(worker_id)
+        if job is None:
+            return False
+        JobService.run_job(job)
+        return True
+
+
+def run_worker(app, worker_id: str, poll_interval: float = 1.0, stop_event: threading.Event = None):
+    """worker 主循环：有任务时连续执行，队列为空时按 poll_interval 轮询"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        try:
+            if run_once(app, worker_id):
+                continue
+        except Exception as e:
+            logger.error("Job worker %s error: %s", worker_id, e)
+        stop_event.wait(poll_interval)
+
+
+def start_job_workers(app, workers: int, poll_interval: float = 1.0, stop_event: threading.Event = None):
+    """启动 workers 个后台线程执行任务"""
+    threads = []
+    for index in range(workers):
+        thread = threading.Thread(
+            target=run_worker,
+            args=(app, _worker_id(index), poll_interval, stop_event),
+            daemon=True,
+            name=f"job-worker-{index}"
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def init_job_workers(app):
+    """按 JOB_INPROCESS_WORKERS 在 Web 进程内启动 worker（0 表示只由独立 worker 进程执行）"""
+    workers = app.config.get('JOB_INPROCESS_WORKERS', 1)
+    if workers > 0:
+        start_job_workers(app, workers, app.config.get('JOB_POLL_INTERVAL', 1.0))
+
+
+__all__ = ['run_once', 'run_worker', 'start_job_workers', 'init_job_workers']
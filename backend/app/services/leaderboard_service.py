@@ -0,0 +1,314 @@
+"""
+Leaderboard service
+Keeps per-game and global (finished games) leaderboards sorted in memory,
+or in Redis sorted sets when LEADERBOARD_BACKEND=redis
+"""
+import bisect
+import json
+import threading
+from typing import Dict, List
+from flask import current_app
+from app.core.database import db
+from app.models.game import Game, SequenceCounter
+from app.models.player import Player
+from app.services.event_service import EventService
+from app.utils.room_code import reserve_sequence_block
+
+try:
+    import redis
+except ImportError:  # Redis is optional
+    redis = None
+
+
+class SortedLeaderboard:
+    """In-memory leaderboard kept sorted by score (descending) with bisect"""
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._keys = []      # [(-score, member)], ascending
+        self._entries = {}   # member -> (score, data)
+
+    def update(self, member: str, score: float, data: Dict, version=None):
+        with self._lock:
+            self._discard(member)
+            bisect.insort(self._keys, (-score, member))
+            self._entries[member] = (score, data)
+            if version is not None:
+                self.version = version
+
+    def remove(self, member: str):
+        with self._lock:
+            self._discard(member)
+
+    def replace_all(self, entries: Dict[str, tuple], version):
+        """Reload the whole board: {member: (score, data)}"""
+        with self._lock:
+            self._keys = sorted((-score, member) for member, (score, _) in entries.items())
+            self._entries = dict(entries)
+            self.version = version
+
+    def ranked(self, limit: int = None) -> List[Dict]:
+        with self._lock:
+            keys = self._keys if limit is None else self._keys[:limit]
+            return [
+                dict(self._entries[member][1], rank=idx + 1)
+                for idx, (_, member) in enumerate(keys)
+            ]
+
+    def _discard(self, member: str):
+        existing = self._entries.pop(member, None)
+        if existing is not None:
+            idx = bisect.bisect_left(self._keys, (-existing[0], member))
+            del self._keys[idx]
+
+
+class RedisLeaderboard:
+    """Leaderboard backed by a Redis sorted set plus a hash of entry data"""
+
+    def __init__(self, client, name: str):
+        self.client = client
+        self.scores_key = f"leaderboard:{name}:scores"
+        self.data_key = f"leaderboard:{name}:data"
+        self.version_key = f"leaderboard:{name}:version"
+
+    @property
+    def version(self):
+        value = self.client.get(self.version_key)
+        return json.loads(value) if value is not None else None
+
+    def update(self, member: str, score: float, data: Dict, version=None):
+        pipe = self.client.pipeline()
+        pipe.zadd(self.scores_key, {member: score})
+        pipe.hset(self.data_key, member, json.dumps(data))
+        if version is not None:
+            pipe.set(self.version_key, json.dumps(version))
+        pipe.execute()
+
+    def remove(self, member: str):
+        pipe = self.client.pipeline()
+        pipe.zrem(self.scores_key, member)
+        pipe.hdel(self.data_key, member)
+        pipe.execute()
+
+    def replace_all(self, entries: Dict[str, tuple], version):
+        pipe = self.client.pipeline()
+        pipe.delete(self.scores_key, self.data_key)
+        if entries:
+            pipe.zadd(self.scores_key, {member: score for member, (score, _) in entries.items()})
+            pipe.hset(self.data_key, mapping={
+                member: json.dumps(data) for member, (_, data) in entries.items()
+            })
+        pipe.set(self.version_key, json.dumps(version))
+        pipe.execute()
+
+    def ranked(self, limit: int = None) -> List[Dict]:
+        end = -1 if limit is None else limit - 1
+        members = self.client.zrevrange(self.scores_key, 0, end)
+        if not members:
+            return []
+        values = self.client.hmget(self.data_key, members)
+        return [
+            dict(json.loads(value), rank=idx + 1)
+            for idx, value in enumerate(values) if value is not None
+        ]
+
+
+_boards = {}
+_boards_lock = threading.Lock()
+_redis_client = None
+
+GLOBAL_BOARD = 'global'
+
+# Bumped whenever the set of finished games (or their players) changes; the global
+# board is tagged with it. A counter never returns to an earlier value, unlike a row count.
+GLOBAL_BOARD_SEQUENCE = 'leaderboard_global'
+
+
+def _get_board(name: str):
+    global _redis_client
+
+    if current_app.config.get('LEADERBOARD_BACKEND', 'memory') == 'redis':
+        if redis is None:
+            raise RuntimeError("LEADERBOARD_BACKEND=redis requires the redis package")
+        if _redis_client is None:
+            _redis_client = redis.Redis.from_url(current_app.config['REDIS_URL'])
+        return RedisLeaderboard(_redis_client, name)
+
+    with _boards_lock:
+        board = _boards.get(name)
+        if board is None:
+            board = SortedLeaderboard()
+            _boards[name] = board
+        return board
+
+
+class LeaderboardService:
+    """Leaderboard management service"""
+
+    @staticmethod
+    def record_player(player: Player, total_profit: float):
+        """
+        Update a player's position after a finance record is generated
+
+        Args:
+            player: Player object
+            total_profit: Player's new cumulative profit
+        """
+        board = _get_board(f"game:{player.game_id}")
+
+        # Only patch a board built from the latest settlement;
+        # older boards are rebuilt from the players table on the next read
+        if board.version != EventService.settlement_version(player.game):
+            return
+
+        board.update(
+            str(player.id),
+            float(total_profit),
+            LeaderboardService._player_entry(player, total_profit)
+        )
+
+    @staticmethod
+    def refresh_game(game: Game):
+        """
+        Rebuild a game's board after a settlement commits
+
+        Args:
+            game: Game object
+        """
+        LeaderboardService._rebuild_game_board(game, EventService.settlement_version(game))
+
+    @staticmethod
+    def remove_player(game_id: int, player_id: int):
+        """Drop a player that left the game"""
+        _get_board(f"game:{game_id}").remove(str(player_id))
+
+    @staticmethod
+    def record_finished_game(game: Game):
+        """
+        Add the players of a game that just finished to the global leaderboard
+
+        Args:
+            game: Finished Game object
+        """
+        board = _get_board(GLOBAL_BOARD)
+        version = LeaderboardService.invalidate_global()
+
+        # A board that missed other changes is rebuilt on the next read
+        if board.version != version - 1:
+            return
+
+        players = Player.query.filter_by(game_id=game.id, is_active=True).all()
+        for player in players:
+            board.update(
+                f"{game.id}:{player.id}",
+                float(player.total_profit),
+                LeaderboardService._global_entry(game, player),
+                version=version
+            )
+
+    @staticmethod
+    def invalidate_global() -> int:
+        """
+        Bump the global board version after finished games or their players change
+
+        Runs on its own connection and commits immediately, so call it after
+        the change itself has committed.
+
+        Returns:
+            New version
+        """
+        return reserve_sequence_block(GLOBAL_BOARD_SEQUENCE, 1) + 1
+
+    @staticmethod
+    def get_game_leaderboard(game: Game) -> List[Dict]:
+        """
+        Get the ranked players of a game
+
+        Profit is as of the last settlement; the board is tagged with the
+        game's latest round_settlement event and rebuilt from the players
+        table whenever a newer settlement has committed. Cash is live.
+
+        Args:
+            game: Game object
+
+        Returns:
+            [{"player_id": 1, "nickname": "...", "total_profit": 5000.0, "cash": 12000.0, "rank": 1}, ...]
+        """
+        version = EventService.settlement_version(game)
+        board = _get_board(f"game:{game.id}")
+        if board.version != version:
+            board = LeaderboardService._rebuild_game_board(game, version)
+
+        cash = dict(db.session.query(Player.id, Player.cash).filter_by(game_id=game.id).all())
+        ranked = board.ranked()
+        for entry in ranked:
+            entry["cash"] = float(cash.get(entry["player_id"], 0))
+        return ranked
+
+    @staticmethod
+    def get_global_leaderboard(limit: int = 50) -> List[Dict]:
+        """
+        Get the best players across all finished games
+
+        Args:
+            limit: Number of entries to return
+
+        Returns:
+            [{"game_id": 1, "game_name": "...", "player_id": 1, "nickname": "...",
+              "total_profit": 5000.0, "cash": 12000.0, "finished_at": "...", "rank": 1}, ...]
+        """
+        board = _get_board(GLOBAL_BOARD)
+        version = db.session.query(SequenceCounter.next_value).filter_by(name=GLOBAL_BOARD_SEQUENCE).scalar() or 0
+
+        if board.version != version:
+            rows = db.session.query(Player, Game).join(
+                Game, Game.id == Player.game_id
+            ).filter(Game.status == 'finished', Player.is_active.is_(True)).all()
+
+            board.replace_all({
+                f"{game.id}:{player.id}": (
+                    float(player.total_profit),
+                    LeaderboardService._global_entry(game, player)
+                )
+                for player, game in rows
+            }, version)
+
+        return board.ranked(limit)
+
+    @staticmethod
+    def _rebuild_game_board(game: Game, version: int):
+        board = _get_board(f"game:{game.id}")
+        players = Player.query.filter_by(game_id=game.id, is_active=True).all()
+        board.replace_all({
+            str(player.id): (
+                float(player.total_profit),
+                LeaderboardService._player_entry(player, player.total_profit)
+            )
+            for player in players
+        }, version)
+        return board
+
+    @staticmethod
+    def _player_entry(player: Player, total_profit) -> Dict:
+        return {
+            "player_id": player.id,
+            "nickname": player.nickname,
+            "total_profit": float(total_profit)
+        }
+
+    @staticmethod
+    def _global_entry(game: Game, player: Player) -> Dict:
+        return {
+            "game_id": game.id,
+            "game_name": game.name if game.name else game.room_code,
+            "player_id": player.id,
+            "nickname": player.nickname,
+            "total_profit": float(player.total_profit),
+            "cash": float(player.cash),
+            "finished_at": game.finished_at.isoformat() if game.finished_at else None
+        }
+
+
+# Export
+__all__ = ['LeaderboardService']
@@ -0,0 +1,142 @@
+"""
+Ledger service
+Every change to a player's cash goes through here and appends a cash_ledger
+entry in the same transaction, so per-round cash flows are one GROUP BY.
+Cash is changed with a single conditional UPDATE rather than read-modify-write,
+so concurrent requests of the same player cannot overwrite each other's debits.
+"""
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import func, update
+from app.core.database import db
+from app.models.player import Player
+from app.models.finance import CashLedgerEntry
+from app.utils.money import to_cents, from_cents
+
+# Ledger categories
+REVENUE = 'revenue'
+MATERIAL = 'material'
+DECORATION = 'decoration'
+HIRING = 'hiring'
+MARKET_RESEARCH = 'market_research'
+ADVERTISEMENT = 'advertisement'
+PRODUCT_RESEARCH = 'product_research'
+
+# Categories reported as round expenses (hiring is covered by the salary charge)
+EXPENSE_CATEGORIES = (MATERIAL, DECORATION, MARKET_RESEARCH, ADVERTISEMENT, PRODUCT_RESEARCH)
+
+
+def to_amount(value) -> Decimal:
+    """Convert a float/int/Decimal amount to a Decimal rounded to cents"""
+    return from_cents(to_cents(value))
+
+
+class LedgerService:
+    """Cash ledger service"""
+
+    @staticmethod
+    def debit(player: Player, amount, category: str, round_number: int = None,
+              reference: Optional[str] = None) -> CashLedgerEntry:
+        """
+        Take cash from a player
+
+        The balance check and the deduction are one atomic UPDATE, so two
+        concurrent debits can never overdraw or lose each other. The entry is
+        added to the current session and committed together with the change
+        it pays for.
+
+        Args:
+            player: Player paying
+            amount: Positive amount to take
+            category: Ledger category (material, decoration, ...)
+            round_number: Round of the payment (defaults to the game's current round)
+            reference: Source record, e.g. "employee:12"
+
+        Returns:
+            CashLedgerEntry object
+
+        Raises:
+            ValueError: If the player's cash does not cover the amount
+        """
+        return LedgerService._post(player, -to_amount(amount), category, round_number, reference)
+
+    @staticmethod
+    def credit(player: Player, amount, category: str, round_number: int = None,
+               reference: Optional[str] = None) -> CashLedgerEntry:
+        """Give cash to a player; see debit"""
+        return LedgerService._post(player, to_amount(amount), category, round_number, reference)
+
+    @staticmethod
+    def _post(player: Player, amount: Decimal, category: str, round_number: Optional[int],
+              reference: Optional[str]) -> CashLedgerEntry:
+        if round_number is None:
+            round_number = player.game.current_round if player.game else 0
+
+        players = Player.__table__
+        statement = update(players).where(players.c.id == player.id).values(cash=players.c.cash + amount)
+        if amount < 0:
+            statement = statement.where(players.c.cash >= -amount)
+
+        if db.session.execute(statement).rowcount != 1:
+            db.session.refresh(player, ['cash'])
+            raise ValueError(f"Insufficient cash! Need {float(-amount)}, have {float(player.cash)}")
+
+        # The in-memory value is stale now; reload it from this transaction on next access
+        db.session.expire(player, ['cash'])
+
+        entry = CashLedgerEntry(
+            player_id=player.id,
+            round_number=round_number,
+            category=category,
+            amount=amount,
+            reference=reference
+        )
+        db.session.add(entry)
+        return entry
+
+    @staticmethod
+    def round_totals(player_id: int, round_number: int) -> Dict[str, float]:
+        """
+        Net cash flow of a player's round per category
+
+        Args:
+            player_id: Player ID
+            round_number: Round number
+
+        Returns:
+            {"revenue": 600.0, "material": -123.45, ...} (debits are negative)
+        """
+        rows = db.session.query(
+            CashLedgerEntry.category,
+            func.sum(CashLedgerEntry.amount)
+        ).filter(
+            CashLedgerEntry.player_id == player_id,
+            CashLedgerEntry.round_number == round_number
+        ).group_by(CashLedgerEntry.category).all()
+
+        return {category: float(total) for category, total in rows}
+
+    @staticmethod
+    def get_entries(player_id: int, round_number: int = None) -> List[Dict]:
+        """
+        Get a player's ledger entries in append order
+
+        Args:
+            player_id: Player ID
+            round_number: Only entries of this round
+
+        Returns:
+            List of entry dictionaries
+        """
+        query = CashLedgerEntry.query.filter_by(player_id=player_id)
+        if round_number is not None:
+            query = query.filter_by(round_number=round_number)
+
+        return [entry.to_dict() for entry in query.order_by(CashLedgerEntry.id).all()]
+
+
+# Export
+__all__ = [
+    'LedgerService', 'to_amount', 'EXPENSE_CATEGORIES',
+    'REVENUE', 'MATERIAL', 'DECORATION', 'HIRING', 'MARKET_RESEARCH', 'ADVERTISEMENT', 'PRODUCT_RESEARCH'
+]
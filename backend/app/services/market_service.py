@@ -3,9 +3,11 @@ Market service
 Handles market actions: advertisement (player-level) and market research.
 """
 from typing import Dict, List
-from app.core.database import db
+from app.core.database import db, retry_on_conflict
 from app.models.player import Player
 from app.models.finance import MarketAction
+from app.services.event_service import EventService
+from app.services.ledger_service import LedgerService, ADVERTISEMENT, MARKET_RESEARCH
 from app.utils.game_constants import GameConstants
 
 
@@ -13,6 +15,7 @@ class MarketService:
     """Market action management service"""
 
     @staticmethod
+    @retry_on_conflict
     def place_advertisement(player_id: int, round_number: int, dice_result: int) -> Dict:
         """
         Place advertisement (player-level, not per-product)
@@ -30,7 +33,7 @@ class MarketService:
         if player.cash < cost:
             raise ValueError(f"Insufficient cash! Need {cost}, have {float(player.cash)}")
 
-        player.cash -= cost
+        LedgerService.debit(player, cost, ADVERTISEMENT, round_number)
 
         market_action = MarketAction(
             player_id=player_id,
@@ -40,6 +43,10 @@ class MarketService:
             result_value=dice_result  # store ad_score
         )
         db.session.add(market_action)
+        EventService.record(player, 'ad_placed', {
+            "dice_result": dice_result,
+            "cost": float(cost)
+        }, round_number=round_number)
         db.session.commit()
 
         return {
@@ -51,6 +58,7 @@ class MarketService:
         }
 
     @staticmethod
+    @retry_on_conflict
     def conduct_market_research(player_id: int, round_number: int) -> Dict:
         """
         Conduct market research to view NEXT round's customer flow
@@ -65,20 +73,13 @@ class MarketService:
         if player.cash < cost:
             raise ValueError(f"Insufficient cash! Need {cost}, have {float(player.cash)}")
 
-        player.cash -= cost
+        LedgerService.debit(player, cost, MARKET_RESEARCH, round_number)
 
-        from app.models.game import CustomerFlow
-        from app.services.round_service import RoundService
+        from app.services.flow_provider import FlowProvider
 
         next_round = round_number + 1
 
-        customer_flow = CustomerFlow.query.filter_by(
-            game_id=player.game_id,
-            round_number=next_round
-        ).first()
-
-        if not customer_flow:
-            customer_flow = RoundService.generate_customer_flow(player.game_id, next_round)
+        customer_flow = FlowProvider.get_flow(player.game, next_round)
 
         market_action = MarketAction(
             player_id=player_id,
@@ -88,6 +89,10 @@ class MarketService:
             result_value=None
         )
         db.session.add(market_action)
+        EventService.record(player, 'market_researched', {
+            "next_round": next_round,
+            "cost": float(cost)
+        }, round_number=round_number)
         db.session.commit()
 
         return {
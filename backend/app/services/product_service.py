@@ -4,17 +4,25 @@ Handles product research, unlocking, and management
 """
 import random
 from typing import Dict, List
-from app.core.database import db
+from sqlalchemy.exc import IntegrityError
+from app.core.database import db, retry_on_conflict
 from app.models.player import Player
 from app.models.product import ProductRecipe, PlayerProduct
 from app.models.finance import ResearchLog
+from app.services.event_service import EventService
+from app.services.ledger_service import LedgerService, PRODUCT_RESEARCH
+from app.utils.cache import LocalCache
 from app.utils.game_constants import GameConstants
 
+# Recipe catalog is seed data; locked products are derived from it instead of stored per player
+_recipe_catalog = LocalCache('recipe_catalog', ttl_seconds=300, maxsize=1)
+
 
 class ProductService:
     """Product management service"""
 
     @staticmethod
+    @retry_on_conflict
     def research_product(player_id: int, recipe_id: int, round_number: int, dice_result: int) -> Dict:
         """
         Research a product (offline dice roll, player inputs result)
@@ -79,13 +87,13 @@ class ProductService:
             )
 
         # Deduct cost
-        player.cash -= cost
+        LedgerService.debit(player, cost, PRODUCT_RESEARCH, round_number, f"recipe:{recipe_id}")
 
         # Check against recipe difficulty
         # Difficulty 3: need >= 2 (easy) - 83% success rate
         # Difficulty 4: need >= 3 (medium) - 67% success rate
         # Difficulty 5: need >= 4 (hard) - 50% success rate
-        required_roll = 2 if recipe.difficulty == 3 else 3 if recipe.difficulty == 4 else 4
+        required_roll = ProductService.required_roll(recipe.difficulty)
         research_success = dice_result >= required_roll
 
         # Create research log
@@ -99,14 +107,14 @@ class ProductService:
         )
         db.session.add(research_log)
 
-        # If successful, unlock product
+        # If successful, unlock product (locked products have no row until now)
         product_unlocked = False
         if research_success:
             if existing:
                 # Update existing record
                 existing.is_unlocked = True
             else:
-                # Create new player product
+                # Materialize the player product
                 player_product = PlayerProduct(
                     player_id=player_id,
                     recipe_id=recipe_id,
@@ -118,7 +126,20 @@ class ProductService:
 
             product_unlocked = True
 
-        db.session.commit()
+        EventService.record(player, 'research_rolled', {
+            "recipe_id": recipe_id,
+            "dice_result": dice_result,
+            "required_roll": required_roll,
+            "success": research_success,
+            "cost": float(cost)
+        }, round_number=round_number)
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent research request unlocked the same product first
+            db.session.rollback()
+            raise ValueError(f"Product '{recipe.name}' is already unlocked")
 
         return {
             "success": True,
@@ -132,6 +153,11 @@ class ProductService:
             "remaining_cash": float(player.cash)
         }
 
+    @staticmethod
+    def required_roll(difficulty: int) -> int:
+        """Minimum dice roll for a research attempt to succeed"""
+        return 2 if difficulty == 3 else 3 if difficulty == 4 else 4
+
     @staticmethod
     def unlock_product_directly(player_id: int, recipe_id: int) -> PlayerProduct:
         """
@@ -161,6 +187,8 @@ class ProductService:
             recipe_id=recipe_id
         ).first()
 
+        EventService.record(player, 'product_unlocked', {"recipe_id": recipe_id})
+
         if existing:
             existing.is_unlocked = True
             db.session.commit()
@@ -215,6 +243,25 @@ class ProductService:
 
         return result
 
+    @staticmethod
+    def get_recipe_catalog() -> List[Dict]:
+        """
+        Get all product recipes (cached)
+
+        Returns:
+            [{"recipe_id", "name", "recipe_json", "base_fan_rate", "difficulty"}, ...]
+        """
+        return _recipe_catalog.get_or_load('all', lambda: [
+            {
+                "recipe_id": recipe.id,
+                "name": recipe.name,
+                "recipe_json": recipe.recipe_json,
+                "base_fan_rate": recipe.base_fan_rate,
+                "difficulty": recipe.difficulty
+            }
+            for recipe in ProductRecipe.query.order_by(ProductRecipe.id.asc()).all()
+        ])
+
     @staticmethod
     def get_available_recipes(player_id: int) -> List[Dict]:
         """
@@ -234,33 +281,23 @@ class ProductService:
         if not player:
             raise ValueError(f"Player {player_id} not found")
 
-        # Get all recipes
-        all_recipes = ProductRecipe.query.all()
-
-        # Get player's unlocked products
-        unlocked_products = {
-            p.recipe_id: p
-            for p in PlayerProduct.query.filter_by(
+        # Recipes the player has unlocked; every other catalog recipe is implicitly locked
+        unlocked_recipe_ids = {
+            recipe_id
+            for (recipe_id,) in db.session.query(PlayerProduct.recipe_id).filter_by(
                 player_id=player_id,
                 is_unlocked=True
             ).all()
         }
 
-        result = []
-        for recipe in all_recipes:
-            is_unlocked = recipe.id in unlocked_products
-
-            result.append({
-                "recipe_id": recipe.id,
-                "name": recipe.name,
-                "recipe_json": recipe.recipe_json,
-                "base_fan_rate": recipe.base_fan_rate,
-                "difficulty": recipe.difficulty,  # 添加难度信息
-                "is_unlocked": is_unlocked,
+        return [
+            {
+                **recipe,
+                "is_unlocked": recipe["recipe_id"] in unlocked_recipe_ids,
                 "research_cost": GameConstants.PRODUCT_RESEARCH_COST
-            })
-
-        return result
+            }
+            for recipe in ProductService.get_recipe_catalog()
+        ]
 
     @staticmethod
     def get_research_history(player_id: int) -> List[Dict]:
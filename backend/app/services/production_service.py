@@ -3,10 +3,12 @@
 处理生产计划提交、原材料计算、生产力验证等
 """
 from typing import List, Dict
-from app.core.database import db
-from app.models.player import Player, Employee
+from app.core.database import db, retry_on_conflict
+from app.models.player import Player
 from app.models.product import PlayerProduct, ProductRecipe, RoundProduction
 from app.services.calculation_engine import DiscountCalculator
+from app.services.event_service import EventService
+from app.services.ledger_service import LedgerService, MATERIAL
 from app.utils.game_constants import GameConstants
 
 
@@ -14,6 +16,7 @@ class ProductionService:
     """生产决策服务"""
 
     @staticmethod
+    @retry_on_conflict
     def submit_production_plan(player_id: int, round_number: int, productions: List[Dict]) -> Dict:
         """
         提交生产计划
@@ -70,7 +73,7 @@ class ProductionService:
             )
 
         # 7. 扣除原材料成本
-        player.cash -= purchase_cost
+        LedgerService.debit(player, purchase_cost, MATERIAL, round_number)
 
         # 8. 删除该玩家本回合的旧生产计划（如果有）
         RoundProduction.query.filter_by(
@@ -79,6 +82,7 @@ class ProductionService:
         ).delete()
 
         # 9. 保存新的生产计划并更新产品价格
+        planned = []
         for prod_data in productions:
             if prod_data['productivity'] <= 0:
                 continue
@@ -99,7 +103,18 @@ class ProductionService:
                 player_product.current_price = prod_data['price']
                 player_product.last_price_change_round = round_number
 
-        # 10. 提交所有更改
+            planned.append({
+                "product_id": prod_data['product_id'],
+                "recipe_id": player_product.recipe_id if player_product else None,
+                "productivity": prod_data['productivity'],
+                "price": float(prod_data['price'])
+            })
+
+        # 10. 记录事件并提交所有更改
+        EventService.record(player, 'plan_submitted', {
+            "material_cost": float(purchase_cost),
+            "productions": planned
+        }, round_number=round_number)
         db.session.commit()
 
         return {
@@ -201,12 +216,7 @@ class ProductionService:
         if not player or not player.shop:
             return 0
 
-        employees = Employee.query.filter_by(
-            shop_id=player.shop.id,
-            is_active=True
-        ).all()
-
-        return sum(emp.productivity for emp in employees)
+        return player.shop.total_productivity or 0
 
     @staticmethod
     def _validate_productivity_allocation(productions: List[Dict], total_productivity: int):
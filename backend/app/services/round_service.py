@@ -2,21 +2,28 @@
 Round service
 Handles round progression, customer flow generation, and settlement
 """
-import random
-from typing import Dict
+from datetime import datetime
+from typing import Dict, List
 from app.core.database import db
-from app.models.game import Game, CustomerFlow
-from app.models.player import Player, Employee
-from app.models.product import RoundProduction
+from app.core.metrics import ROUNDS_SETTLED, SETTLEMENT_DURATION
+from app.models.game import Game, CustomerFlow, RoundSummary
+from app.models.player import Player
+from app.models.product import RoundProduction, PlayerProduct, ProductRecipe
 from app.services.calculation_engine import CustomerFlowAllocator
-from app.utils.game_constants import GameConstants
+from app.services.event_service import EventService
+from app.services.flow_provider import FlowProvider
+from app.services.ledger_service import LedgerService, REVENUE, EXPENSE_CATEGORIES
+from app.utils.money import to_cents, from_cents, cents_to_float
+
+# round_summaries.product_id of the row written for a player that produced nothing
+NO_PRODUCT = 0
 
 
 class RoundService:
     """Round management service"""
 
     @staticmethod
-    def advance_round(game_id: int) -> Dict:
+    def advance_round(game_id: int, allow_missing: bool = False) -> Dict:
         """
         Advance to next round
 
@@ -29,8 +36,13 @@ class RoundService:
         6. Advance to next round
         7. Check if game is finished
 
+        Changes are flushed, not committed: the caller (SettlementService)
+        commits them together with the finance records.
+
         Args:
             game_id: Game ID
+            allow_missing: Settle even if some players have not submitted
+                (their plan is treated as empty)
 
         Returns:
             {
@@ -45,6 +57,15 @@ class RoundService:
         Raises:
             ValueError: Various validation errors
         """
+        with SETTLEMENT_DURATION.time():
+            result = RoundService._settle_current_round(game_id, allow_missing)
+
+        ROUNDS_SETTLED.inc()
+        return result
+
+    @staticmethod
+    def _settle_current_round(game_id: int, allow_missing: bool = False) -> Dict:
+        """Run the settlement steps of advance_round for the game's current round"""
         game = Game.query.get(game_id)
         if not game:
             raise ValueError(f"Game {game_id} not found")
@@ -55,28 +76,34 @@ class RoundService:
         current_round = game.current_round
 
         # 1. Check if all active players submitted production plans
-        RoundService._verify_all_players_submitted(game_id, current_round)
+        if not allow_missing:
+            RoundService._verify_all_players_submitted(game_id, current_round)
 
         # 2. Generate customer flow for current round
         customer_flow = RoundService.generate_customer_flow(game_id, current_round)
 
         # 3. Allocate customers to products
-        allocation_result = CustomerFlowAllocator.allocate(game_id, current_round)
+        allocation_result = CustomerFlowAllocator.allocate(game_id, current_round, customer_flow)
 
         # 4. Update player revenue (already done in CustomerFlowAllocator._save_sales)
         RoundService._update_player_revenue(game_id, current_round)
 
+        # 4.5. Write the round summary projection
+        RoundService.write_round_summary(game_id, current_round, customer_flow)
+
         # 5. Advance to next round
         previous_round = current_round
         game.current_round += 1
 
         # 6. Check if game is finished
         game_finished = False
-        if game.current_round > GameConstants.TOTAL_ROUNDS:
+        if game.current_round > FlowProvider.total_rounds(game):
             game.status = 'finished'
+            game.finished_at = datetime.utcnow()
             game_finished = True
 
-        db.session.commit()
+        # Flushed only; SettlementService commits the whole settlement at once
+        db.session.flush()
 
         return {
             "success": True,
@@ -88,55 +115,34 @@ class RoundService:
         }
 
     @staticmethod
-    def generate_customer_flow(game_id: int, round_number: int) -> CustomerFlow:
+    def generate_customer_flow(game_id: int, round_number: int):
         """
-        Generate customer flow for a round using fixed script
+        Get the customer flow of a round from the game's scenario
 
-        Uses fixed script from GameConstants.CUSTOMER_FLOW_SCRIPT
-        Rounds 1-10 have predefined customer numbers
+        Computed in memory by FlowProvider; only persisted scenarios
+        (and games started before scenarios existed) use customer_flows rows.
 
         Args:
             game_id: Game ID
             round_number: Round number
 
         Returns:
-            CustomerFlow object
+            RoundFlow or CustomerFlow object
         """
-        # Check if already exists
-        existing = CustomerFlow.query.filter_by(
-            game_id=game_id,
-            round_number=round_number
-        ).first()
-
-        if existing:
-            return existing
-
-        # Use fixed customer flow script
-        if round_number in GameConstants.CUSTOMER_FLOW_SCRIPT:
-            flow_data = GameConstants.CUSTOMER_FLOW_SCRIPT[round_number]
-            high_tier = flow_data["high"]
-            low_tier = flow_data["low"]
-        else:
-            # Fallback for invalid round numbers
-            raise ValueError(f"Invalid round number: {round_number}. Must be 1-10.")
-
-        customer_flow = CustomerFlow(
-            game_id=game_id,
-            round_number=round_number,
-            high_tier_customers=high_tier,
-            low_tier_customers=low_tier
-        )
-
-        db.session.add(customer_flow)
-        db.session.commit()
+        game = Game.query.get(game_id)
+        if not game:
+            raise ValueError(f"Game {game_id} not found")
 
-        return customer_flow
+        return FlowProvider.get_flow(game, round_number)
 
     @staticmethod
     def get_round_summary(game_id: int, round_number: int) -> Dict:
         """
         Get summary of a specific round
 
+        Served from the round_summaries projection written at settlement;
+        rounds settled before the projection existed fall back to the live tables.
+
         Args:
             game_id: Game ID
             round_number: Round number
@@ -157,17 +163,167 @@ class RoundService:
                 ]
             }
         """
-        # Get customer flow
-        customer_flow = CustomerFlow.query.filter_by(
+        rows = RoundSummary.query.filter_by(
             game_id=game_id,
             round_number=round_number
-        ).first()
+        ).order_by(RoundSummary.player_id.asc(), RoundSummary.id.asc()).all()
 
-        if not customer_flow:
-            raise ValueError(f"No customer flow data for round {round_number}")
+        if rows:
+            return RoundService._group_summary_rows(game_id, rows)[0]
+
+        return RoundService._build_live_summary(game_id, round_number)
+
+    @staticmethod
+    def get_round_history(game_id: int) -> List[Dict]:
+        """
+        Get summaries of all settled rounds of a game
+
+        Args:
+            game_id: Game ID
+
+        Returns:
+            List of round summaries (same shape as get_round_summary), oldest first
+        """
+        rows = RoundSummary.query.filter_by(game_id=game_id).order_by(
+            RoundSummary.round_number.asc(),
+            RoundSummary.player_id.asc(),
+            RoundSummary.id.asc()
+        ).all()
+
+        return RoundService._group_summary_rows(game_id, rows)
+
+    @staticmethod
+    def write_round_summary(game_id: int, round_number: int, customer_flow):
+        """
+        Materialize the settled round into round_summaries
+
+        Args:
+            game_id: Game ID
+            round_number: Settled round number
+            customer_flow: Customer flow of the round
+        """
+        # Replace rows of a re-settled round
+        RoundSummary.query.filter_by(game_id=game_id, round_number=round_number).delete()
+
+        rows = db.session.query(RoundProduction, Player.nickname, ProductRecipe.name).join(
+            Player, Player.id == RoundProduction.player_id
+        ).outerjoin(
+            PlayerProduct, PlayerProduct.id == RoundProduction.product_id
+        ).outerjoin(
+            ProductRecipe, ProductRecipe.id == PlayerProduct.recipe_id
+        ).filter(
+            Player.game_id == game_id,
+            Player.is_active.is_(True),
+            RoundProduction.round_number == round_number
+        ).all()
+
+        produced_by = set()
+        for production, nickname, product_name in rows:
+            produced_by.add(production.player_id)
+            db.session.add(RoundSummary(
+                game_id=game_id,
+                round_number=round_number,
+                player_id=production.player_id,
+                nickname=nickname,
+                product_id=production.product_id,
+                product_name=product_name or "Unknown",
+                price=production.price,
+                produced=production.produced_quantity or 0,
+                sold=production.sold_quantity or 0,
+                sold_to_high=production.sold_to_high_tier or 0,
+                sold_to_low=production.sold_to_low_tier or 0,
+                revenue=production.revenue or 0,
+                high_tier_customers=customer_flow.high_tier_customers,
+                low_tier_customers=customer_flow.low_tier_customers
+            ))
+
+        # Players that produced nothing still appear in the summary (one row without a product)
+        idle = Player.query.filter(
+            Player.game_id == game_id,
+            Player.is_active.is_(True),
+            Player.id.notin_(produced_by)
+        ).all()
+        for player in idle:
+            db.session.add(RoundSummary(
+                game_id=game_id,
+                round_number=round_number,
+                player_id=player.id,
+                nickname=player.nickname,
+                product_id=NO_PRODUCT,
+                product_name="",
+                high_tier_customers=customer_flow.high_tier_customers,
+                low_tier_customers=customer_flow.low_tier_customers
+            ))
+
+    @staticmethod
+    def _group_summary_rows(game_id: int, rows: List[RoundSummary]) -> List[Dict]:
+        """Group projection rows (ordered by round, player) into round summaries"""
+        rounds = []
+        current = None
+        players = {}
+
+        # Flows of persisted scenarios have a customer_flows row; computed flows have none
+        flow_ids = dict(db.session.query(CustomerFlow.round_number, CustomerFlow.id).filter(
+            CustomerFlow.game_id == game_id,
+            CustomerFlow.round_number.in_({row.round_number for row in rows})
+        ).all()) if rows else {}
+
+        for row in rows:
+            if current is None or current["round_number"] != row.round_number:
+                current = {
+                    "round_number": row.round_number,
+                    # Same shape as customer_flow.to_dict() in the live summary
+                    "customer_flow": {
+                        "id": flow_ids.get(row.round_number),
+                        "game_id": game_id,
+                        "round_number": row.round_number,
+                        "high_tier_customers": row.high_tier_customers,
+                        "low_tier_customers": row.low_tier_customers
+                    },
+                    "players": []
+                }
+                rounds.append(current)
+                players = {}
+
+            player = players.get(row.player_id)
+            if player is None:
+                player = {
+                    "player_id": row.player_id,
+                    "nickname": row.nickname,
+                    "productions": [],
+                    "total_revenue": 0.0,
+                    "total_sold": 0
+                }
+                players[row.player_id] = player
+                current["players"].append(player)
+
+            if row.product_id == NO_PRODUCT:
+                continue
+
+            revenue = float(row.revenue)
+            player["productions"].append({
+                "product_id": row.product_id,
+                "product_name": row.product_name,
+                "produced": row.produced,
+                "sold": row.sold,
+                "sold_to_high": row.sold_to_high,
+                "sold_to_low": row.sold_to_low,
+                "price": float(row.price) if row.price is not None else 0.0,
+                "revenue": revenue
+            })
+            player["total_revenue"] += revenue
+            player["total_sold"] += row.sold
+
+        return rounds
+
+    @staticmethod
+    def _build_live_summary(game_id: int, round_number: int) -> Dict:
+        """Build a round summary from the live tables (rounds without projection rows)"""
+        # Get customer flow
+        customer_flow = RoundService.generate_customer_flow(game_id, round_number)
 
         # Get all active players
-        players = Player.query.filter_by(game_id=game_id, is_active=True).all()
+        players = Player.query.filter_by(game_id=game_id, is_active=True).order_by(Player.id.asc()).all()
 
         player_summaries = []
         for player in players:
@@ -177,21 +333,23 @@ class RoundService:
                 round_number=round_number
             ).all()
 
-            total_revenue = sum(float(p.revenue) for p in productions)
-            total_sold = sum(p.sold_quantity for p in productions)
+            product_names = {product.id: product.recipe.name for product in player.products}
+            total_revenue = sum(float(p.revenue or 0) for p in productions)
+            total_sold = sum(p.sold_quantity or 0 for p in productions)
 
             player_summaries.append({
                 "player_id": player.id,
                 "nickname": player.nickname,
                 "productions": [
                     {
-                        "product_name": p.product_id,  # TODO: Get actual product name
-                        "produced": p.produced_quantity,
-                        "sold": p.sold_quantity,
-                        "sold_to_high": p.sold_to_high_tier,
-                        "sold_to_low": p.sold_to_low_tier,
-                        "price": float(p.price),
-                        "revenue": float(p.revenue)
+                        "product_id": p.product_id,
+                        "product_name": product_names.get(p.product_id, "Unknown"),
+                        "produced": p.produced_quantity or 0,
+                        "sold": p.sold_quantity or 0,
+                        "sold_to_high": p.sold_to_high_tier or 0,
+                        "sold_to_low": p.sold_to_low_tier or 0,
+                        "price": float(p.price) if p.price is not None else 0.0,
+                        "revenue": float(p.revenue or 0)
                     } for p in productions
                 ],
                 "total_revenue": total_revenue,
@@ -204,6 +362,27 @@ class RoundService:
             "players": player_summaries
         }
 
+    @staticmethod
+    def get_submission_progress(game_id: int, round_number: int) -> Dict:
+        """
+        Count active players that submitted a production plan for a round
+
+        Returns:
+            {"submitted": 1, "total": 2}
+        """
+        total = Player.query.filter_by(game_id=game_id, is_active=True).count()
+        submitted = db.session.query(
+            db.func.count(db.distinct(RoundProduction.player_id))
+        ).join(
+            Player, Player.id == RoundProduction.player_id
+        ).filter(
+            Player.game_id == game_id,
+            Player.is_active.is_(True),
+            RoundProduction.round_number == round_number
+        ).scalar()
+
+        return {"submitted": submitted or 0, "total": total}
+
     @staticmethod
     def _verify_all_players_submitted(game_id: int, round_number: int):
         """
@@ -243,31 +422,43 @@ class RoundService:
                 round_number=round_number
             ).all()
 
-            # Calculate total revenue
-            total_revenue = sum(float(p.revenue) for p in productions)
+            # Calculate total revenue (exact, in cents)
+            revenue_cents = sum(to_cents(p.revenue) for p in productions)
+            total_revenue = cents_to_float(revenue_cents)
 
             # Update player cash
-            player.cash += total_revenue
+            LedgerService.credit(player, from_cents(revenue_cents), REVENUE, round_number)
+
+            recipe_ids = {product.id: product.recipe_id for product in player.products}
+            EventService.record(player, 'round_settled', {
+                "revenue": total_revenue,
+                "sales": [
+                    {
+                        "product_id": p.product_id,
+                        "recipe_id": recipe_ids.get(p.product_id),
+                        "sold": p.sold_quantity or 0,
+                        "revenue": float(p.revenue)
+                    } for p in productions
+                ]
+            }, round_number=round_number)
 
-        db.session.commit()
+        db.session.flush()
 
     @staticmethod
-    def calculate_round_expenses(player_id: int, round_number: int) -> Dict[str, float]:
+    def calculate_round_expenses(player_id: int, round_number: int, totals: Dict[str, float] = None) -> Dict[str, float]:
         """
         Calculate all expenses for a player in a round
 
         Expenses include:
         - Rent (from shop)
-        - Salary (from employees)
-        - Materials (from production submissions)
-        - Decoration (if decorated this round)
-        - Market research (if performed)
-        - Advertisement (if performed)
-        - Product research (if performed)
+        - Salary (from the shop's payroll)
+        - Materials, decoration, market research, advertisement and product
+          research (cash actually paid this round, from the cash ledger)
 
         Args:
             player_id: Player ID
             round_number: Round number
+            totals: LedgerService.round_totals of the round, if already fetched
 
         Returns:
             {
@@ -281,64 +472,28 @@ class RoundService:
                 "total": 0.0
             }
         """
-        from app.models.finance import MarketAction, ResearchLog
-
         player = Player.query.get(player_id)
         if not player:
             raise ValueError(f"Player {player_id} not found")
 
-        expenses = {
-            "rent": 0.0,
-            "salary": 0.0,
-            "material": 0.0,
-            "decoration": 0.0,
-            "market_research": 0.0,
-            "advertisement": 0.0,
-            "product_research": 0.0
-        }
+        if totals is None:
+            totals = LedgerService.round_totals(player_id, round_number)
 
-        # 1. Rent expense
-        if player.shop:
-            expenses["rent"] = float(player.shop.rent) if player.shop.rent else 0.0
+        expenses = {"rent": 0.0, "salary": 0.0}
 
-        # 2. Salary expense
+        # 1. Recurring charges of the shop
         if player.shop:
-            employees = Employee.query.filter_by(
-                shop_id=player.shop.id,
-                is_active=True
-            ).all()
-            expenses["salary"] = sum(float(emp.salary) for emp in employees)
-
-        # 3. Material expense (already deducted during production submission)
-        # We need to track this separately
-        # For now, this will be 0 as material costs are deducted immediately
-        expenses["material"] = 0.0
-
-        # 4. Market actions (advertisement, market research)
-        market_actions = MarketAction.query.filter_by(
-            player_id=player_id,
-            round_number=round_number
-        ).all()
-
-        for action in market_actions:
-            if action.action_type == 'ad':
-                expenses["advertisement"] += float(action.cost)
-            elif action.action_type == 'research':
-                expenses["market_research"] += float(action.cost)
-
-        # 5. Product research
-        research_logs = ResearchLog.query.filter_by(
-            player_id=player_id,
-            round_number=round_number
-        ).all()
+            expenses["rent"] = float(player.shop.rent) if player.shop.rent else 0.0
+            expenses["salary"] = float(player.shop.total_salary or 0)
 
-        expenses["product_research"] = sum(float(r.cost) for r in research_logs)
+        # 2. Cash paid this round (ledger debits are negative)
+        for category in EXPENSE_CATEGORIES:
+            expenses[category] = 0.0 - totals.get(category, 0.0)
 
         # Calculate total
-        expenses["total"] = sum(expenses.values())
+        expenses["total"] = round(sum(expenses.values()), 2)
 
         return expenses
 
-
 # Export
-__all__ = ['RoundService']
+__all__ = ['RoundService', 'NO_PRODUCT']
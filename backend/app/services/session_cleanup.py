@@ -5,8 +5,10 @@ import threading
 import time
 from datetime import datetime, timedelta
 from app.core.database import db
+from app.core.metrics import CLEANUP_DURATION, CLEANUP_ROWS_REMOVED
 from app.models.player import Player
 from app.models.game import Game
+from app.services.leaderboard_service import LeaderboardService
 
 
 def _cleanup_once(inactive_seconds: int = 300):
@@ -20,19 +22,28 @@ def _cleanup_once(inactive_seconds: int = 300):
         return
 
     affected_game_ids = set()
+    finished_affected = any(player.game and player.game.status == 'finished' for player in inactive_players)
     for player in inactive_players:
         affected_game_ids.add(player.game_id)
         db.session.delete(player)
 
     db.session.commit()
+    CLEANUP_ROWS_REMOVED.inc(len(inactive_players), table='players')
 
     # 删除已空房间
+    removed_games = 0
     for game_id in affected_game_ids:
         if Player.query.filter_by(game_id=game_id).count() == 0:
             game = Game.query.get(game_id)
             if game:
                 db.session.delete(game)
+                removed_games += 1
     db.session.commit()
+    CLEANUP_ROWS_REMOVED.inc(removed_games, table='games')
+
+    # 已结束游戏的玩家被移除后，全局排行榜在下次读取时重建
+    if finished_affected:
+        LeaderboardService.invalidate_global()
 
 
 def start_inactive_player_cleanup(app, interval_seconds: int = 60, inactive_seconds: int = 300):
@@ -45,7 +56,7 @@ def start_inactive_player_cleanup(app, interval_seconds: int = 60, inactive_seco
 
     def worker():
         while True:
-            with app.app_context():
+            with app.app_context(), CLEANUP_DURATION.time():
                 _cleanup_once(inactive_seconds=inactive_seconds)
             time.sleep(interval_seconds)
 
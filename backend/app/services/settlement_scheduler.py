@@ -0,0 +1,213 @@
+"""
+回合结算调度
+最后一名玩家提交生产计划后把结算作为 settle_round 任务放入后台任务队列，提交接口立即返回；
+可选的截止时间到达后，对未提交的玩家按空计划强制结算。
+结算状态来自 jobs 表，客户端通过 /api/v1/rounds/<game_id>/settlement-status 轮询（支持长轮询），
+请求落在哪个进程都能看到同样的进度。
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from app.core.database import db
+from app.models.event import GameEvent
+from app.models.game import Game
+from app.models.job import Job
+from app.services.event_service import SETTLEMENT_EVENT
+from app.services.job_service import JobService
+from app.services.round_service import RoundService
+from app.services.settlement_service import SettlementService
+
+logger = logging.getLogger(__name__)
+
+_scheduler = None
+
+# 长轮询时查询结算进度的间隔（秒）
+WAIT_POLL_SECONDS = 0.5
+
+# 任务状态 -> 结算状态
+_JOB_STATES = {'queued': 'queued', 'running': 'running', 'succeeded': 'settled', 'failed': 'failed'}
+
+
+def settlement_job_key(game_id: int, round_number: int, deadline: bool = False) -> str:
+    """
+    结算任务的幂等键
+
+    每个回合一个普通结算任务（提前结算、全员提交后的自动结算共用），
+    截止时间强制结算（allow_missing）单独一个，不会被失败的普通任务挡住。
+    """
+    key = f"settle_round:{game_id}:{round_number}"
+    return f"{key}:deadline" if deadline else key
+
+
+def _round_job_keys(game_id: int, round_number: int):
+    return [settlement_job_key(game_id, round_number), settlement_job_key(game_id, round_number, deadline=True)]
+
+
+class SettlementScheduler:
+    """自动结算调度器"""
+
+    def __init__(self, app, auto_advance: bool = False, deadline_seconds: int = 0):
+        self.app = app
+        self.auto_advance = auto_advance
+        self.deadline_seconds = deadline_seconds
+
+    def notify_submission(self, game_id: int, round_number: int) -> bool:
+        """
+        生产计划提交后调用：所有在场玩家都已提交时排队结算
+
+        Returns:
+            是否排队了结算任务
+        """
+        if not self.auto_advance:
+            return False
+
+        progress = RoundService.get_submission_progress(game_id, round_number)
+        if progress["total"] == 0 or progress["submitted"] < progress["total"]:
+            return False
+
+        return self.enqueue(game_id, round_number) is not None
+
+    def enqueue(self, game_id: int, round_number: int, allow_missing: bool = False) -> Job:
+        """
+        把结算放入后台任务队列
+
+        同一回合重复排队返回已有任务，已失败的任务重新排队（例如提前结算因有人未提交而失败，
+        最后一名玩家提交后再次排队）；执行出错按 JOB_MAX_ATTEMPTS 退避重试，
+        可通过 GET /api/v1/jobs/<id> 查看。
+        """
+        return JobService.enqueue(
+            'settle_round',
+            {"game_id": game_id, "round_number": round_number, "allow_missing": allow_missing},
+            idempotency_key=settlement_job_key(game_id, round_number, deadline=allow_missing)
+        )
+
+    def get_status(self, game: Game) -> Optional[Dict]:
+        """当前回合（或刚结算的上一回合）的结算任务状态"""
+        keys = _round_job_keys(game.id, game.current_round)
+        if game.current_round > 1:
+            keys += _round_job_keys(game.id, game.current_round - 1)
+
+        job = Job.query.filter(Job.idempotency_key.in_(keys)).order_by(Job.id.desc()).first()
+        if job is None:
+            return None
+
+        return {
+            "job_id": job.id,
+            "round": job.payload.get("round_number"),
+            "state": _JOB_STATES.get(job.status, job.status),
+            "error": job.error,
+            "updated_at": (job.finished_at or job.locked_at or job.created_at).isoformat()
+        }
+
+    def wait_for_settlement(self, game_id: int, round_number: int, timeout: float) -> bool:
+        """
+        长轮询：等待到该回合已结算或超时
+
+        每 WAIT_POLL_SECONDS 秒从数据库确认一次，结算由哪个进程完成都能看到；
+        该回合最新的结算任务最终失败时立即返回。
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            # 结束当前事务，读取其他连接提交的最新回合
+            db.session.rollback()
+            current_round = db.session.query(Game.current_round).filter_by(id=game_id).scalar()
+            if current_round is None or current_round > round_number:
+                return current_round is not None
+
+            latest = db.session.query(Job.status).filter(
+                Job.idempotency_key.in_(_round_job_keys(game_id, round_number))
+            ).order_by(Job.id.desc()).first()
+            remaining = deadline - time.monotonic()
+            if (latest and latest.status == 'failed') or remaining <= 0:
+                return False
+
+            time.sleep(min(remaining, WAIT_POLL_SECONDS))
+
+    def round_started_at(self, game: Game):
+        """当前回合的开始时间：第1回合取开局时间，其余取上一回合结算完成时间"""
+        if game.current_round <= 1:
+            return game.started_at
+
+        settled_at = SettlementService.get_settled_at(game.id, game.current_round - 1)
+        return settled_at or game.started_at
+
+    def check_deadlines(self):
+        """
+        对超过截止时间的回合强制结算
+
+        强制结算使用单独的幂等键，普通结算任务失败不影响。已有强制结算任务的回合不再排队：
+        出错的任务由任务队列按 JOB_MAX_ATTEMPTS 退避重试，最终失败后保持 failed 状态，
+        不会在每次检查时（或在每个运行检查线程的进程里）重新排队。
+        """
+        games = Game.query.filter_by(status='in_progress').all()
+        if not games:
+            return
+
+        # 一次查询取出各游戏上一回合的结算时间
+        settled_at = dict(db.session.query(
+            GameEvent.game_id, db.func.max(GameEvent.created_at)
+        ).filter(
+            GameEvent.game_id.in_([game.id for game in games]),
+            GameEvent.player_id.is_(None),
+            GameEvent.event_type == SETTLEMENT_EVENT
+        ).group_by(GameEvent.game_id).all())
+
+        threshold = datetime.utcnow() - timedelta(seconds=self.deadline_seconds)
+        overdue = []
+        for game in games:
+            started_at = settled_at.get(game.id) if game.current_round > 1 else None
+            started_at = started_at or game.started_at
+            if started_at and started_at < threshold:
+                overdue.append(game)
+        if not overdue:
+            return
+
+        keys = {settlement_job_key(game.id, game.current_round, deadline=True): game for game in overdue}
+        queued = {key for (key,) in db.session.query(Job.idempotency_key).filter(
+            Job.idempotency_key.in_(list(keys))
+        ).all()}
+
+        for key, game in keys.items():
+            if key in queued:
+                continue
+            logger.info("Round %s of game %s passed its deadline, force settling", game.current_round, game.id)
+            self.enqueue(game.id, game.current_round, allow_missing=True)
+
+    def start_deadline_watcher(self, interval_seconds: int):
+        """启动后台线程定时检查截止时间"""
+
+        def worker():
+            while True:
+                time.sleep(interval_seconds)
+                try:
+                    with self.app.app_context():
+                        self.check_deadlines()
+                except Exception as e:
+                    logger.error("Settlement deadline check failed: %s", e)
+
+        thread = threading.Thread(target=worker, daemon=True, name="settlement-deadline-watcher")
+        thread.start()
+
+
+def get_scheduler():
+    """当前应用的结算调度器（未初始化时为 None）"""
+    return _scheduler
+
+
+def init_settlement_scheduler(app, start_watcher: bool = True):
+    """创建结算调度器，并在配置了截止时间且 start_watcher 为真时启动检查线程"""
+    global _scheduler
+
+    _scheduler = SettlementScheduler(
+        app,
+        auto_advance=app.config.get('SETTLEMENT_AUTO_ADVANCE', False),
+        deadline_seconds=app.config.get('SETTLEMENT_DEADLINE_SECONDS', 0)
+    )
+
+    if start_watcher and _scheduler.deadline_seconds > 0:
+        interval = max(1, min(10, _scheduler.deadline_seconds // 4))
+        _scheduler.start_deadline_watcher(interval)
+
+    return _scheduler
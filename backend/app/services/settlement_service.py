@@ -0,0 +1,274 @@
+"""
+Settlement service
+Serializes round settlement per game and makes it idempotent: a caller
+that asks to settle a round that is already settled gets the stored result
+"""
+import contextlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+from flask import current_app
+from sqlalchemy import text
+from app.core.database import db, atomic
+from app.models.event import GameEvent
+from app.models.game import Game, RoundSummary
+from app.models.player import Player
+from app.services.event_service import EventService, SETTLEMENT_EVENT
+from app.services.finance_service import FinanceService
+from app.services.flow_provider import FlowProvider
+from app.services.job_service import JobService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.round_service import RoundService, NO_PRODUCT
+
+logger = logging.getLogger(__name__)
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _process_lock(game_id: int) -> threading.Lock:
+    with _locks_guard:
+        lock = _locks.get(game_id)
+        if lock is None:
+            lock = threading.Lock()
+            _locks[game_id] = lock
+        return lock
+
+
+@contextlib.contextmanager
+def settlement_lock(game_id: int):
+    """
+    Hold the settlement lock of a game
+
+    Threads of this process queue on a per-game lock. On MySQL a named
+    advisory lock (GET_LOCK) on a dedicated connection also serializes
+    other processes before they open their settlement transaction.
+
+    Raises:
+        ValueError: If the lock cannot be acquired within SETTLEMENT_LOCK_TIMEOUT seconds
+    """
+    timeout = current_app.config.get('SETTLEMENT_LOCK_TIMEOUT', 30)
+    lock = _process_lock(game_id)
+    if not lock.acquire(timeout=timeout):
+        raise ValueError(f"Round settlement for game {game_id} is already in progress")
+
+    conn = None
+    try:
+        if db.engine.dialect.name == 'mysql':
+            conn = db.engine.connect()
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": f"naicha:settle:{game_id}", "timeout": timeout}
+            ).scalar()
+            if acquired != 1:
+                raise ValueError(f"Round settlement for game {game_id} is already in progress")
+        yield
+    finally:
+        if conn is not None:
+            try:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": f"naicha:settle:{game_id}"})
+            finally:
+                conn.close()
+        lock.release()
+
+
+class SettlementService:
+    """Round settlement service"""
+
+    @staticmethod
+    def settle_round(game_id: int, expected_round: Optional[int] = None, allow_missing: bool = False) -> Dict:
+        """
+        Settle a round exactly once
+
+        Process:
+        1. Take the per-game settlement lock
+        2. Re-read the game row (SELECT ... FOR UPDATE)
+        3. If expected_round is already settled, return its stored result
+        4. Otherwise advance the round, generate finance records
+           and snapshot player state
+        5. Store the result for later callers
+        6. Update leaderboards and drop cached finance series
+
+        Steps 4 and 5 commit as a single transaction; step 6 runs only
+        after it commits.
+
+        Args:
+            game_id: Game ID
+            expected_round: Round the caller wants to settle (defaults to the current round)
+            allow_missing: Settle even if some players have not submitted (deadline expiry)
+
+        Returns:
+            Same shape as RoundService.advance_round
+
+        Raises:
+            ValueError: Various validation errors
+        """
+        with settlement_lock(game_id):
+            # Discard anything read before the lock was taken
+            db.session.rollback()
+
+            game = Game.query.filter_by(id=game_id).with_for_update().populate_existing().first()
+            if not game:
+                raise ValueError(f"Game {game_id} not found")
+
+            if expected_round is None:
+                expected_round = game.current_round
+
+            if expected_round > game.current_round:
+                raise ValueError(
+                    f"Round {expected_round} has not started yet (current round: {game.current_round})"
+                )
+
+            if expected_round < game.current_round:
+                db.session.rollback()
+                return SettlementService.get_settlement_result(game_id, expected_round)
+
+            # One transaction: a failure anywhere leaves the round unsettled and
+            # a retry starts from scratch (revenue is never credited twice)
+            with atomic():
+                result = RoundService.advance_round(game_id, allow_missing)
+                previous_round = result["previous_round"]
+
+                for player in Player.query.filter_by(game_id=game_id, is_active=True).all():
+                    FinanceService.generate_finance_record(player.id, previous_round)
+                EventService.snapshot_game_if_due(game_id, previous_round)
+
+                if result["game_finished"]:
+                    JobService.enqueue('game_report', {"game_id": game_id},
+                                       idempotency_key=f"game_report:{game_id}", commit=False)
+
+                db.session.add(GameEvent(
+                    game_id=game_id,
+                    player_id=None,
+                    round_number=previous_round,
+                    event_type=SETTLEMENT_EVENT,
+                    payload=result
+                ))
+
+            # Leaderboards and cached series only ever hold committed results
+            game = Game.query.get(game_id)
+            LeaderboardService.refresh_game(game)
+            FinanceService.invalidate_series(game_id)
+            if result["game_finished"]:
+                LeaderboardService.record_finished_game(game)
+
+            return result
+
+    @staticmethod
+    def get_settlement_result(game_id: int, round_number: int) -> Dict:
+        """
+        Get the result of an already settled round
+
+        Read-only: uses the stored settlement result, or rebuilds it from the
+        round_summaries projection for rounds settled before results were stored.
+
+        Args:
+            game_id: Game ID
+            round_number: Settled round number
+
+        Returns:
+            Same shape as RoundService.advance_round
+        """
+        stored = GameEvent.query.filter_by(
+            game_id=game_id,
+            player_id=None,
+            round_number=round_number,
+            event_type=SETTLEMENT_EVENT
+        ).first()
+
+        if stored:
+            return stored.payload
+
+        logger.warning("No stored settlement result for game %s round %s, rebuilding", game_id, round_number)
+        return SettlementService._rebuild_result(game_id, round_number)
+
+    @staticmethod
+    def get_settled_at(game_id: int, round_number: int) -> Optional[datetime]:
+        """
+        Time a round's settlement was written
+
+        Returns:
+            UTC datetime, or None if the round has no stored settlement result
+        """
+        return db.session.query(GameEvent.created_at).filter_by(
+            game_id=game_id,
+            player_id=None,
+            round_number=round_number,
+            event_type=SETTLEMENT_EVENT
+        ).scalar()
+
+    @staticmethod
+    def generate_finance_records(game_id: int, round_number: int) -> Dict:
+        """
+        Generate missing finance records of every active player for a settled round
+
+        Used to backfill rounds outside of settle_round (which generates them in
+        its own transaction). A failure for one player is logged and does not
+        stop the others.
+
+        Returns:
+            {"game_id": 1, "round_number": 1, "generated": [1, 2], "failed": []}
+        """
+        players = Player.query.filter_by(game_id=game_id, is_active=True).all()
+        player_ids = [player.id for player in players]
+
+        generated, failed = [], []
+        for player_id in player_ids:
+            try:
+                FinanceService.generate_finance_record(player_id, round_number)
+                generated.append(player_id)
+            except Exception as e:
+                # Log error but continue
+                db.session.rollback()
+                failed.append(player_id)
+                logger.error("Error generating finance record for player %s: %s", player_id, e)
+
+        return {
+            "game_id": game_id,
+            "round_number": round_number,
+            "generated": generated,
+            "failed": failed
+        }
+
+    @staticmethod
+    def _rebuild_result(game_id: int, round_number: int) -> Dict:
+        """Rebuild an advance_round result from the settled round's projection"""
+        game = Game.query.get(game_id)
+        customer_flow = FlowProvider.get_flow(game, round_number)
+
+        rows = RoundSummary.query.filter(
+            RoundSummary.game_id == game_id,
+            RoundSummary.round_number == round_number,
+            RoundSummary.product_id != NO_PRODUCT
+        ).order_by(RoundSummary.id.asc()).all()
+
+        sales_details = [
+            {
+                "player_id": row.player_id,
+                "player_name": row.nickname,
+                "product_name": row.product_name,
+                "price": float(row.price) if row.price is not None else 0.0,
+                "available": row.produced - row.sold,
+                "sold_high": row.sold_to_high,
+                "sold_low": row.sold_to_low
+            } for row in rows
+        ]
+
+        return {
+            "success": True,
+            "previous_round": round_number,
+            "current_round": round_number + 1,
+            "customer_flow": customer_flow.to_dict(),
+            "allocation_result": {
+                "high_tier_served": sum(row.sold_to_high for row in rows),
+                "low_tier_served": sum(row.sold_to_low for row in rows),
+                "total_revenue": sum(float(row.revenue) for row in rows),
+                "sales_details": sales_details
+            },
+            "game_finished": game.status == 'finished' and game.current_round == round_number + 1
+        }
+
+
+# Export
+__all__ = ['SettlementService', 'settlement_lock']
@@ -3,8 +3,10 @@ Shop service
 Handles shop opening, decoration, and management
 """
 from typing import Dict
-from app.core.database import db
+from app.core.database import db, retry_on_conflict
 from app.models.player import Player, Shop
+from app.services.event_service import EventService
+from app.services.ledger_service import LedgerService, DECORATION
 from app.utils.game_constants import GameConstants
 
 
@@ -51,11 +53,16 @@ class ShopService:
         )
 
         db.session.add(shop)
+        EventService.record(player, 'shop_opened', {
+            "location": location,
+            "rent": float(rent)
+        }, round_number=round_number)
         db.session.commit()
 
         return shop
 
     @staticmethod
+    @retry_on_conflict
     def upgrade_decoration(player_id: int, target_level: int) -> Dict:
         """
         Upgrade shop decoration level
@@ -111,13 +118,19 @@ class ShopService:
             )
 
         # Deduct cost
-        player.cash -= cost
+        LedgerService.debit(player, cost, DECORATION)
 
         # Update decoration
         previous_level = current_level
         player.shop.decoration_level = target_level
         player.shop.max_employees = GameConstants.MAX_EMPLOYEES.get(target_level, 0)
 
+        EventService.record(player, 'decoration_upgraded', {
+            "previous_level": previous_level,
+            "level": target_level,
+            "max_employees": player.shop.max_employees,
+            "cost": float(cost)
+        })
         db.session.commit()
 
         # Return the updated shop info
@@ -152,10 +165,6 @@ class ShopService:
             is_active=True
         ).all()
 
-        # Calculate total productivity and salary
-        total_productivity = sum(emp.productivity for emp in employees)
-        total_salary = sum(float(emp.salary) for emp in employees)
-
         return {
             "id": player.shop.id,
             "player_id": player_id,
@@ -165,10 +174,10 @@ class ShopService:
             "max_employees": player.shop.max_employees,
             "created_round": player.shop.created_round,
             "employees": {
-                "count": len(employees),
+                "count": player.shop.active_employee_count or 0,
                 "max": player.shop.max_employees,
-                "total_productivity": total_productivity,
-                "total_salary": total_salary,
+                "total_productivity": player.shop.total_productivity or 0,
+                "total_salary": float(player.shop.total_salary or 0),
                 "list": [emp.to_dict() for emp in employees]
             }
         }
@@ -216,6 +225,7 @@ class ShopService:
 
         # Delete shop (cascade will delete employees)
         db.session.delete(player.shop)
+        EventService.record(player, 'shop_closed')
         db.session.commit()
 
         return {
@@ -0,0 +1,287 @@
+"""
+Turn service
+Applies a player's whole turn (shop, staff, research, marketing and the
+production plan) from one request: every action is checked against an
+in-memory snapshot of the player first, then all of them run through the
+regular services inside a single transaction.
+"""
+from typing import Dict, List
+from app.core.database import atomic, retry_on_conflict
+from app.models.game import Game
+from app.models.player import Player
+from app.models.product import PlayerProduct
+from app.services.calculation_engine import DiscountCalculator
+from app.services.employee_service import EmployeeService
+from app.services.market_service import MarketService
+from app.services.product_service import ProductService
+from app.services.production_service import ProductionService
+from app.services.shop_service import ShopService
+from app.utils.game_constants import GameConstants
+from app.utils.money import to_cents, cents_to_float
+
+# Supported action types; each has a _check_<type> and an _apply_<type>
+ACTION_TYPES = (
+    'open_shop', 'upgrade_decoration', 'hire_employee', 'research_product',
+    'advertisement', 'market_research', 'submit_production'
+)
+
+# Upper bound on actions in one turn
+MAX_TURN_ACTIONS = 50
+
+
+class TurnService:
+    """Batched turn service"""
+
+    @staticmethod
+    @retry_on_conflict
+    def execute_turn(player_id: int, actions: List[Dict]) -> Dict:
+        """
+        Validate and apply an ordered list of actions for the game's current round
+
+        Actions (applied in order, each may rely on the ones before it):
+            {"type": "open_shop", "location": "A", "rent": 500}
+            {"type": "upgrade_decoration", "target_level": 1}
+            {"type": "hire_employee", "name": "Tom", "salary": 1000, "productivity": 60}
+            {"type": "research_product", "recipe_id": 1, "dice_result": 5}
+            {"type": "advertisement", "dice_result": 4}
+            {"type": "market_research"}
+            {"type": "submit_production", "productions": [
+                {"product_id": 3, "productivity": 40, "price": 15},
+                {"recipe_id": 2, "productivity": 20, "price": 20}  // product unlocked earlier in this turn
+            ]}
+
+        Args:
+            player_id: Player ID
+            actions: Ordered action list
+
+        Returns:
+            {"success": True, "round_number": 1, "results": [{"index": 0, "type": "open_shop", "result": {...}}, ...],
+             "cash": 8400.0, "plan_submitted": True}
+            or, when any action fails validation (nothing is applied):
+            {"success": False, "round_number": 1, "errors": [{"index": 2, "type": "hire_employee", "error": "..."}]}
+
+        Raises:
+            ValueError: If the player/game cannot take a turn, or an action fails while being applied
+                (the whole turn is rolled back)
+        """
+        if not isinstance(actions, list) or not actions:
+            raise ValueError("actions must be a non-empty list")
+        if len(actions) > MAX_TURN_ACTIONS:
+            raise ValueError(f"A turn can have at most {MAX_TURN_ACTIONS} actions")
+
+        player = Player.query.get(player_id)
+        if not player:
+            raise ValueError(f"Player {player_id} not found")
+        if not player.is_active:
+            raise ValueError("Player is not active")
+
+        game = Game.query.get(player.game_id)
+        if not game or game.status != 'in_progress':
+            raise ValueError("Game is not in progress")
+        round_number = game.current_round
+
+        errors = TurnService.validate_turn(player, actions)
+        if errors:
+            return {"success": False, "round_number": round_number, "errors": errors}
+
+        results = []
+        with atomic():
+            for index, action in enumerate(actions):
+                try:
+                    apply = getattr(TurnService, f"_apply_{action['type']}")
+                    result = apply(player_id, round_number, action)
+                except ValueError as e:
+                    raise ValueError(f"Action {index} ({action['type']}) failed: {e}")
+                results.append({"index": index, "type": action['type'], "result": result})
+
+        return {
+            "success": True,
+            "round_number": round_number,
+            "results": results,
+            "cash": float(player.cash),
+            "plan_submitted": any(action['type'] == 'submit_production' for action in actions)
+        }
+
+    @staticmethod
+    def validate_turn(player: Player, actions: List[Dict]) -> List[Dict]:
+        """
+        Check every action against one in-memory snapshot of the player
+
+        Each valid action updates the snapshot (cash, shop, staff, unlocked
+        recipes) so later actions are checked against the state they will see.
+
+        Returns:
+            [{"index": 2, "type": "hire_employee", "error": "..."}] (empty when all actions are valid)
+        """
+        shop = player.shop
+        products = {product.id: product.recipe_id for product in player.products if product.is_unlocked}
+        snapshot = {
+            "cash": to_cents(player.cash),
+            "has_shop": shop is not None,
+            "decoration_level": shop.decoration_level if shop else 0,
+            "max_employees": shop.max_employees if shop else 0,
+            "employees": (shop.active_employee_count or 0) if shop else 0,
+            "productivity": (shop.total_productivity or 0) if shop else 0,
+            "products": products,
+            "unlocked": set(products.values()),
+            "catalog": {recipe["recipe_id"]: recipe for recipe in ProductService.get_recipe_catalog()},
+            "plan_submitted": False
+        }
+
+        errors = []
+        for index, action in enumerate(actions):
+            action_type = action.get('type') if isinstance(action, dict) else None
+            try:
+                if action_type not in ACTION_TYPES:
+                    raise ValueError(f"Unknown action type: {action_type}")
+                getattr(TurnService, f"_check_{action_type}")(snapshot, action)
+            except (ValueError, TypeError, KeyError) as e:
+                errors.append({"index": index, "type": action_type, "error": str(e)})
+
+        return errors
+
+    @staticmethod
+    def _spend(snapshot: Dict, amount):
+        cost = to_cents(amount)
+        if cost > snapshot["cash"]:
+            raise ValueError(
+                f"Insufficient cash! Need {cents_to_float(cost)}, have {cents_to_float(snapshot['cash'])}"
+            )
+        snapshot["cash"] -= cost
+
+    @staticmethod
+    def _check_open_shop(snapshot: Dict, action: Dict):
+        if snapshot["has_shop"]:
+            raise ValueError("Player already has a shop")
+        if not action.get('location'):
+            raise ValueError("location is required")
+        rent = action.get('rent')
+        if not isinstance(rent, (int, float)) or rent <= 0:
+            raise ValueError("Rent must be positive")
+        snapshot.update(has_shop=True, decoration_level=0, max_employees=0)
+
+    @staticmethod
+    def _check_upgrade_decoration(snapshot: Dict, action: Dict):
+        if not snapshot["has_shop"]:
+            raise ValueError("Player doesn't have a shop yet")
+        level = action.get('target_level')
+        if level not in GameConstants.DECORATION_COSTS:
+            raise ValueError("Decoration level must be 1, 2, or 3")
+        if level <= snapshot["decoration_level"]:
+            raise ValueError(f"Cannot downgrade decoration. Current level: {snapshot['decoration_level']}")
+        TurnService._spend(snapshot, GameConstants.DECORATION_COSTS[level])
+        snapshot["decoration_level"] = level
+        snapshot["max_employees"] = GameConstants.MAX_EMPLOYEES.get(level, 0)
+
+    @staticmethod
+    def _check_hire_employee(snapshot: Dict, action: Dict):
+        if not snapshot["has_shop"]:
+            raise ValueError("Player must have a shop before hiring employees")
+        if snapshot["employees"] >= snapshot["max_employees"]:
+            raise ValueError(f"Shop has reached maximum employees ({snapshot['max_employees']})")
+        if not action.get('name'):
+            raise ValueError("name is required")
+        salary, productivity = action.get('salary'), action.get('productivity')
+        if not isinstance(salary, (int, float)) or salary <= 0:
+            raise ValueError("Salary must be positive")
+        if not isinstance(productivity, int) or productivity <= 0:
+            raise ValueError("Productivity must be positive")
+        TurnService._spend(snapshot, salary)
+        snapshot["employees"] += 1
+        snapshot["productivity"] += productivity
+
+    @staticmethod
+    def _check_research_product(snapshot: Dict, action: Dict):
+        recipe = snapshot["catalog"].get(action.get('recipe_id'))
+        if recipe is None:
+            raise ValueError(f"Product recipe {action.get('recipe_id')} not found")
+        dice_result = action.get('dice_result')
+        if not isinstance(dice_result, int) or not 1 <= dice_result <= 6:
+            raise ValueError(f"Invalid dice result: {dice_result}. Must be between 1 and 6")
+        if recipe["recipe_id"] in snapshot["unlocked"]:
+            raise ValueError(f"Product '{recipe['name']}' is already unlocked")
+        TurnService._spend(snapshot, GameConstants.PRODUCT_RESEARCH_COST)
+        if dice_result >= ProductService.required_roll(recipe["difficulty"]):
+            snapshot["unlocked"].add(recipe["recipe_id"])
+
+    @staticmethod
+    def _check_advertisement(snapshot: Dict, action: Dict):
+        dice_result = action.get('dice_result')
+        if not isinstance(dice_result, int) or not 1 <= dice_result <= 6:
+            raise ValueError(f"Invalid dice result: {dice_result}. Must be between 1 and 6")
+        TurnService._spend(snapshot, GameConstants.ADVERTISEMENT_COST)
+
+    @staticmethod
+    def _check_market_research(snapshot: Dict, action: Dict):
+        TurnService._spend(snapshot, GameConstants.MARKET_RESEARCH_COST)
+
+    @staticmethod
+    def _check_submit_production(snapshot: Dict, action: Dict):
+        if snapshot["plan_submitted"]:
+            raise ValueError("A turn can submit only one production plan")
+        productions = action.get('productions')
+        if not isinstance(productions, list):
+            raise ValueError("productions must be a list")
+
+        needs = {"tea": 0, "milk": 0, "fruit": 0, "ingredient": 0}
+        for prod_data in productions:
+            if prod_data['productivity'] <= 0:
+                continue
+            recipe_id = prod_data.get('recipe_id')
+            if recipe_id is None:
+                recipe_id = snapshot["products"].get(prod_data.get('product_id'))
+            if recipe_id not in snapshot["unlocked"]:
+                raise ValueError(f"Product {prod_data.get('product_id', recipe_id)} is not unlocked")
+            for material, amount_per_unit in snapshot["catalog"][recipe_id]["recipe_json"].items():
+                if material in needs:
+                    needs[material] += amount_per_unit * prod_data['productivity']
+
+        ProductionService._validate_productivity_allocation(productions, snapshot["productivity"])
+        ProductionService._validate_pricing(productions)
+        TurnService._spend(snapshot, DiscountCalculator.calculate_material_costs(needs)["total_cost"])
+        snapshot["plan_submitted"] = True
+
+    @staticmethod
+    def _apply_open_shop(player_id: int, round_number: int, action: Dict) -> Dict:
+        return ShopService.open_shop(player_id, action['location'], action['rent'], round_number).to_dict()
+
+    @staticmethod
+    def _apply_upgrade_decoration(player_id: int, round_number: int, action: Dict) -> Dict:
+        return ShopService.upgrade_decoration(player_id, action['target_level'])
+
+    @staticmethod
+    def _apply_hire_employee(player_id: int, round_number: int, action: Dict) -> Dict:
+        return EmployeeService.hire_employee(
+            player_id, action['name'], action['salary'], action['productivity'], round_number
+        ).to_dict()
+
+    @staticmethod
+    def _apply_research_product(player_id: int, round_number: int, action: Dict) -> Dict:
+        return ProductService.research_product(player_id, action['recipe_id'], round_number, action['dice_result'])
+
+    @staticmethod
+    def _apply_advertisement(player_id: int, round_number: int, action: Dict) -> Dict:
+        return MarketService.place_advertisement(player_id, round_number, action['dice_result'])
+
+    @staticmethod
+    def _apply_market_research(player_id: int, round_number: int, action: Dict) -> Dict:
+        return MarketService.conduct_market_research(player_id, round_number)
+
+    @staticmethod
+    def _apply_submit_production(player_id: int, round_number: int, action: Dict) -> Dict:
+        # Plans may name a recipe unlocked earlier in this turn; its PlayerProduct id exists only now
+        productions = []
+        for prod_data in action['productions']:
+            if prod_data.get('product_id') is None:
+                product = PlayerProduct.query.filter_by(
+                    player_id=player_id,
+                    recipe_id=prod_data.get('recipe_id')
+                ).first()
+                prod_data = {**prod_data, "product_id": product.id if product else None}
+            productions.append(prod_data)
+
+        return ProductionService.submit_production_plan(player_id, round_number, productions)
+
+
+# Export
+__all__ = ['TurnService', 'ACTION_TYPES', 'MAX_TURN_ACTIONS']
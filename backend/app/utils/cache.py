@@ -0,0 +1,68 @@
+"""
+进程内缓存
+带过期时间和容量上限的 LRU 缓存，命中率通过 naicha_cache_requests_total 指标暴露
+缓存值为 JSON 类数据（dict / list），读取时返回深拷贝，调用方修改结果不会影响缓存
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from app.core.metrics import record_cache_access
+
+
+class LocalCache:
+    """线程安全的 TTL + LRU 缓存"""
+
+    def __init__(self, name: str, ttl_seconds: float = 300, maxsize: int = 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        """读取缓存，过期或不存在时返回 default"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                record_cache_access(self.name, True)
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._data[key]
+
+        record_cache_access(self.name, False)
+        return default
+
+    def set(self, key, value, ttl_seconds: float = None):
+        """写入缓存"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader, ttl_seconds: float = None):
+        """未命中时调用 loader() 计算并写入缓存"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = loader()
+            self.set(key, value, ttl_seconds)
+            value = copy.deepcopy(value)
+        return value
+
+    def invalidate(self, predicate):
+        """删除 predicate(key) 为真的所有条目"""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+__all__ = ['LocalCache']
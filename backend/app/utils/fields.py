@@ -0,0 +1,60 @@
+"""
+Sparse fieldsets
+Lets clients trim response payloads with ?fields=a,b.c,b.d
+"""
+from typing import Any, Dict, Optional
+from flask import request
+
+
+def parse_fields(value: Optional[str]) -> Optional[Dict]:
+    """
+    Parse a fields parameter into a selection tree
+
+    "round_number,players.player_id,players.total_revenue" ->
+    {"round_number": {}, "players": {"player_id": {}, "total_revenue": {}}}
+
+    An empty subtree keeps the whole value. Returns None when no fields are given.
+    """
+    if not value:
+        return None
+
+    tree = {}
+    for path in value.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return tree or None
+
+
+def select_fields(data: Any, tree: Optional[Dict]) -> Any:
+    """
+    Keep only the selected keys; lists are filtered element by element
+
+    Args:
+        data: Response payload (dict / list / scalar)
+        tree: Selection tree from parse_fields (None keeps everything)
+    """
+    if not tree:
+        return data
+
+    if isinstance(data, list):
+        return [select_fields(item, tree) for item in data]
+
+    if isinstance(data, dict):
+        return {
+            key: select_fields(data[key], subtree)
+            for key, subtree in tree.items() if key in data
+        }
+
+    return data
+
+
+def sparse_fields(data: Any) -> Any:
+    """Apply the current request's ?fields= parameter to a payload"""
+    return select_fields(data, parse_fields(request.args.get('fields')))
+
+
+__all__ = ['parse_fields', 'select_fields', 'sparse_fields']
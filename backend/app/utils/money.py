@@ -0,0 +1,43 @@
+"""
+金额工具
+计算路径内金额一律用整数分（Cents）表示，加减乘和比较都是精确的整数运算；
+只在 ORM（DECIMAL 列）和 JSON 输出处转换为 Decimal / float。
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import NewType
+
+# 以分为单位的金额
+Cents = NewType('Cents', int)
+
+_CENT = Decimal('0.01')
+_ONE = Decimal('1')
+
+
+def to_cents(value) -> Cents:
+    """把元（int / float / Decimal / str）转换为整数分，四舍五入到分"""
+    if value is None:
+        return Cents(0)
+    if isinstance(value, int):
+        return Cents(value * 100)
+    if not isinstance(value, Decimal):
+        # 经 str 转换，避免 float 的二进制误差（0.1 -> 0.1000000000000000055...）
+        value = Decimal(str(value))
+    return Cents(int((value * 100).quantize(_ONE, rounding=ROUND_HALF_UP)))
+
+
+def from_cents(cents: int) -> Decimal:
+    """整数分转为两位小数的 Decimal，用于写入 DECIMAL 列"""
+    return (Decimal(cents) / 100).quantize(_CENT)
+
+
+def cents_to_float(cents: int) -> float:
+    """整数分转为 float，用于 JSON 输出"""
+    return cents / 100
+
+
+def scale_cents(cents: int, percent: int) -> Cents:
+    """金额乘以百分比（整数），四舍五入到分"""
+    return Cents((cents * percent + 50) // 100)
+
+
+__all__ = ['Cents', 'to_cents', 'from_cents', 'cents_to_float', 'scale_cents']
@@ -0,0 +1,141 @@
+"""
+房间码分配
+房间码 = 对递增序号做 Feistel 置换后的 6 位 36 进制串。置换是双射，
+不同序号必然得到不同房间码，创建房间不需要查库探测空闲码；
+序号按块从 sequence_counters 预留，每个进程每 ROOM_CODE_BLOCK_SIZE 个房间才访问一次计数器。
+"""
+import hashlib
+import hmac
+import string
+import threading
+from flask import current_app
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.core.database import db
+from app.models.game import SequenceCounter
+
+ROOM_CODE_ALPHABET = string.ascii_uppercase + string.digits
+ROOM_CODE_LENGTH = 6
+ROOM_CODE_SEQUENCE = 'room_code'
+
+
+class FeistelPermutation:
+    """
+    [0, domain_size) 上的带密钥置换
+
+    在覆盖 domain_size 的最小偶数位宽上做平衡 Feistel 置换，
+    结果超出范围时继续置换（cycle walking），直到落回定义域
+    """
+
+    def __init__(self, domain_size: int, key: bytes, rounds: int = 4):
+        bits = max(2, (domain_size - 1).bit_length())
+        bits += bits % 2
+        self.domain_size = domain_size
+        self.half_bits = bits // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        self.key = key
+        self.rounds = rounds
+
+    def _round(self, index: int, value: int) -> int:
+        digest = hmac.new(self.key, f"{index}:{value}".encode(), hashlib.sha256).digest()
+        return int.from_bytes(digest[:8], 'big') & self.half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.half_mask
+        for index in range(self.rounds):
+            left, right = right, left ^ self._round(index, right)
+        return (left << self.half_bits) | right
+
+    def permute(self, value: int) -> int:
+        if not 0 <= value < self.domain_size:
+            raise ValueError(f"Value {value} outside permutation domain")
+        value = self._encrypt(value)
+        while value >= self.domain_size:
+            value = self._encrypt(value)
+        return value
+
+
+def encode_room_code(value: int) -> str:
+    """把 [0, 36^6) 内的整数编码为定长房间码"""
+    chars = []
+    for _ in range(ROOM_CODE_LENGTH):
+        value, digit = divmod(value, len(ROOM_CODE_ALPHABET))
+        chars.append(ROOM_CODE_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def reserve_sequence_block(name: str, size: int) -> int:
+    """
+    预留 [start, start + size) 区间并返回 start
+
+    在独立连接上执行并立即提交，不影响调用方会话中的事务；
+    先 UPDATE 自增再读取，UPDATE 持有的行锁保证并发进程拿到不重叠的区间
+    """
+    counters = SequenceCounter.__table__
+
+    for _ in range(2):
+        with db.engine.begin() as conn:
+            updated = conn.execute(
+                update(counters)
+                .where(counters.c.name == name)
+                .values(next_value=counters.c.next_value + size)
+            ).rowcount
+            if updated:
+                end = conn.execute(select(counters.c.next_value).where(counters.c.name == name)).scalar()
+                return end - size
+
+        # 首次使用：创建计数器，并发创建时由主键冲突兜底后重试
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(counters).values(name=name, next_value=size))
+            return 0
+        except IntegrityError:
+            continue
+
+    raise RuntimeError(f"Could not reserve a block of sequence {name}")
+
+
+class RoomCodeAllocator:
+    """进程内房间码分配器，线程安全"""
+
+    def __init__(self, secret_key: str, block_size: int = 50):
+        self.domain_size = len(ROOM_CODE_ALPHABET) ** ROOM_CODE_LENGTH
+        key = hashlib.sha256(f"room-code:{secret_key}".encode()).digest()
+        self.permutation = FeistelPermutation(self.domain_size, key)
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def next_code(self) -> str:
+        with self._lock:
+            if self._next >= self._end:
+                self._next = reserve_sequence_block(ROOM_CODE_SEQUENCE, self.block_size)
+                self._end = self._next + self.block_size
+            sequence = self._next
+            self._next += 1
+
+        if sequence >= self.domain_size:
+            raise ValueError("Room code space exhausted")
+        return encode_room_code(self.permutation.permute(sequence))
+
+
+_allocator = None
+_allocator_lock = threading.Lock()
+
+
+def allocate_room_code() -> str:
+    """分配一个未使用过的房间码"""
+    global _allocator
+
+    if _allocator is None:
+        with _allocator_lock:
+            if _allocator is None:
+                _allocator = RoomCodeAllocator(
+                    current_app.config['SECRET_KEY'],
+                    current_app.config.get('ROOM_CODE_BLOCK_SIZE', 50)
+                )
+    return _allocator.next_code()
+
+
+__all__ = ['FeistelPermutation', 'RoomCodeAllocator', 'allocate_room_code', 'encode_room_code']
@@ -0,0 +1,14 @@
+"""
+ASGI 模式启动脚本
+单个 worker 即可挂住大量 SSE 订阅连接；普通 API 仍由 Flask 处理
+"""
+import os
+import uvicorn
+
+if __name__ == '__main__':
+    uvicorn.run(
+        'app.asgi:application',
+        host='0.0.0.0',
+        port=8000,
+        workers=int(os.getenv('ASGI_WORKERS', 1))
+    )
@@ -0,0 +1,18 @@
+"""
+创建 cash_ledger 表（现金流水，每次现金变动追加一条）
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.finance import CashLedgerEntry
+
+if __name__ == '__main__':
+    with app.app_context():
+        try:
+            CashLedgerEntry.__table__.create(db.engine, checkfirst=True)
+            print("✅ cash_ledger 表创建成功！")
+        except Exception as e:
+            print(f"⚠️ 创建 cash_ledger 表失败: {e}")
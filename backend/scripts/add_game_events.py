@@ -0,0 +1,19 @@
+"""
+创建 game_events 和 player_snapshots 表（事件日志与状态快照）
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.event import GameEvent, PlayerSnapshot
+
+if __name__ == '__main__':
+    with app.app_context():
+        for model in (GameEvent, PlayerSnapshot):
+            try:
+                model.__table__.create(db.engine, checkfirst=True)
+                print(f"✅ {model.__tablename__} 表创建成功！")
+            except Exception as e:
+                print(f"⚠️ 创建 {model.__tablename__} 表失败: {e}")
@@ -0,0 +1,21 @@
+"""
+为 games 表添加大厅分页索引 (status, created_at, id)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.game import Game
+
+if __name__ == '__main__':
+    with app.app_context():
+        for index in Game.__table__.indexes:
+            if index.name != 'idx_game_status_created':
+                continue
+            try:
+                index.create(db.engine, checkfirst=True)
+                print(f"✅ 索引 {index.name} 创建成功！")
+            except Exception as e:
+                print(f"⚠️ 创建索引 {index.name} 失败: {e}")
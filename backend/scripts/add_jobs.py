@@ -0,0 +1,18 @@
+"""
+创建 jobs 表（后台任务队列）
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.job import Job
+
+if __name__ == '__main__':
+    with app.app_context():
+        try:
+            Job.__table__.create(db.engine, checkfirst=True)
+            print("✅ jobs 表创建成功！")
+        except Exception as e:
+            print(f"⚠️ 创建 jobs 表失败: {e}")
@@ -0,0 +1,41 @@
+"""
+创建 round_summaries 表，并为已结算的回合回填投影数据
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.game import Game, CustomerFlow, RoundSummary
+from app.services.round_service import RoundService
+
+if __name__ == '__main__':
+    with app.app_context():
+        try:
+            RoundSummary.__table__.create(db.engine, checkfirst=True)
+            print("✅ round_summaries 表创建成功！")
+        except Exception as e:
+            print(f"⚠️ 创建表失败: {e}")
+
+        # 回填：已开始游戏中当前回合之前的所有回合均已结算
+        try:
+            filled = 0
+            games = Game.query.filter(Game.status.in_(['in_progress', 'finished'])).all()
+            for game in games:
+                for round_number in range(1, game.current_round):
+                    if RoundSummary.query.filter_by(game_id=game.id, round_number=round_number).first():
+                        continue
+                    customer_flow = CustomerFlow.query.filter_by(
+                        game_id=game.id,
+                        round_number=round_number
+                    ).first()
+                    if not customer_flow:
+                        continue
+                    RoundService.write_round_summary(game.id, round_number, customer_flow)
+                    filled += 1
+            db.session.commit()
+            print(f"✅ 已回填 {filled} 个回合的结算投影")
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ 回填失败: {e}")
@@ -0,0 +1,18 @@
+"""
+创建 sequence_counters 表（房间码序号按块预留）
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.game import SequenceCounter
+
+if __name__ == '__main__':
+    with app.app_context():
+        try:
+            SequenceCounter.__table__.create(db.engine, checkfirst=True)
+            print("✅ sequence_counters 表创建成功！")
+        except Exception as e:
+            print(f"⚠️ 创建 sequence_counters 表失败: {e}")
@@ -0,0 +1,36 @@
+"""
+添加店铺员工汇总字段（total_productivity, total_salary, active_employee_count）并回填
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.services.employee_service import EmployeeService
+from sqlalchemy import text
+
+COLUMNS = [
+    'ALTER TABLE shops ADD COLUMN total_productivity INT NOT NULL DEFAULT 0',
+    'ALTER TABLE shops ADD COLUMN total_salary DECIMAL(10, 2) NOT NULL DEFAULT 0',
+    'ALTER TABLE shops ADD COLUMN active_employee_count INT NOT NULL DEFAULT 0'
+]
+
+if __name__ == '__main__':
+    with app.app_context():
+        for statement in COLUMNS:
+            try:
+                with db.engine.connect() as conn:
+                    conn.execute(text(statement))
+                    conn.commit()
+                print(f"✅ {statement}")
+            except Exception as e:
+                print(f"⚠️ 添加字段失败（可能已存在）: {e}")
+
+        # 按在职员工回填汇总字段
+        try:
+            repaired = EmployeeService.repair_shop_aggregates()
+            print(f"✅ 已回填 {len(repaired)} 家店铺的员工汇总")
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ 回填失败: {e}")
@@ -21,7 +21,8 @@ CREATE TABLE `games` (
     `finished_at` TIMESTAMP NULL,
     `settings` JSON COMMENT '游戏设置',
     INDEX `idx_room_code` (`room_code`),
-    INDEX `idx_status` (`status`)
+    INDEX `idx_status` (`status`),
+    INDEX `idx_game_status_created` (`status`, `created_at`, `id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='游戏房间表';
 
 -- ============================================
@@ -55,6 +56,9 @@ CREATE TABLE `shops` (
     `decoration_level` INT DEFAULT 0 COMMENT '装修等级: 0=无, 1=简装, 2=精装, 3=豪华',
     `max_employees` INT DEFAULT 0 COMMENT '最大员工数',
     `created_round` INT NOT NULL COMMENT '开店回合',
+    `total_productivity` INT NOT NULL DEFAULT 0 COMMENT '在职员工总生产力',
+    `total_salary` DECIMAL(10, 2) NOT NULL DEFAULT 0 COMMENT '在职员工总工资',
+    `active_employee_count` INT NOT NULL DEFAULT 0 COMMENT '在职员工数',
     UNIQUE KEY `uk_player` (`player_id`),
     FOREIGN KEY (`player_id`) REFERENCES `players`(`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='店铺表';
@@ -239,6 +243,114 @@ CREATE TABLE `market_actions` (
     FOREIGN KEY (`player_id`) REFERENCES `players`(`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='市场行动表';
 
+-- ============================================
+-- 13. 游戏事件日志表 (game_events)，只追加
+-- ============================================
+DROP TABLE IF EXISTS `game_events`;
+CREATE TABLE `game_events` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `game_id` INT NOT NULL COMMENT '游戏ID',
+    `player_id` INT COMMENT '玩家ID',
+    `round_number` INT NOT NULL COMMENT '回合数',
+    `event_type` VARCHAR(30) NOT NULL COMMENT '事件类型: shop_opened, employee_hired, round_settled 等',
+    `payload` JSON COMMENT '事件数据',
+    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX `idx_event_player` (`player_id`, `id`),
+    INDEX `idx_event_game_round` (`game_id`, `round_number`),
+    FOREIGN KEY (`game_id`) REFERENCES `games`(`id`) ON DELETE CASCADE,
+    FOREIGN KEY (`player_id`) REFERENCES `players`(`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='游戏事件日志表';
+
+-- ============================================
+-- 14. 玩家状态快照表 (player_snapshots)
+-- ============================================
+DROP TABLE IF EXISTS `player_snapshots`;
+CREATE TABLE `player_snapshots` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `player_id` INT NOT NULL COMMENT '玩家ID',
+    `round_number` INT NOT NULL COMMENT '回合数',
+    `last_event_id` INT NOT NULL COMMENT '快照包含的最后一个事件ID',
+    `state` JSON NOT NULL COMMENT '玩家状态',
+    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY `uk_snapshot_player_round` (`player_id`, `round_number`),
+    FOREIGN KEY (`player_id`) REFERENCES `players`(`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='玩家状态快照表';
+
+-- ============================================
+-- 15. 回合结算投影表 (round_summaries)
+-- ============================================
+DROP TABLE IF EXISTS `round_summaries`;
+CREATE TABLE `round_summaries` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `game_id` INT NOT NULL COMMENT '游戏ID',
+    `round_number` INT NOT NULL COMMENT '回合数',
+    `player_id` INT NOT NULL COMMENT '玩家ID',
+    `nickname` VARCHAR(50) NOT NULL COMMENT '玩家昵称',
+    `product_id` INT NOT NULL COMMENT 'PlayerProduct.id (0: player produced nothing)',
+    `product_name` VARCHAR(50) NOT NULL COMMENT '产品名称',
+    `price` DECIMAL(6, 2) COMMENT '售价',
+    `produced` INT DEFAULT 0 COMMENT '生产数量',
+    `sold` INT DEFAULT 0 COMMENT '销售数量',
+    `sold_to_high` INT DEFAULT 0 COMMENT '卖给高购买力客户',
+    `sold_to_low` INT DEFAULT 0 COMMENT '卖给低购买力客户',
+    `revenue` DECIMAL(10, 2) DEFAULT 0.00 COMMENT '营业额',
+    `high_tier_customers` INT NOT NULL COMMENT '本回合高购买力客户数',
+    `low_tier_customers` INT NOT NULL COMMENT '本回合低购买力客户数',
+    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY `uk_summary_round_product` (`game_id`, `round_number`, `player_id`, `product_id`),
+    INDEX `idx_summary_game_round` (`game_id`, `round_number`),
+    FOREIGN KEY (`game_id`) REFERENCES `games`(`id`) ON DELETE CASCADE,
+    FOREIGN KEY (`player_id`) REFERENCES `players`(`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='回合结算投影表';
+
+-- ============================================
+-- 16. 后台任务表 (jobs)
+-- ============================================
+DROP TABLE IF EXISTS `jobs`;
+CREATE TABLE `jobs` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `job_type` VARCHAR(50) NOT NULL COMMENT '任务类型',
+    `idempotency_key` VARCHAR(100) NULL COMMENT '幂等键，重复提交返回已有任务',
+    `payload` JSON NULL COMMENT '任务参数',
+    `status` VARCHAR(20) DEFAULT 'queued' COMMENT 'queued/running/succeeded/failed',
+    `attempts` INT DEFAULT 0 COMMENT '已执行次数',
+    `max_attempts` INT DEFAULT 3 COMMENT '最大执行次数',
+    `result` JSON NULL COMMENT '任务结果',
+    `error` TEXT NULL COMMENT '最近一次错误',
+    `run_after` TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '最早执行时间（重试退避）',
+    `locked_by` VARCHAR(100) NULL COMMENT '领取任务的 worker',
+    `locked_at` TIMESTAMP NULL COMMENT '领取时间',
+    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    `finished_at` TIMESTAMP NULL,
+    UNIQUE KEY `uk_job_idempotency_key` (`idempotency_key`),
+    INDEX `idx_job_status_run_after` (`status`, `run_after`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='后台任务表';
+
+-- ============================================
+-- 17. 命名计数器表 (sequence_counters)
+-- ============================================
+DROP TABLE IF EXISTS `sequence_counters`;
+CREATE TABLE `sequence_counters` (
+    `name` VARCHAR(50) PRIMARY KEY COMMENT '计数器名称',
+    `next_value` BIGINT NOT NULL DEFAULT 0 COMMENT '下一个未分配的值'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='命名计数器表';
+
+-- ============================================
+-- 18. 现金流水表 (cash_ledger)
+-- ============================================
+DROP TABLE IF EXISTS `cash_ledger`;
+CREATE TABLE `cash_ledger` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `player_id` INT NOT NULL COMMENT '玩家ID',
+    `round_number` INT NOT NULL COMMENT '回合数',
+    `category` VARCHAR(30) NOT NULL COMMENT 'revenue, material, decoration, hiring, market_research, advertisement, product_research',
+    `amount` DECIMAL(10, 2) NOT NULL COMMENT '金额：收入为正，支出为负',
+    `reference` VARCHAR(50) NULL COMMENT '来源记录，如 employee:12',
+    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX `idx_ledger_player_round` (`player_id`, `round_number`),
+    FOREIGN KEY (`player_id`) REFERENCES `players`(`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='现金流水表';
+
 -- ============================================
 -- 完成
 -- ============================================
@@ -0,0 +1,26 @@
+"""
+删除历史遗留的未解锁 PlayerProduct 行
+未解锁的产品已改为由配方目录推导，只有研发成功后才写入 player_products
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.models.product import PlayerProduct, RoundProduction
+
+if __name__ == '__main__':
+    with app.app_context():
+        try:
+            produced = db.session.query(RoundProduction.product_id).distinct()
+            removed = PlayerProduct.query.filter(
+                PlayerProduct.is_unlocked.is_(False),
+                PlayerProduct.id.notin_(produced)
+            ).delete(synchronize_session=False)
+
+            db.session.commit()
+            print(f"✅ 已删除 {removed} 条未解锁的产品记录")
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ 清理失败: {e}")
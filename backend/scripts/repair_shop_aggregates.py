@@ -0,0 +1,41 @@
+"""
+检查并修复店铺员工汇总字段
+用法: python scripts/repair_shop_aggregates.py [--check] [--shop SHOP_ID]
+  --check  只报告不一致的店铺，不修改
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import db
+from app.main import app
+from app.services.employee_service import EmployeeService
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='检查并修复店铺员工汇总字段')
+    parser.add_argument('--check', action='store_true', help='只检查，不修复')
+    parser.add_argument('--shop', type=int, default=None, help='只处理指定店铺')
+    args = parser.parse_args()
+
+    with app.app_context():
+        try:
+            if args.check:
+                mismatches = EmployeeService.check_shop_aggregates(args.shop)
+            else:
+                mismatches = EmployeeService.repair_shop_aggregates(args.shop)
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ 处理失败: {e}")
+            sys.exit(2)
+
+        for mismatch in mismatches:
+            print(f"店铺 {mismatch['shop_id']}: {mismatch['differences']}")
+
+        if not mismatches:
+            print("✅ 所有店铺的员工汇总一致")
+        elif args.check:
+            print(f"⚠️ {len(mismatches)} 家店铺的员工汇总不一致")
+            sys.exit(1)
+        else:
+            print(f"✅ 已修复 {len(mismatches)} 家店铺的员工汇总")
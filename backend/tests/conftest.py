@@ -0,0 +1,117 @@
+"""
+Test fixtures
+Runs the app against a throwaway SQLite file; tables are recreated for every test.
+"""
+import os
+import tempfile
+
+# Must be set before the app (and its config) is imported
+_db_dir = tempfile.mkdtemp(prefix='naicha-test-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ['JOB_INPROCESS_WORKERS'] = '0'
+os.environ['BACKGROUND_THREADS'] = 'False'
+os.environ['SETTLEMENT_AUTO_ADVANCE'] = 'False'
+os.environ['SETTLEMENT_DEADLINE_SECONDS'] = '0'
+
+import pytest
+from app.main import app as flask_app
+from app.api.v1.game import _lobby_first_page
+from app.core.database import db
+from app.models.product import ProductRecipe
+from app.services import leaderboard_service
+from app.services.finance_service import _series_cache
+from app.services.product_service import _recipe_catalog
+from app.services.turn_service import TurnService
+from app.utils.game_constants import GameConstants
+
+# Opens a shop, hires, unlocks recipe 1 and submits a plan for it
+TURN = [
+    {"type": "open_shop", "location": "A", "rent": 500},
+    {"type": "upgrade_decoration", "target_level": 2},
+    {"type": "hire_employee", "name": "Tom", "salary": 1000, "productivity": 60},
+    {"type": "research_product", "recipe_id": 1, "dice_result": 6},
+    {"type": "submit_production", "productions": [{"recipe_id": 1, "productivity": 50, "price": 15}]}
+]
+
+# SQLite index names are database-wide; prefix them with the table name
+for _table in db.metadata.tables.values():
+    for _index in _table.indexes:
+        if not _index.name.startswith(_table.name):
+            _index.name = f"{_table.name}_{_index.name}"
+
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        for recipe in GameConstants.PRODUCT_RECIPES:
+            db.session.add(ProductRecipe(**recipe))
+        db.session.commit()
+
+        # Ids restart with every database; drop what earlier tests cached in the process
+        leaderboard_service._boards.clear()
+        for cache in (_series_cache, _recipe_catalog, _lobby_first_page):
+            cache.clear()
+
+        yield flask_app
+
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _ok(resp):
+    body = resp.get_json()
+    assert body["success"], body
+    return body["data"]
+
+
+@pytest.fixture
+def new_game(client):
+    """Create and start a game with one player per nickname: {"game_id": 1, "player_ids": [1, 2]}"""
+    def create(*nicknames):
+        tokens = [
+            _ok(client.post('/api/v1/auth/login', json={'nickname': nickname}))['session_token']
+            for nickname in nicknames
+        ]
+        created = _ok(client.post('/api/v1/games', json={
+            'name': 'test', 'player_name': nicknames[0], 'session_token': tokens[0]
+        }))
+        game_id = created['game']['id']
+        player_ids = [created['player']['id']]
+        for nickname, token in zip(nicknames[1:], tokens[1:]):
+            player_ids.append(_ok(client.post('/api/v1/players/join', json={
+                'game_id': game_id, 'player_name': nickname, 'session_token': token
+            }))['id'])
+        _ok(client.post(f'/api/v1/games/{game_id}/start'))
+
+        return {"game_id": game_id, "player_ids": player_ids}
+    return create
+
+
+@pytest.fixture
+def game(new_game):
+    """A started two-player game in round 1"""
+    return new_game('alice', 'bob')
+
+
+@pytest.fixture
+def take_turn(app):
+    """Play the standard turn for a player in the current round"""
+    def take(player_id):
+        result = TurnService.execute_turn(player_id, TURN)
+        assert result["success"], result
+        return result
+    return take
+
+
+@pytest.fixture
+def submitted_game(game, take_turn):
+    """The game fixture with both players' round 1 plans submitted"""
+    for player_id in game["player_ids"]:
+        take_turn(player_id)
+    return game
@@ -0,0 +1,18 @@
+"""
+Operations endpoints are closed unless ADMIN_TOKEN is configured
+"""
+
+
+def test_sql_metrics_hidden_without_admin_token(client):
+    assert client.get('/metrics/sql').status_code == 404
+
+
+def test_sql_metrics_require_matching_token(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', 'secret')
+
+    assert client.get('/metrics/sql').status_code == 403
+    assert client.get('/metrics/sql', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+
+    resp = client.get('/metrics/sql', headers={'X-Admin-Token': 'secret'})
+    assert resp.status_code == 200
+    assert resp.get_json()["success"]
@@ -0,0 +1,51 @@
+"""
+ASGI tests: the SSE stream follows the CORS settings and is counted in /metrics
+"""
+import asyncio
+import pytest
+from app.core.metrics import registry
+
+
+def _stream(application, game_id, origin=None):
+    """Open a game stream and collect the response messages"""
+    headers = [(b'origin', origin.encode())] if origin else []
+    scope = {'type': 'http', 'method': 'GET', 'path': f'/api/v1/stream/games/{game_id}', 'headers': headers}
+    messages = []
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asyncio.wait_for(application(scope, receive, send), timeout=10))
+    return messages
+
+
+@pytest.fixture
+def application(app):
+    from app.asgi import create_asgi_app
+    return create_asgi_app(app)
+
+
+def test_stream_echoes_allowed_origin(application):
+    origin = 'http://localhost:5173'
+    messages = _stream(application, 999, origin)
+
+    assert messages[0]['status'] == 200
+    assert dict(messages[0]['headers'])[b'access-control-allow-origin'] == origin.encode()
+    assert b'event: error' in messages[1]['body']
+
+
+def test_stream_omits_cors_header_for_other_origins(application):
+    messages = _stream(application, 999, 'http://evil.example')
+
+    assert b'access-control-allow-origin' not in dict(messages[0]['headers'])
+
+
+def test_stream_connections_are_counted(application, client):
+    _stream(application, 999)
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'naicha_stream_connections_total{status="200"}' in metrics
+    assert 'naicha_stream_subscribers 0' in metrics
@@ -0,0 +1,102 @@
+"""
+EmployeeService tests: shop aggregates follow hires, fires and salary changes
+"""
+import threading
+import pytest
+from app.core.database import db
+from app.models.player import Player, Shop, Employee
+from app.services.employee_service import EmployeeService
+from app.services.shop_service import ShopService
+
+
+@pytest.fixture
+def shop(app, game):
+    """Player 1's shop at decoration level 2 with two employees"""
+    player_id = game["player_ids"][0]
+    ShopService.open_shop(player_id, 'A', 500, 1)
+    ShopService.upgrade_decoration(player_id, 2)
+    employees = [
+        EmployeeService.hire_employee(player_id, name, 1000, 40, 1).id
+        for name in ('Tom', 'Amy')
+    ]
+    return {"player_id": player_id, "shop_id": Player.query.get(player_id).shop.id, "employee_ids": employees}
+
+
+def _in_other_request(app, func, *args):
+    """Run a service call in its own thread, app context and session"""
+    def run():
+        with app.app_context():
+            func(*args)
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+
+def _totals(shop_id):
+    db.session.expire_all()
+    shop = Shop.query.get(shop_id)
+    return shop.active_employee_count, shop.total_productivity, float(shop.total_salary)
+
+
+def test_hire_fire_and_raise_keep_totals(shop):
+    tom, amy = shop["employee_ids"]
+    assert _totals(shop["shop_id"]) == (2, 80, 2000.0)
+
+    EmployeeService.update_employee_salary(tom, 1500)
+    EmployeeService.fire_employee(amy)
+
+    assert _totals(shop["shop_id"]) == (1, 40, 1500.0)
+    assert EmployeeService.check_shop_aggregates() == []
+
+
+def test_concurrent_fire_decrements_once(app, shop):
+    tom = shop["employee_ids"][0]
+    employee = Employee.query.get(tom)  # this request has loaded Tom as active
+    assert employee.is_active
+
+    _in_other_request(app, EmployeeService.fire_employee, tom)
+
+    with pytest.raises(ValueError, match="already inactive"):
+        EmployeeService.fire_employee(tom)
+    db.session.rollback()
+
+    assert _totals(shop["shop_id"]) == (1, 40, 1000.0)
+    assert EmployeeService.check_shop_aggregates() == []
+
+
+def test_concurrent_raises_apply_delta_of_stored_salary(app, shop):
+    tom = shop["employee_ids"][0]
+    employee = Employee.query.get(tom)  # this request has loaded Tom's salary of 1000
+    assert float(employee.salary) == 1000
+
+    _in_other_request(app, EmployeeService.update_employee_salary, tom, 1500)
+    result = EmployeeService.update_employee_salary(tom, 1200)
+
+    assert result["previous_salary"] == 1500
+    assert _totals(shop["shop_id"]) == (2, 80, 2200.0)
+    assert EmployeeService.check_shop_aggregates() == []
+
+
+def test_check_and_repair_drifted_aggregates(shop):
+    shop_id = shop["shop_id"]
+    drifted = Shop.query.get(shop_id)
+    drifted.total_salary = 5000
+    drifted.active_employee_count = 7
+    db.session.commit()
+
+    expected = [{"shop_id": shop_id, "differences": {
+        "total_salary": {"stored": 5000.0, "actual": 2000.0},
+        "active_employee_count": {"stored": 7, "actual": 2}
+    }}]
+    assert EmployeeService.check_shop_aggregates() == expected
+    assert EmployeeService.check_shop_aggregates(shop_id + 1) == []
+
+    assert EmployeeService.repair_shop_aggregates(shop_id) == expected
+    assert _totals(shop_id) == (2, 80, 2000.0)
+    assert EmployeeService.check_shop_aggregates() == []
+
+
+def test_shop_without_employees_is_consistent_at_zero(app, game):
+    ShopService.open_shop(game["player_ids"][1], 'B', 500, 1)
+
+    assert EmployeeService.check_shop_aggregates() == []
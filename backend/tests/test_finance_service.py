@@ -0,0 +1,42 @@
+"""
+FinanceService tests: cached finance series are keyed on the settlement version
+"""
+from app.core.database import db
+from app.services.finance_service import FinanceService
+from app.services.settlement_service import SettlementService
+
+
+def _rounds(game_id):
+    db.session.expire_all()
+    return {player["player_id"]: player["rounds"] for player in FinanceService.get_game_series(game_id)["players"]}
+
+
+def test_series_loaded_once_per_settlement(submitted_game, monkeypatch):
+    game_id = submitted_game["game_id"]
+    load = FinanceService._load_game_series
+    loads = []
+
+    def counting_load(game_id):
+        loads.append(game_id)
+        return load(game_id)
+    monkeypatch.setattr(FinanceService, '_load_game_series', staticmethod(counting_load))
+
+    assert _rounds(game_id) == {pid: [] for pid in submitted_game["player_ids"]}
+    _rounds(game_id)
+    assert len(loads) == 1
+
+    # Settled by another process: nothing invalidates this process's cache directly
+    monkeypatch.setattr(FinanceService, 'invalidate_series', staticmethod(lambda game_id: None))
+    SettlementService.settle_round(game_id, 1)
+
+    assert _rounds(game_id) == {pid: [1] for pid in submitted_game["player_ids"]}
+    assert len(loads) == 2
+
+
+def test_cached_series_cannot_be_modified_by_callers(submitted_game):
+    game_id = submitted_game["game_id"]
+    SettlementService.settle_round(game_id, 1)
+
+    FinanceService.get_game_series(game_id)["players"][0]["rounds"].append(99)
+
+    assert all(rounds == [1] for rounds in _rounds(game_id).values())
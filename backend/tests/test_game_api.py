@@ -0,0 +1,67 @@
+"""
+Game API tests: lobby listing is keyset-paginated newest first
+"""
+from datetime import datetime, timedelta
+from app.core.database import db
+from app.models.game import Game
+from app.models.player import Player
+
+
+def _add_games(count, status='waiting', created_at=None):
+    """Insert games directly; the same created_at for all of them exercises the id tie-break"""
+    base = datetime(2024, 1, 1)
+    games = [
+        Game(room_code=f"T{status[0].upper()}{i:04d}", status=status,
+             created_at=created_at or base + timedelta(minutes=i))
+        for i in range(count)
+    ]
+    db.session.add_all(games)
+    db.session.commit()
+    return [game.id for game in games]
+
+
+def _walk(client, query):
+    """Follow next_cursor from the first page to the last; returns the ids of every page"""
+    pages, cursor = [], None
+    while True:
+        params = dict(query, cursor=cursor) if cursor else query
+        body = client.get('/api/v1/games', query_string=params).get_json()
+        assert body["success"], body
+        pages.append([game["id"] for game in body["data"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_game_once_newest_first(app, client):
+    ids = _add_games(7)
+
+    pages = _walk(client, {"status": 'waiting', "limit": 3})
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == list(reversed(ids))
+
+
+def test_games_created_at_the_same_time_are_ordered_by_id(app, client):
+    ids = _add_games(5, created_at=datetime(2024, 1, 1))
+
+    pages = _walk(client, {"limit": 2})
+
+    assert sum(pages, []) == list(reversed(ids))
+
+
+def test_status_filter_and_player_count(app, client):
+    waiting = _add_games(2)
+    _add_games(2, status='finished')
+    db.session.add(Player(game_id=waiting[0], nickname='alice', player_number=1, cash=10000))
+    db.session.commit()
+
+    body = client.get('/api/v1/games', query_string={"status": 'waiting'}).get_json()
+
+    assert {game["id"]: game["player_count"] for game in body["data"]} == {waiting[0]: 1, waiting[1]: 0}
+
+
+def test_invalid_cursor_is_rejected(client):
+    resp = client.get('/api/v1/games', query_string={"cursor": 'not-a-cursor'})
+
+    assert resp.status_code == 400
@@ -0,0 +1,105 @@
+"""
+JobService tests: idempotent enqueue, exclusive claims and retries
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.core.database import db
+from app.models.job import Job
+from app.services import job_service
+from app.services.job_service import JobService
+
+
+@pytest.fixture
+def calls(app, monkeypatch):
+    """Register a 'test' job type; its payload says whether to fail and how"""
+    seen = []
+
+    def handler(payload):
+        seen.append(payload)
+        if payload.get("fail") == 'value':
+            raise ValueError("bad input")
+        if payload.get("fail") == 'runtime':
+            raise RuntimeError("temporary outage")
+        return {"ok": True}
+
+    monkeypatch.setitem(job_service._handlers, 'test', handler)
+    return seen
+
+
+def _claim_and_run(worker_id='w1'):
+    job = JobService.claim_next(worker_id)
+    return JobService.run_job(job) if job else None
+
+
+def test_enqueue_with_same_key_returns_existing_job(calls):
+    first = JobService.enqueue('test', {"n": 1}, idempotency_key='k')
+    second = JobService.enqueue('test', {"n": 2}, idempotency_key='k')
+
+    assert second.id == first.id
+    assert Job.query.count() == 1
+
+
+def test_unknown_job_type_is_rejected(app):
+    with pytest.raises(ValueError, match="Unknown job type"):
+        JobService.enqueue('no-such-job')
+
+
+def test_a_job_is_claimed_once(calls):
+    job = JobService.enqueue('test', {})
+
+    claimed = JobService.claim_next('w1')
+    assert claimed.id == job.id
+    assert claimed.locked_by == 'w1'
+    assert claimed.attempts == 1
+    assert JobService.claim_next('w2') is None
+
+    assert JobService.run_job(claimed).status == 'succeeded'
+    assert calls == [{}]
+
+
+def test_running_job_with_expired_lease_is_reclaimed(calls, app):
+    JobService.enqueue('test', {})
+    claimed = JobService.claim_next('w1')
+    claimed.locked_at = datetime.utcnow() - timedelta(seconds=app.config['JOB_LEASE_SECONDS'] + 1)
+    db.session.commit()
+
+    reclaimed = JobService.claim_next('w2')
+    assert reclaimed.id == claimed.id
+    assert reclaimed.locked_by == 'w2'
+    assert reclaimed.attempts == 2
+
+
+def test_errors_are_retried_with_backoff_until_max_attempts(calls):
+    job = JobService.enqueue('test', {"fail": 'runtime'}, max_attempts=2)
+
+    job = _claim_and_run()
+    assert job.status == 'queued'
+    assert job.run_after > datetime.utcnow()
+    assert JobService.claim_next('w1') is None  # still backing off
+
+    job.run_after = datetime.utcnow()
+    db.session.commit()
+    job = _claim_and_run()
+    assert job.status == 'failed'
+    assert job.attempts == 2
+    assert job.error == "temporary outage"
+
+
+def test_value_errors_fail_without_retry(calls):
+    JobService.enqueue('test', {"fail": 'value'}, max_attempts=3)
+
+    job = _claim_and_run()
+    assert job.status == 'failed'
+    assert job.attempts == 1
+    assert len(calls) == 1
+
+
+def test_enqueue_requeues_a_failed_job(calls):
+    failed = JobService.enqueue('test', {"fail": 'value'}, idempotency_key='k')
+    _claim_and_run()
+
+    job = JobService.enqueue('test', {}, idempotency_key='k')
+    assert job.id == failed.id
+    assert (job.status, job.attempts, job.error, job.payload) == ('queued', 0, None, {})
+
+    assert _claim_and_run().status == 'succeeded'
@@ -0,0 +1,92 @@
+"""
+LeaderboardService tests: cached boards are tagged with versions that never repeat
+"""
+from datetime import datetime, timedelta
+from app.core.database import db
+from app.models.game import Game
+from app.models.player import Player
+from app.services.leaderboard_service import LeaderboardService
+from app.services.session_cleanup import _cleanup_once
+from app.services.settlement_service import SettlementService
+
+
+def _finish(game_id):
+    game = Game.query.get(game_id)
+    game.status = 'finished'
+    game.finished_at = datetime.utcnow()
+    db.session.commit()
+    LeaderboardService.record_finished_game(game)
+
+
+def _global_games():
+    db.session.expire_all()
+    return {entry["game_id"] for entry in LeaderboardService.get_global_leaderboard()}
+
+
+def test_finished_game_joins_global_board(app, game):
+    assert _global_games() == set()
+
+    _finish(game["game_id"])
+
+    assert _global_games() == {game["game_id"]}
+
+
+def test_deleted_game_leaves_global_board_when_another_finishes(app, new_game):
+    first = new_game('alice', 'bob')
+    second = new_game('carol', 'dave')
+    _finish(first["game_id"])
+    assert _global_games() == {first["game_id"]}
+
+    # The first game's players go idle and the cleanup deletes them and the game
+    Player.query.filter(Player.id.in_(first["player_ids"])).update(
+        {Player.last_active_at: datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False
+    )
+    db.session.commit()
+    _cleanup_once()
+    assert Game.query.get(first["game_id"]) is None
+
+    # One finished game again, as before the deletion; the board must not be reused
+    _finish(second["game_id"])
+    assert _global_games() == {second["game_id"]}
+
+
+def _profits(game_id):
+    db.session.expire_all()
+    board = LeaderboardService.get_game_leaderboard(Game.query.get(game_id))
+    return {entry["player_id"]: entry["total_profit"] for entry in board}
+
+
+def test_game_board_follows_settlement_version(submitted_game, monkeypatch):
+    game_id = submitted_game["game_id"]
+    assert set(_profits(game_id).values()) == {0.0}
+
+    # Settled by another process: this process's board is not refreshed directly
+    monkeypatch.setattr(LeaderboardService, 'refresh_game', staticmethod(lambda game: None))
+    SettlementService.settle_round(game_id, 1)
+
+    db.session.expire_all()
+    expected = {pid: float(Player.query.get(pid).total_profit) for pid in submitted_game["player_ids"]}
+    assert _profits(game_id) == expected
+    assert set(expected.values()) != {0.0}
+
+
+def test_game_board_is_rebuilt_only_when_version_changes(submitted_game, monkeypatch):
+    game_id = submitted_game["game_id"]
+    rebuild = LeaderboardService._rebuild_game_board
+    rebuilt = []
+
+    def counting_rebuild(game, version):
+        rebuilt.append(version)
+        return rebuild(game, version)
+    monkeypatch.setattr(LeaderboardService, '_rebuild_game_board', staticmethod(counting_rebuild))
+    monkeypatch.setattr(LeaderboardService, 'refresh_game', staticmethod(lambda game: None))
+
+    _profits(game_id)
+    _profits(game_id)
+    assert rebuilt == [0]
+
+    SettlementService.settle_round(game_id, 1)
+    _profits(game_id)
+    _profits(game_id)
+    assert len(rebuilt) == 2
+    assert rebuilt[1] > 0
@@ -0,0 +1,82 @@
+"""
+LedgerService tests: debits are a conditional UPDATE on the stored balance
+"""
+import threading
+import pytest
+from sqlalchemy import update
+from app.core.database import db
+from app.models.finance import CashLedgerEntry
+from app.models.player import Player
+from app.services.ledger_service import LedgerService, ADVERTISEMENT, REVENUE
+
+
+def _cash(player_id):
+    db.session.expire_all()
+    return float(Player.query.get(player_id).cash)
+
+
+def test_debit_and_credit_write_ledger_entries(app, game):
+    player_id = game["player_ids"][0]
+    player = Player.query.get(player_id)
+
+    LedgerService.debit(player, 800, ADVERTISEMENT, 1)
+    LedgerService.credit(player, 250.5, REVENUE, 1)
+    db.session.commit()
+
+    assert _cash(player_id) == 10000 - 800 + 250.5
+    assert LedgerService.round_totals(player_id, 1) == {ADVERTISEMENT: -800.0, REVENUE: 250.5}
+
+
+def test_overdraw_raises_and_keeps_cash(app, game):
+    player_id = game["player_ids"][0]
+    player = Player.query.get(player_id)
+
+    with pytest.raises(ValueError, match="Insufficient cash"):
+        LedgerService.debit(player, 10000.01, ADVERTISEMENT, 1)
+    db.session.commit()
+
+    assert _cash(player_id) == 10000
+    assert CashLedgerEntry.query.filter_by(player_id=player_id).count() == 0
+
+
+def test_debit_checks_stored_balance_not_loaded_one(app, game):
+    player_id = game["player_ids"][0]
+    player = Player.query.get(player_id)
+    assert float(player.cash) == 10000
+
+    # Another request spends most of the cash after this one loaded the player
+    with db.engine.begin() as conn:
+        conn.execute(update(Player.__table__).where(Player.__table__.c.id == player_id).values(cash=100))
+
+    with pytest.raises(ValueError, match="Insufficient cash"):
+        LedgerService.debit(player, 800, ADVERTISEMENT, 1)
+    db.session.commit()
+
+    assert _cash(player_id) == 100
+    assert CashLedgerEntry.query.filter_by(player_id=player_id).count() == 0
+
+
+def test_concurrent_debits_never_overdraw(app, game):
+    player_id = game["player_ids"][0]
+    outcomes = []
+
+    def spend():
+        with app.app_context():
+            player = Player.query.get(player_id)
+            try:
+                LedgerService.debit(player, 1000, ADVERTISEMENT, 1)
+                db.session.commit()
+                outcomes.append(True)
+            except ValueError:
+                db.session.rollback()
+                outcomes.append(False)
+
+    threads = [threading.Thread(target=spend) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count(True) == 10
+    assert _cash(player_id) == 0
+    assert CashLedgerEntry.query.filter_by(player_id=player_id).count() == 10
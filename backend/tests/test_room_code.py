@@ -0,0 +1,52 @@
+"""
+Room code tests: keyed permutation of reserved sequence numbers
+"""
+import threading
+from app.utils.room_code import (
+    FeistelPermutation, RoomCodeAllocator, ROOM_CODE_ALPHABET, ROOM_CODE_LENGTH,
+    encode_room_code, reserve_sequence_block
+)
+
+
+def test_permutation_is_a_bijection():
+    for domain_size in (2, 10, 1000, 4097):
+        permutation = FeistelPermutation(domain_size, b'key')
+        assert sorted(permutation.permute(value) for value in range(domain_size)) == list(range(domain_size))
+
+
+def test_permutation_depends_on_the_key():
+    first = [FeistelPermutation(1000, b'one').permute(value) for value in range(20)]
+    second = [FeistelPermutation(1000, b'two').permute(value) for value in range(20)]
+
+    assert first != second
+
+
+def test_encoded_codes_have_fixed_length():
+    assert encode_room_code(0) == 'A' * ROOM_CODE_LENGTH
+    assert len(encode_room_code(len(ROOM_CODE_ALPHABET) ** ROOM_CODE_LENGTH - 1)) == ROOM_CODE_LENGTH
+
+
+def test_blocks_do_not_overlap(app):
+    starts = []
+
+    def reserve():
+        with app.app_context():
+            starts.append(reserve_sequence_block('test', 10))
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(starts) == list(range(0, 80, 10))
+
+
+def test_allocators_never_hand_out_the_same_code(app):
+    # Two processes sharing the counter, each reserving small blocks
+    allocators = [RoomCodeAllocator('secret', block_size=3) for _ in range(2)]
+
+    codes = [allocators[i % 2].next_code() for i in range(30)]
+
+    assert len(set(codes)) == 30
+    assert all(len(code) == ROOM_CODE_LENGTH for code in codes)
@@ -0,0 +1,26 @@
+"""
+Round API tests: advancing names the round being settled
+"""
+import pytest
+from app.core.database import db
+from app.models.game import Game
+
+
+def test_duplicate_advance_gets_stored_result(client, submitted_game):
+    game_id = submitted_game["game_id"]
+
+    first = client.post(f'/api/v1/rounds/{game_id}/advance', json={"round": 1})
+    retry = client.post(f'/api/v1/rounds/{game_id}/advance', json={"round": 1})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.get_json()["data"] == first.get_json()["data"]
+    db.session.expire_all()
+    assert Game.query.get(game_id).current_round == 2
+
+
+@pytest.mark.parametrize("value", ["1", None, 0, -1, 1.5, True])
+def test_advance_rejects_invalid_round(client, game, value):
+    resp = client.post(f'/api/v1/rounds/{game["game_id"]}/advance', json={"round": value})
+
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "round must be a positive integer"
@@ -0,0 +1,79 @@
+"""
+SettlementScheduler tests: a failed settlement job never blocks its round
+"""
+from datetime import datetime, timedelta
+from app.core.database import db
+from app.models.game import Game
+from app.models.job import Job
+from app.services.job_worker import run_once
+from app.services.settlement_scheduler import SettlementScheduler, settlement_job_key
+
+
+def _current_round(game_id):
+    db.session.expire_all()
+    return Game.query.get(game_id).current_round
+
+
+def _job(key):
+    db.session.expire_all()
+    return Job.query.filter_by(idempotency_key=key).one()
+
+
+def test_early_advance_failure_does_not_block_auto_settlement(app, client, game, take_turn):
+    game_id = game["game_id"]
+    alice, bob = game["player_ids"]
+    scheduler = SettlementScheduler(app, auto_advance=True)
+    take_turn(alice)
+
+    # Bob has not submitted, so the early settlement fails without retries
+    resp = client.post(f'/api/v1/rounds/{game_id}/advance', json={"round": 1, "async": True})
+    assert resp.status_code == 202
+    assert run_once(app, 'test')
+    assert _job(settlement_job_key(game_id, 1)).status == 'failed'
+    assert _current_round(game_id) == 1
+
+    take_turn(bob)
+    assert scheduler.notify_submission(game_id, 1)
+    job = _job(settlement_job_key(game_id, 1))
+    assert job.status == 'queued'
+    assert job.attempts == 0
+    assert job.error is None
+
+    assert run_once(app, 'test')
+    assert _job(settlement_job_key(game_id, 1)).status == 'succeeded'
+    assert _current_round(game_id) == 2
+
+
+def test_deadline_force_settles_after_a_failed_early_advance(app, client, game, take_turn):
+    game_id = game["game_id"]
+    scheduler = SettlementScheduler(app, deadline_seconds=60)
+    take_turn(game["player_ids"][0])
+
+    client.post(f'/api/v1/rounds/{game_id}/advance', json={"round": 1, "async": True})
+    assert run_once(app, 'test')
+    assert _job(settlement_job_key(game_id, 1)).status == 'failed'
+
+    Game.query.get(game_id).started_at = datetime.utcnow() - timedelta(seconds=120)
+    db.session.commit()
+    scheduler.check_deadlines()
+
+    assert run_once(app, 'test')
+    assert _job(settlement_job_key(game_id, 1, deadline=True)).status == 'succeeded'
+    assert _current_round(game_id) == 2
+    assert scheduler.get_status(Game.query.get(game_id))["state"] == 'settled'
+
+
+def test_failed_deadline_settlement_is_not_requeued_by_the_watcher(app, game):
+    game_id = game["game_id"]
+    scheduler = SettlementScheduler(app, deadline_seconds=60)
+    Game.query.get(game_id).started_at = datetime.utcnow() - timedelta(seconds=120)
+    db.session.commit()
+
+    scheduler.check_deadlines()
+    job = _job(settlement_job_key(game_id, 1, deadline=True))
+    job.status = 'failed'
+    db.session.commit()
+
+    scheduler.check_deadlines()
+    assert _job(settlement_job_key(game_id, 1, deadline=True)).status == 'failed'
+    assert Job.query.count() == 1
@@ -0,0 +1,65 @@
+"""
+SettlementService tests: a round is settled exactly once, in one transaction
+"""
+import pytest
+from app.core.database import db
+from app.models.finance import CashLedgerEntry, FinanceRecord
+from app.models.game import Game
+from app.models.player import Player
+from app.services.finance_service import FinanceService
+from app.services.ledger_service import REVENUE
+from app.services.settlement_service import SettlementService
+
+
+def _snapshot(game):
+    db.session.expire_all()
+    return {
+        "current_round": Game.query.get(game["game_id"]).current_round,
+        "cash": {pid: float(Player.query.get(pid).cash) for pid in game["player_ids"]},
+        "revenue_entries": CashLedgerEntry.query.filter(
+            CashLedgerEntry.player_id.in_(game["player_ids"]),
+            CashLedgerEntry.category == REVENUE
+        ).count(),
+        "finance_records": FinanceRecord.query.filter(FinanceRecord.player_id.in_(game["player_ids"])).count()
+    }
+
+
+def test_settling_a_round_twice_credits_revenue_once(submitted_game):
+    game_id = submitted_game["game_id"]
+
+    first = SettlementService.settle_round(game_id, 1)
+    settled = _snapshot(submitted_game)
+    second = SettlementService.settle_round(game_id, 1)
+
+    assert second == first
+    assert _snapshot(submitted_game) == settled
+    assert settled["current_round"] == 2
+    assert settled["revenue_entries"] == 2
+    assert settled["finance_records"] == 2
+
+
+def test_failed_settlement_leaves_round_unsettled(submitted_game, monkeypatch):
+    game_id = submitted_game["game_id"]
+    before = _snapshot(submitted_game)
+
+    # Fail on the second player's finance record, after revenue has been credited
+    generate = FinanceService.generate_finance_record
+    calls = []
+
+    def fail_second(player_id, round_number):
+        calls.append(player_id)
+        if len(calls) == 2:
+            raise RuntimeError("database went away")
+        return generate(player_id, round_number)
+    monkeypatch.setattr(FinanceService, 'generate_finance_record', staticmethod(fail_second))
+
+    with pytest.raises(RuntimeError):
+        SettlementService.settle_round(game_id, 1)
+    assert _snapshot(submitted_game) == before
+
+    # A retry settles the round from scratch
+    monkeypatch.setattr(FinanceService, 'generate_finance_record', staticmethod(generate))
+    SettlementService.settle_round(game_id, 1)
+    after = _snapshot(submitted_game)
+    assert after["current_round"] == 2
+    assert after["revenue_entries"] == 2
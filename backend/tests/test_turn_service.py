@@ -0,0 +1,70 @@
+"""
+TurnService tests: a turn is applied all-or-nothing
+"""
+import pytest
+from app.core.database import db
+from app.models.event import GameEvent
+from app.models.finance import CashLedgerEntry, MarketAction
+from app.models.player import Player, Shop, Employee
+from app.services.turn_service import TurnService
+
+TURN = [
+    {"type": "open_shop", "location": "A", "rent": 500},
+    {"type": "upgrade_decoration", "target_level": 1},
+    {"type": "hire_employee", "name": "Tom", "salary": 1000, "productivity": 60},
+    {"type": "advertisement", "dice_result": 4},
+    {"type": "market_research"}
+]
+
+
+def _state(player_id):
+    db.session.expire_all()
+    return {
+        "cash": float(Player.query.get(player_id).cash),
+        "shops": Shop.query.filter_by(player_id=player_id).count(),
+        "employees": Employee.query.join(Shop).filter(Shop.player_id == player_id).count(),
+        "market_actions": MarketAction.query.filter_by(player_id=player_id).count(),
+        "ledger": CashLedgerEntry.query.filter_by(player_id=player_id).count(),
+        "events": GameEvent.query.filter_by(player_id=player_id).count()
+    }
+
+
+def test_turn_applies_every_action(app, game):
+    player_id = game["player_ids"][0]
+
+    result = TurnService.execute_turn(player_id, TURN)
+
+    assert result["success"]
+    assert [r["type"] for r in result["results"]] == [action["type"] for action in TURN]
+    state = _state(player_id)
+    assert state["shops"] == 1
+    assert state["employees"] == 1
+    assert state["market_actions"] == 2
+
+
+def test_turn_that_fails_at_last_action_leaves_nothing_behind(app, game, monkeypatch):
+    player_id = game["player_ids"][0]
+    before = _state(player_id)
+
+    # Passes validation, then fails while being applied (after four actions already ran)
+    def fail(player_id, round_number, action):
+        raise ValueError("market closed")
+    monkeypatch.setattr(TurnService, '_apply_market_research', staticmethod(fail))
+
+    with pytest.raises(ValueError, match=r"Action 4 \(market_research\) failed: market closed"):
+        TurnService.execute_turn(player_id, TURN)
+
+    assert _state(player_id) == before
+
+
+def test_invalid_turn_is_rejected_before_anything_runs(app, game):
+    player_id = game["player_ids"][0]
+    before = _state(player_id)
+
+    # The hire fits the shop but not the cash left after the other actions
+    actions = TURN[:2] + [{"type": "hire_employee", "name": "Tom", "salary": 12000, "productivity": 60}]
+    result = TurnService.execute_turn(player_id, actions)
+
+    assert not result["success"]
+    assert [error["index"] for error in result["errors"]] == [2]
+    assert _state(player_id) == before
@@ -0,0 +1,33 @@
+"""
+后台任务 worker 进程启动脚本
+用法: python worker.py [--workers N]
+Web 进程可设置 JOB_INPROCESS_WORKERS=0，只由本进程执行任务
+"""
+import argparse
+import os
+import signal
+import threading
+
+# worker 进程不执行 Web 进程内的任务线程，也不启动清理和截止检查线程（由 Web 进程负责）
+os.environ['JOB_INPROCESS_WORKERS'] = '0'
+os.environ['BACKGROUND_THREADS'] = 'False'
+
+from app.main import app
+from app.services.job_worker import start_job_workers
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='奶茶大战后台任务 worker')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('JOB_WORKERS', 2)), help='并发执行任务的线程数')
+    args = parser.parse_args()
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+    threads = start_job_workers(app, args.workers, app.config.get('JOB_POLL_INTERVAL', 1.0), stop_event)
+    print(f"✅ 已启动 {args.workers} 个任务 worker，按 Ctrl+C 退出")
+
+    # 等待当前任务执行完毕后退出
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(timeout=1)
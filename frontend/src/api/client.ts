@@ -30,6 +30,10 @@ const getSessionToken = () => {
   return null;
 };
 
+// 读写分离：服务器返回的最近写入时间，原样带回，短时间内的读请求走主库
+const LAST_WRITE_HEADER = 'X-Last-Write';
+let lastWrite: string | null = null;
+
 // 请求拦截器
 apiClient.interceptors.request.use(
   (config) => {
@@ -40,6 +44,12 @@ apiClient.interceptors.request.use(
         'X-Session-Token': sessionToken,
       };
     }
+    if (lastWrite) {
+      config.headers = {
+        ...config.headers,
+        [LAST_WRITE_HEADER]: lastWrite,
+      };
+    }
     return config;
   },
   (error) => Promise.reject(error)
@@ -47,7 +57,13 @@ apiClient.interceptors.request.use(
 
 // 响应拦截器
 apiClient.interceptors.response.use(
-  (response) => response.data,
+  (response) => {
+    const value = response.headers?.[LAST_WRITE_HEADER.toLowerCase()];
+    if (value && (!lastWrite || Number(value) > Number(lastWrite))) {
+      lastWrite = value;
+    }
+    return response.data;
+  },
   (error) => {
     if (error.response) {
       if (import.meta.env.DEV && error.response.status >= 400) {
@@ -1,11 +1,12 @@
 import { request } from './client';
-import type { Game, Player } from '../types';
+import type { Game, PagedResponse, Player } from '../types';
 
 export const gameApi = {
   createGame: (data: { name: string; max_players: number; player_name: string; session_token?: string }) =>
     request.post<{ game: Game; player: Player }>('/games', data),
 
-  getGames: () => request.get<Game[]>('/games'),
+  getGames: (params?: { status?: Game['status']; limit?: number; cursor?: string }) =>
+    request.get<Game[]>('/games', params) as Promise<PagedResponse<Game>>,
 
   getGame: (gameId: number) => request.get<Game>(`/games/${gameId}`),
 
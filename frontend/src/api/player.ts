@@ -1,5 +1,5 @@
 import { request } from './client';
-import type { Player } from '../types';
+import type { Player, TurnAction, TurnResult } from '../types';
 
 export const playerApi = {
   joinGame: (data: { game_id: number; player_name: string; session_token?: string }) =>
@@ -10,4 +10,8 @@ export const playerApi = {
   setReady: (playerId: number, isReady: boolean) => request.post(`/players/${playerId}/ready`, { is_ready: isReady }),
 
   getPlayer: (playerId: number) => request.get<Player>(`/players/${playerId}`),
+
+  // 一次提交本回合的全部操作（同一事务，任何一步失败都不生效）
+  submitTurn: (playerId: number, actions: TurnAction[]) =>
+    request.post<TurnResult>(`/players/${playerId}/turn`, { actions }),
 };
@@ -3,9 +3,9 @@ import type { RoundSummary, CustomerFlow } from '../types';
 
 // 回合管理API
 export const roundApi = {
-  // 推进回合
-  advanceRound: (gameId: number) => {
-    return request.post(`/rounds/${gameId}/advance`);
+  // 推进回合：带上正在显示的回合，重复或重试的请求拿到该回合已有的结算结果，不会结算下一回合
+  advanceRound: (gameId: number, round: number) => {
+    return request.post(`/rounds/${gameId}/advance`, { round });
   },
 
   // 获取回合总结
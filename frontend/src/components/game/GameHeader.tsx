@@ -25,7 +25,7 @@ export const GameHeader: React.FC<GameHeaderProps> = ({ game, player, currentRou
           </Title>
           <div style={{ marginTop: '4px' }}>
             <Tag color="blue" style={{ fontSize: '14px', padding: '4px 12px' }}>
-              第 {currentRound} / 10 回合
+              第 {currentRound} / {game.total_rounds} 回合
             </Tag>
             <Tag color="green" style={{ fontSize: '14px', padding: '4px 12px', marginLeft: '8px' }}>
               {player.name}
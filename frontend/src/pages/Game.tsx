@@ -26,8 +26,6 @@ import type { DecisionStepKey } from '../types';
 
 const { Text } = Typography;
 
-const TOTAL_ROUNDS = 10;
-
 const decisionSteps: DecisionStepMeta[] = [
   { key: 'shop', title: '门店决策', emoji: '🏠', description: '选择位置和店铺装修' },
   { key: 'employees', title: '员工管理', emoji: '🧋', description: '招聘制茶师和服务员' },
@@ -57,6 +55,7 @@ export const Game: React.FC = () => {
   const { hydrated } = useSessionStore();
   const {
     currentRound,
+    totalRounds,
     setRoundInfo,
     roundPhase,
     setRoundPhase,
@@ -105,7 +104,7 @@ export const Game: React.FC = () => {
 
       if (gameResp.success && gameResp.data) {
         setCurrentGame(gameResp.data);
-        setRoundInfo(gameResp.data.current_round ?? 1, TOTAL_ROUNDS);
+        setRoundInfo(gameResp.data.current_round ?? 1, gameResp.data.total_rounds);
 
         if (gameResp.data.status === 'finished') {
           setRoundPhase('finished');
@@ -271,7 +270,7 @@ export const Game: React.FC = () => {
                 <div>
                   <Text type="secondary">当前回合</Text>
                   <Tag color="blue" style={{ marginLeft: '8px' }}>
-                    第{currentRound} / {TOTAL_ROUNDS}回合
+                    第{currentRound} / {totalRounds}回合
                   </Tag>
                 </div>
                 <div>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { App, Modal, Typography, Input, Space } from 'antd';
 import { motion, AnimatePresence } from 'framer-motion';
 import { gameApi, playerApi } from '../api';
@@ -15,8 +15,14 @@ export const Lobby: React.FC = () => {
   const { message } = App.useApp();
   const { setCurrentGame, setCurrentPlayer } = useGameStore();
   const { sessionToken, nickname, hydrateFromStorage, hydrated, setPlayerContext } = useSessionStore();
-  const [games, setGames] = useState<Game[]>([]);
+  // 第一页随轮询刷新；“加载更多”取到的后续页单独保存，每次轮询时清空，
+  // 避免已开始或已解散的房间一直显示为可加入
+  const [firstPage, setFirstPage] = useState<Game[]>([]);
+  const [firstPageCursor, setFirstPageCursor] = useState<string | null>(null);
+  const [morePages, setMorePages] = useState<Game[]>([]);
+  const [morePagesCursor, setMorePagesCursor] = useState<string | null | undefined>(undefined);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [createModalVisible, setCreateModalVisible] = useState(false);
   const [joinModalVisible, setJoinModalVisible] = useState(false);
   const [selectedGame, setSelectedGame] = useState<Game | null>(null);
@@ -33,13 +39,24 @@ export const Lobby: React.FC = () => {
     }
   }, [hydrated, sessionToken, navigate]);
 
+  const games = useMemo(() => {
+    const firstIds = new Set(firstPage.map((game) => game.id));
+    return [...firstPage, ...morePages.filter((game) => !firstIds.has(game.id))];
+  }, [firstPage, morePages]);
+
+  // 还没加载过后续页时沿用第一页的 next_cursor
+  const nextCursor = morePagesCursor === undefined ? firstPageCursor : morePagesCursor;
+
   // 仅保留轻量轮询，避免频繁刷新
   const loadGames = async () => {
     setLoading(true);
     try {
-      const response = await gameApi.getGames();
+      const response = await gameApi.getGames({ status: 'waiting' });
       if (response.success && response.data) {
-        setGames(response.data.filter(g => g.status === 'waiting'));
+        setFirstPage(response.data);
+        setFirstPageCursor(response.next_cursor ?? null);
+        setMorePages([]);
+        setMorePagesCursor(undefined);
       }
     } catch (error: any) {
       message.error(error.error || 'Failed to load game list');
@@ -48,6 +65,27 @@ export const Lobby: React.FC = () => {
     }
   };
 
+  // 按 next_cursor 加载下一页房间
+  const loadMoreGames = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const response = await gameApi.getGames({ status: 'waiting', cursor: nextCursor });
+      if (response.success && response.data) {
+        const page = response.data;
+        setMorePages((prev) => {
+          const loadedIds = new Set(prev.map((game) => game.id));
+          return [...prev, ...page.filter((game) => !loadedIds.has(game.id))];
+        });
+        setMorePagesCursor(response.next_cursor ?? null);
+      }
+    } catch (error: any) {
+      message.error(error.error || 'Failed to load game list');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     if (!sessionToken) return;
     loadGames();
@@ -247,8 +285,8 @@ export const Lobby: React.FC = () => {
                       </span>
                     </div>
                     <div style={{ marginTop: 12, color: '#FFE4E1' }}>
-                      <div>人数：{game.max_players}</div>
-                      <div>回合：{game.current_round}/10</div>
+                      <div>人数：{game.player_count ?? 0}/{game.max_players}</div>
+                      <div>回合：{game.current_round}/{game.total_rounds}</div>
                     </div>
                     <button className="nes-btn is-success" style={{ width: '100%', marginTop: 12 }}>
                       👉 加入
@@ -258,6 +296,19 @@ export const Lobby: React.FC = () => {
               ))}
             </AnimatePresence>
           </div>
+
+          {nextCursor && (
+            <div style={{ textAlign: 'center', marginTop: '24px' }}>
+              <button
+                className="nes-btn"
+                onClick={loadMoreGames}
+                disabled={loadingMore}
+                style={{ fontFamily: 'var(--font-pixel)', fontSize: '12px' }}
+              >
+                {loadingMore ? '加载中...' : '加载更多房间'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
@@ -4,8 +4,10 @@ export interface Game {
   name: string;
   max_players: number;
   current_round: number;
+  total_rounds: number;
   status: 'waiting' | 'in_progress' | 'finished';
   created_at: string;
+  player_count?: number;
 }
 
 export interface Player {
@@ -73,6 +75,28 @@ export interface Production {
   price: number;
 }
 
+// 批量回合操作（POST /players/:id/turn），按顺序执行
+export type TurnAction =
+  | { type: 'open_shop'; location: string; rent: number }
+  | { type: 'upgrade_decoration'; target_level: number }
+  | { type: 'hire_employee'; name: string; salary: number; productivity: number }
+  | { type: 'research_product'; recipe_id: number; dice_result: number }
+  | { type: 'advertisement'; dice_result: number }
+  | { type: 'market_research' }
+  | {
+      type: 'submit_production';
+      // 本回合刚研发成功的产品还没有 product_id，可以用 recipe_id 指定
+      productions: Array<Omit<Production, 'product_id'> & { product_id?: number; recipe_id?: number }>;
+    };
+
+export interface TurnResult {
+  round_number: number;
+  results: Array<{ index: number; type: TurnAction['type']; result: unknown }>;
+  cash: number;
+  plan_submitted: boolean;
+  settlement_queued?: boolean;
+}
+
 export interface FinanceRecord {
   id: number;
   player_id: number;
@@ -108,6 +132,11 @@ export interface ApiResponse<T> {
   error?: string;
 }
 
+// keyset 分页列表：next_cursor 为 null 表示没有下一页
+export interface PagedResponse<T> extends ApiResponse<T[]> {
+  next_cursor?: string | null;
+}
+
 // 装修费用
 export interface DecorationCosts {
   [key: string]: {